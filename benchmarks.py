@@ -0,0 +1,494 @@
+""" benchmarks.py file is a file that times the field trees on big fields.
+Run it to print how long the tree operations take as the number of players
+grows.
+"""
+from __future__ import annotations
+import gc
+import os
+import pickle
+import random
+import tempfile
+import time
+import tracemalloc
+from typing import Callable, List, Tuple
+from trees import Tree, QuadTree, BucketQuadTree, LinearQuadTree, \
+    PersistentQuadTree, TwoDTree, StaticTwoDTree, GridField, ArrayField, \
+    OutOfBoundsError, np
+from players import Player
+from games import Tag
+
+
+def random_players(n_players: int, seed: int = 0) -> List[
+        Tuple[str, Tuple[int, int]]]:
+    """ Return n_players names and distinct locations on a 500 by 500 field.
+    The same seed always gives the same players.
+
+    === Preconditions ===
+    n_players <= 501 * 501
+    """
+    rng = random.Random(seed)
+    taken = set()
+    players = []
+    while len(players) < n_players:
+        location = (rng.randint(0, 500), rng.randint(0, 500))
+        if location not in taken:
+            taken.add(location)
+            players.append((str(len(players)), location))
+    return players
+
+
+def fill(tree: Tree, players: List[Tuple[str, Tuple[int, int]]]) -> Tree:
+    """ Insert every player in players into tree and return tree """
+    for name, location in players:
+        tree.insert(name, location)
+    return tree
+
+
+def field_types() -> List[Tuple[str, Callable[[], Tree]]]:
+    """ Return a function that makes an empty 500 by 500 field of each field
+    type, next to its name. The ArrayFields are left out if NumPy is not
+    installed.
+    """
+    result = [('QuadTree', lambda: QuadTree((250, 250))),
+              ('BucketQuad', lambda: BucketQuadTree((250, 250))),
+              ('LinearQuad', lambda: LinearQuadTree((250, 250))),
+              ('Persistent', lambda: PersistentQuadTree((250, 250))),
+              ('TwoDTree', lambda: TwoDTree((0, 0), (500, 500))),
+              ('Scapegoat', lambda: TwoDTree((0, 0), (500, 500), 0.7)),
+              ('StaticTwoD', lambda: StaticTwoDTree((0, 0), (500, 500))),
+              ('GridField', lambda: GridField((0, 0), (500, 500)))]
+    if np is not None:
+        result.append(('ArrayField', lambda: ArrayField((0, 0), (500, 500))))
+        result.append(('ArraySorted', lambda: ArrayField((0, 0), (500, 500),
+                                                         True)))
+    return result
+
+
+def fields(players: List[Tuple[str, Tuple[int, int]]]) -> List[
+        Tuple[str, Tree]]:
+    """ Return every field type filled with players, next to its name.
+    StaticTwoDTrees are rebuilt after they are filled, the way a tick starts.
+    """
+    result = []
+    for name, make in field_types():
+        tree = fill(make(), players)
+        if isinstance(tree, StaticTwoDTree):
+            tree.rebuild()
+        result.append((name, tree))
+    return result
+
+
+def scan_names_in_range(players: List[Tuple[str, Tuple[int, int]]],
+                        point: Tuple[int, int], direction: str,
+                        distance: int) -> List[str]:
+    """ Return the names that names_in_range would return, by checking every
+    player in players. This is the O(n) baseline the trees should beat.
+    """
+    xs = [point[0], point[0] - distance if 'W' in direction else
+          point[0] + distance]
+    ys = [point[1], point[1] - distance if 'N' in direction else
+          point[1] + distance]
+    return [name for name, location in players if
+            min(xs) <= location[0] <= max(xs) and
+            min(ys) <= location[1] <= max(ys)]
+
+
+def time_queries(query: Callable[[Tuple[int, int], str, int], List[str]],
+                 players: List[Tuple[str, Tuple[int, int]]],
+                 distance: int, n_queries: int = 1000) -> float:
+    """ Return the average number of seconds query takes when n_queries of
+    the players in players look in a random direction for distance.
+    """
+    rng = random.Random(1)
+    sample = [(location, rng.choice(['NW', 'NE', 'SW', 'SE'])) for _, location
+              in players[:n_queries]]
+    start = time.perf_counter()
+    for location, direction in sample:
+        query(location, direction, distance)
+    return (time.perf_counter() - start) / len(sample)
+
+
+def bench_names_in_range(sizes: Tuple[int, ...] = (1000, 10000, 100000),
+                         distance: int = 10) -> None:
+    """ Print the average time of one names_in_range query for each field
+    type and each number of players in sizes, next to a scan of every player.
+    """
+    print('names_in_range, distance {} (microseconds per query)'.format(
+        distance))
+    for n in sizes:
+        players = random_players(n)
+        row = [(name, time_queries(tree.names_in_range, players, distance))
+               for name, tree in fields(players)]
+        row.append(('scan', time_queries(
+            lambda p, d, r: scan_names_in_range(players, p, d, r), players,
+            distance, 100)))
+        if n == sizes[0]:
+            print(('{:>8}' + ' {:>11}' * len(row)).format(
+                'players', *[name for name, _ in row]))
+        print(('{:>8}' + ' {:>11.1f}' * len(row)).format(
+            n, *[seconds * 1e6 for _, seconds in row]))
+
+
+def bench_count_in_range(n_players: int = 100000,
+                         distances: Tuple[int, ...] = (10, 50, 150)) -> None:
+    """ Print the average time of one count_in_range query on a QuadTree and
+    a TwoDTree of n_players players for each distance in distances, next to
+    counting the list that names_in_range returns.
+    """
+    print('count_in_range, {} players (microseconds per query)'.format(
+        n_players))
+    players = random_players(n_players)
+    built = [('QuadTree', QuadTree.from_points(players, (250, 250))),
+             ('TwoDTree', TwoDTree.from_points(players, (0, 0), (500, 500)))]
+    print('{:>8} {:>9} {:>11} {:>11}'.format('distance', 'tree', 'count',
+                                             'len(names)'))
+    for distance in distances:
+        for label, tree in built:
+            counting = time_queries(tree.count_in_range, players, distance,
+                                    200)
+            listing = time_queries(
+                lambda p, d, r, tree=tree: len(tree.names_in_range(p, d, r)),
+                players, distance, 200)
+            print('{:>8} {:>9} {:>11.1f} {:>11.1f}'.format(
+                distance, label, counting * 1e6, listing * 1e6))
+
+
+def bench_next_direction(sizes: Tuple[int, ...] = (300, 1000, 2000),
+                         vision: int = 150) -> None:
+    """ Print the average time of next_direction for one player in a game of
+    Tag with each number of players in sizes on a QuadTree and a TwoDTree,
+    with the players counting the roles on the field and with them checking
+    the names in sight against their target and enemy lists.
+    """
+    print('next_direction in Tag, vision {} (microseconds per player)'.format(
+        vision))
+    print('{:>8} {:>9} {:>11} {:>11}'.format('players', 'tree', 'roles',
+                                             'lists'))
+    for n in sizes:
+        for label, field in [('QuadTree', QuadTree((250, 250))),
+                             ('TwoDTree', TwoDTree((0, 0), (500, 500)))]:
+            random.seed(n)
+            game = Tag(n, field, 5, 3, vision)
+            people = list(game._players.values())
+            for player in people:
+                player._vision = vision
+            row = []
+            for listed in (False, True):
+                if listed:
+                    for player in people:
+                        player.set_roles(None, None)
+                start = time.perf_counter()
+                for player in people:
+                    player.next_direction()
+                row.append((time.perf_counter() - start) / n)
+            print('{:>8} {:>9} {:>11.1f} {:>11.1f}'.format(
+                n, label, row[0] * 1e6, row[1] * 1e6))
+
+
+def bench_collisions(sizes: Tuple[int, ...] = (1000, 10000, 30000),
+                     radius: int = 2) -> None:
+    """ Print how long one collisions call takes for each field type and each
+    number of players in sizes, with the number of pairs found.
+    """
+    print('collisions, radius {} (milliseconds per call)'.format(radius))
+    for n in sizes:
+        players = random_players(n)
+        row = []
+        for name, tree in fields(players):
+            start = time.perf_counter()
+            pairs = tree.collisions(radius)
+            row.append((name, time.perf_counter() - start))
+        if n == sizes[0]:
+            print(('{:>8}' + ' {:>11}' * len(row) + ' {:>11}').format(
+                'players', *[name for name, _ in row], 'pairs'))
+        print(('{:>8}' + ' {:>11.1f}' * len(row) + ' {:>11}').format(
+            n, *[seconds * 1e3 for _, seconds in row], len(pairs)))
+
+
+def bench_from_points(sizes: Tuple[int, ...] = (1000, 10000, 100000)) -> None:
+    """ Print how long it takes to build each tree from the number of players
+    in sizes, with from_points and with one insert per player.
+    """
+    print('building a field (milliseconds)')
+    print('{:>8} {:>11} {:>11} {:>11} {:>11}'.format(
+        'players', 'Quad insert', 'Quad bulk', 'TwoD insert', 'TwoD bulk'))
+    for n in sizes:
+        players = random_players(n)
+        row = []
+        for build in [lambda: fill(QuadTree((250, 250)), players),
+                      lambda: QuadTree.from_points(players, (250, 250)),
+                      lambda: fill(TwoDTree((0, 0), (500, 500)), players),
+                      lambda: TwoDTree.from_points(players, (0, 0),
+                                                   (500, 500))]:
+            start = time.perf_counter()
+            build()
+            row.append(time.perf_counter() - start)
+        print('{:>8} {:>11.1f} {:>11.1f} {:>11.1f} {:>11.1f}'.format(
+            n, *[seconds * 1e3 for seconds in row]))
+
+
+def bench_balance(sizes: Tuple[int, ...] = (1000, 10000, 100000)) -> None:
+    """ Print how long TwoDTree.balance takes on a tree made by inserting the
+    number of players in sizes in random order, and the height before and
+    after.
+    """
+    print('TwoDTree.balance (milliseconds)')
+    print('{:>8} {:>11} {:>11} {:>11}'.format('players', 'balance', 'height',
+                                              'balanced'))
+    for n in sizes:
+        tree = fill(TwoDTree((0, 0), (500, 500)), random_players(n))
+        height = tree.height()
+        start = time.perf_counter()
+        tree.balance()
+        seconds = time.perf_counter() - start
+        print('{:>8} {:>11.1f} {:>11} {:>11}'.format(n, seconds * 1e3, height,
+                                                     tree.height()))
+
+
+def bench_remove(sizes: Tuple[int, ...] = (1000, 10000, 100000),
+                 share: float = 0.1) -> None:
+    """ Print the average time to remove one player by name when share of
+    the players are removed, the way an elimination phase does, for each
+    field type and each number of players in sizes.
+    """
+    print('remove, {:.0%} of the players (microseconds per player)'.format(
+        share))
+    for n in sizes:
+        players = random_players(n)
+        gone = random.Random(2).sample([name for name, _ in players],
+                                       int(n * share))
+        row = []
+        for name, tree in fields(players):
+            start = time.perf_counter()
+            for player in gone:
+                tree.remove(player)
+            row.append((name, (time.perf_counter() - start) / len(gone)))
+        if n == sizes[0]:
+            print(('{:>8}' + ' {:>11}' * len(row)).format(
+                'players', *[name for name, _ in row]))
+        print(('{:>8}' + ' {:>11.1f}' * len(row)).format(
+            n, *[seconds * 1e6 for _, seconds in row]))
+
+
+def play_tick(tree: Tree, names: List[str], rng: random.Random,
+              vision: int = 10, max_speed: int = 5) -> None:
+    """ Play one tick on tree the way a game does: every player named in
+    names looks in two random directions up to vision away, then every
+    player moves up to max_speed steps in a random direction, unless that
+    would leave the field or land on another player.
+    """
+    for name in names:
+        location = tree._index[name]
+        for direction in rng.sample(['NW', 'NE', 'SW', 'SE'], 2):
+            tree.names_in_range(location, direction, vision)
+    for name in names:
+        try:
+            tree.move(name, rng.choice(['N', 'S', 'E', 'W']),
+                      rng.randint(1, max_speed))
+        except OutOfBoundsError:
+            pass
+
+
+def bench_ticks(sizes: Tuple[int, ...] = (1000, 10000, 30000),
+                ticks: int = 3) -> None:
+    """ Print the average time of one game tick for each number of players
+    in sizes, on a TwoDTree that is updated as players move, on one that
+    balances itself with an alpha of 0.7 and on a StaticTwoDTree that is
+    rebuilt at the start of every tick, with the part of the tick the rebuild
+    takes and the height of the two TwoDTrees after the last tick.
+    """
+    print('game tick, 2 searches and 1 move per player (milliseconds)')
+    print('{:>8} {:>11} {:>11} {:>11} {:>11} {:>11} {:>11}'.format(
+        'players', 'TwoDTree', 'Scapegoat', 'StaticTwoD', 'rebuild', 'height',
+        'scapegoat'))
+    for n in sizes:
+        players = random_players(n)
+        names = [name for name, _ in players]
+        row = []
+        rebuilding = 0.0
+        played = [fill(TwoDTree((0, 0), (500, 500)), players),
+                 fill(TwoDTree((0, 0), (500, 500), 0.7), players),
+                 fill(StaticTwoDTree((0, 0), (500, 500)), players)]
+        for tree in played:
+            rng = random.Random(3)
+            start = time.perf_counter()
+            for _ in range(ticks):
+                if isinstance(tree, StaticTwoDTree):
+                    started = time.perf_counter()
+                    tree.rebuild()
+                    rebuilding += time.perf_counter() - started
+                play_tick(tree, names, rng)
+            row.append((time.perf_counter() - start) / ticks)
+        print(('{:>8}' + ' {:>11.1f}' * 4 + ' {:>11}' * 2).format(
+            n, *[seconds * 1e3 for seconds in row], rebuilding / ticks * 1e3,
+            played[0].height(), played[1].height()))
+
+
+def move_all(tree: Tree, names: List[str], rng: random.Random) -> None:
+    """ Move every player named in names up to 5 steps in a random direction
+    on tree, unless that would leave the field or land on another player.
+    """
+    for name in names:
+        try:
+            tree.move(name, rng.choice(['N', 'S', 'E', 'W']),
+                      rng.randint(1, 5))
+        except OutOfBoundsError:
+            pass
+
+
+def bench_tick_stats(n_players: int = 10000, ticks: int = 3) -> None:
+    """ Print what one game tick of n_players players costs on a QuadTree, a
+    TwoDTree and a TwoDTree with an alpha of 0.7, as counted by their stats:
+    the calls and nodes visited per call of each operation used, and the
+    nodes allocated and freed, splits, merges and rebuilds. The counters are
+    reset at the start of every tick and the last tick is printed.
+    """
+    print('counters of one game tick, {} players'.format(n_players))
+    players = random_players(n_players)
+    names = [name for name, _ in players]
+    played = [('QuadTree', fill(QuadTree((250, 250)), players)),
+              ('TwoDTree', fill(TwoDTree((0, 0), (500, 500)), players)),
+              ('Scapegoat', fill(TwoDTree((0, 0), (500, 500), 0.7), players))]
+    for label, tree in played:
+        rng = random.Random(3)
+        tree.enable_stats()
+        for _ in range(ticks):
+            tree.reset_stats()
+            start = time.perf_counter()
+            play_tick(tree, names, rng)
+            seconds = time.perf_counter() - start
+        stats = tree.stats()
+        tree.enable_stats(False)
+        print('{} ({:.1f} milliseconds with counting)'.format(
+            label, seconds * 1e3))
+        for operation in ('names_in_range', 'insert', 'remove_point'):
+            print('    {:>14} {:>8} calls {:>8.1f} visits per call'.format(
+                operation, stats[operation],
+                stats[operation + '_visits'] / max(stats[operation], 1)))
+        print('    ' + ' '.join('{} {}'.format(key, stats[key]) for key in (
+            'allocated', 'freed', 'splits', 'merges', 'rebuilds')))
+
+
+def bench_snapshots(sizes: Tuple[int, ...] = (1000, 10000, 100000)) -> None:
+    """ Print how long it takes to move every player once, on a QuadTree and
+    on a PersistentQuadTree that takes a snapshot first, for each number of
+    players in sizes, with how long the snapshot and a rollback to it take.
+    The first change after a snapshot copies the name index, so that is part
+    of the moves. A rollback only swaps the root and index back, but the
+    quadrants and index it drops are freed then, which is most of its time.
+    """
+    print('moving every player once (milliseconds)')
+    print('{:>8} {:>11} {:>11} {:>11} {:>11}'.format(
+        'players', 'QuadTree', 'Persistent', 'snapshot', 'rollback'))
+    for n in sizes:
+        players = random_players(n)
+        names = [name for name, _ in players]
+        quad = fill(QuadTree((250, 250)), players)
+        start = time.perf_counter()
+        move_all(quad, names, random.Random(4))
+        moving = time.perf_counter() - start
+        persistent = fill(PersistentQuadTree((250, 250)), players)
+        start = time.perf_counter()
+        snapshot = persistent.snapshot()
+        snapshotting = time.perf_counter() - start
+        start = time.perf_counter()
+        move_all(persistent, names, random.Random(4))
+        moving_persistent = time.perf_counter() - start
+        start = time.perf_counter()
+        persistent.rollback(snapshot)
+        rolling_back = time.perf_counter() - start
+        print('{:>8} {:>11.1f} {:>11.1f} {:>11.4f} {:>11.4f}'.format(
+            n, moving * 1e3, moving_persistent * 1e3, snapshotting * 1e3,
+            rolling_back * 1e3))
+
+
+def bench_save_load(sizes: Tuple[int, ...] = (1000, 10000, 100000)) -> None:
+    """ Print how long save and load take on a QuadTree and a TwoDTree for
+    each number of players in sizes, next to pickling and unpickling the same
+    tree, with the size of both files in kilobytes.
+    """
+    print('saving and loading a field (milliseconds, kilobytes)')
+    print('{:>8} {:>9} {:>8} {:>8} {:>8} {:>8} {:>8} {:>8}'.format(
+        'players', 'tree', 'save', 'load', 'size', 'dump', 'unpickle',
+        'pickled'))
+    folder = tempfile.mkdtemp()
+    path = os.path.join(folder, 'field.tag')
+    for n in sizes:
+        players = random_players(n)
+        for label, tree in [
+                ('QuadTree', QuadTree.from_points(players, (250, 250))),
+                ('TwoDTree', TwoDTree.from_points(players, (0, 0),
+                                                  (500, 500)))]:
+            start = time.perf_counter()
+            tree.save(path)
+            saving = time.perf_counter() - start
+            start = time.perf_counter()
+            loaded = type(tree).load(path)
+            loading = time.perf_counter() - start
+            start = time.perf_counter()
+            pickled = pickle.dumps(tree, pickle.HIGHEST_PROTOCOL)
+            dumping = time.perf_counter() - start
+            start = time.perf_counter()
+            unpickled = pickle.loads(pickled)
+            unpickling = time.perf_counter() - start
+            assert loaded.size() == unpickled.size() == tree.size()
+            print('{:>8} {:>9} {:>8.1f} {:>8.1f} {:>8.0f} {:>8.1f} {:>8.1f} '
+                  '{:>8.0f}'.format(n, label, saving * 1e3, loading * 1e3,
+                                    os.path.getsize(path) / 1024,
+                                    dumping * 1e3, unpickling * 1e3,
+                                    len(pickled) / 1024))
+    os.remove(path)
+    os.rmdir(folder)
+
+
+def allocated(make: Callable[[], object]) -> Tuple[object, int]:
+    """ Return what make returns, next to the number of bytes that were
+    allocated while making it and are still in use.
+    """
+    gc.collect()
+    tracemalloc.start()
+    try:
+        made = make()
+        size = tracemalloc.get_traced_memory()[0]
+    finally:
+        tracemalloc.stop()
+    return made, size
+
+
+def bench_memory(sizes: Tuple[int, ...] = (1000, 10000, 100000)) -> None:
+    """ Print how many bytes each field type uses per player when it holds
+    the number of players in sizes, with the bytes per Player object.
+    The players' names and locations are made beforehand, so only the field
+    itself is counted.
+    """
+    print('memory (bytes per player)')
+    for n in sizes:
+        players = random_players(n)
+        row = []
+        for name, make in field_types():
+            _, size = allocated(lambda: fill(make(), players))
+            row.append((name, size / n))
+        _, size = allocated(lambda: [Player(name, 1, 1, None, 'green',
+                                            location)
+                                     for name, location in players])
+        row.append(('Player', size / n))
+        if n == sizes[0]:
+            print(('{:>8}' + ' {:>11}' * len(row)).format(
+                'players', *[name for name, _ in row]))
+        print(('{:>8}' + ' {:>11.0f}' * len(row)).format(
+            n, *[size for _, size in row]))
+
+
+if __name__ == '__main__':
+    bench_names_in_range()
+    bench_count_in_range()
+    bench_next_direction()
+    bench_collisions()
+    bench_from_points()
+    bench_balance()
+    bench_remove()
+    bench_ticks()
+    bench_tick_stats()
+    bench_snapshots()
+    bench_save_load()
+    bench_memory()
@@ -4,15 +4,17 @@ It has a Normal Tag game, Zombie Tag, and Elimination Tag!! So much fun!!
 """
 from __future__ import annotations
 import random
-from typing import Dict, Union, Optional
+from typing import Dict, Optional, Tuple
 from players import Player
-from trees import QuadTree, TwoDTree
+from trees import Tree, QuadTree
 
 
 class Game:
     """ This is the Parent class for all games.
-    It is empty because all its methods raise a NotImplementedError
+    It is almost empty because its methods raise a NotImplementedError, except
+    handle_collisions which every game shares.
     """
+    field: Tree
 
     def handle_collision(self, player1: str, player2: str) -> None:
         """ Perform some action when <player1> and <player2> collide in self """
@@ -23,6 +25,39 @@ class Game:
         won the game, or None if no player has won yet in self """
         raise NotImplementedError
 
+    def handle_collisions(self, radius: int) -> None:
+        """ Call handle_collision for every pair of players on the field that
+        are at most <radius> apart in self. Run it after the players move.
+        The pairs come from field.collisions, so they are handled once each in
+        the same sorted order every time. A pair is skipped if one of its
+        players was already taken off the field by an earlier collision.
+
+        === Preconditions ===
+        radius >= 0
+
+        === DocTests ===
+        >>> game = Tag(10, QuadTree((250, 250)), 5, 4, 3)
+        >>> game.handle_collisions(0)
+        """
+        for player1, player2 in self.field.collisions(radius):
+            if player1 in self.field and player2 in self.field:
+                self.handle_collision(player1, player2)
+
+    def _helper_location(self) -> Tuple[int, int]:
+        """ _helper_location is helper location.
+        It takes self and returns a random point on self's field, anywhere
+        within the field's bounds, so games can be played on fields of any
+        size and shape.
+
+        === DocTests ===
+        >>> game = Tag(1, QuadTree((500, 200), (0, 0, 1000, 400)), 5, 4, 3)
+        >>> x, y = game._helper_location()
+        >>> 0 <= x <= 1000 and 0 <= y <= 400
+        True
+        """
+        xmin, ymin, xmax, ymax = self.field.bounds()
+        return random.randint(xmin, xmax), random.randint(ymin, ymax)
+
 
 class Tag(Game):
     """ This is a game of classic Tag
@@ -31,12 +66,15 @@ class Tag(Game):
     === Attributes ===
     _players : A dictionary mapping the names of players to their Player
         instances
-    field : A tree that stores the location of all players in _players
+    field : A tree that stores the location of all players in _players, with
+        the role 'it' for the player who is ‘it’ and 'not-it' for the rest
     _it : The name of the player in _players that is currently ‘it’
     _duration : The amount of time before the game eliminates some more players
 
     === Representation Invariants ===
     The player who is ‘it’ should be purple, all other players should be green.
+    The player who is ‘it’ targets the 'not-it' role, all other players avoid
+    the 'it' role.
 
     === DocTests ===
     >>> game = Tag(10, QuadTree((250, 250)), 5, 4, 3)
@@ -48,16 +86,17 @@ class Tag(Game):
     True
     """
     _players: Dict[str, Player]
-    field: Union[QuadTree, TwoDTree]
+    field: Tree
     _it: str
     _duration: int
 
     def __init__(self, n_players: int,
-                 field_type: Union[QuadTree, TwoDTree],
+                 field_type: Tree,
                  duration: int,
                  max_speed: int,
                  max_vision: int) -> None:
         """ Initialize new Game instance onto a field of field_type in self
+        Players start at random points within the field's bounds.
 
         === Preconditions ===
         n_players must be > 0
@@ -74,11 +113,12 @@ class Tag(Game):
         for i in range(n_players):
             vision = random.randint(0, max_vision)
             speed = random.randint(1, max_speed)
-            location = (random.randint(0, 500), random.randint(0, 500))
-            while self.field.contains_point(
-                    location) or self.field.names_in_range(
-                        (location[0] + 10, location[1] + 10), 'NW', 10) != []:
-                location = (random.randint(0, 500), random.randint(0, 500))
+            location = self._helper_location()
+            while self.field.contains_point(location) or next(
+                    self.field.iter_in_range((location[0] + 10,
+                                              location[1] + 10), 'NW', 10),
+                    None) is not None:
+                location = self._helper_location()
             self._players[str(i)] = Player(str(i), vision, speed, self, 'green',
                                            location)
             self.field.insert(str(i), location)
@@ -86,8 +126,12 @@ class Tag(Game):
         self._players[self._it].set_colour('purple')
         for name in self._players:
             if name != self._it:
+                self.field.set_role(name, 'not-it')
+                self._players[name].set_roles(None, 'it')
                 self._players[name].select_enemy(self._it)
             else:
+                self.field.set_role(name, 'it')
+                self._players[name].set_roles('not-it', None)
                 everyone_else = list(self._players.keys())
                 everyone_else.remove(name)
                 for person in everyone_else:
@@ -96,18 +140,26 @@ class Tag(Game):
     def _helper_changed_it(self, old_it: str, new_it: str) -> None:
         """ _helper_changed_it is helper changed it
         It changes who is it, from old_it to new_it and takes self
+        The roles on the field and of the two players change to match.
+        old_it drops its targets before it can take new_it as an enemy, and
+        new_it drops old_it as an enemy before it targets everyone else, so
+        the lists name the same players as the roles.
         """
+        self.field.set_role(old_it, 'not-it')
+        self.field.set_role(new_it, 'it')
+        self._players[old_it].set_roles(None, 'it')
+        self._players[new_it].set_roles('not-it', None)
         for name in self._players:
             if name != new_it:
-                self._players[name].select_enemy(new_it)
-                self._players[name].ignore_enemy(old_it)
                 if name == old_it:
                     for player in list(self._players.keys()):
                         self._players[name].ignore_target(player)
+                self._players[name].select_enemy(new_it)
+                self._players[name].ignore_enemy(old_it)
             else:
+                self._players[name].ignore_enemy(old_it)
                 for player in list(self._players.keys()):
                     self._players[name].select_target(player)
-                self._players[name].ignore_enemy(old_it)
 
     def handle_collision(self, player1: str, player2: str) -> None:
         """ Perform some action when <player1> and <player2> collide on self
@@ -178,11 +230,13 @@ class ZombieTag(Game):
         instances
     _zombies : A dictionary mapping the names of zombie players to their Player
         instances
-    field : A tree that stores the location of all players in _players
+    field : A tree that stores the location of all players in _players, with
+        the role 'zombie' for zombies and 'human' for humans
     _duration : The amount of time before the game eliminates some more players
 
     === Representation Invariants ===
     All zombies are purple, all humans are green.
+    Zombies target the 'human' role and humans avoid the 'zombie' role.
 
     === DocTests ===
     >>> game = ZombieTag(10, QuadTree((250, 250)), 5, 4, 3)
@@ -193,16 +247,18 @@ class ZombieTag(Game):
     """
     _humans: Dict[str, Player]
     _zombies: Dict[str, Player]
-    field: Union[QuadTree, TwoDTree]
+    field: Tree
     _duration: int
 
     def __init__(self, n_players: int,
-                 field_type: Union[QuadTree, TwoDTree],
+                 field_type: Tree,
                  duration: int,
                  max_speed: int,
                  max_vision: int) -> None:
         """ Initialize new Game instance with n_players as humans and one
         zombie in self on a field of field_type and size as specified
+        The first human and the zombie start next to the centre of the field's
+        bounds, the other humans at random points within them.
 
         === Preconditions ===
         n_players must be > 0
@@ -217,26 +273,33 @@ class ZombieTag(Game):
         self.field = field_type
         self._humans = {}
         self._zombies = {}
+        xmin, ymin, xmax, ymax = self.field.bounds()
+        centre = ((xmin + xmax) // 2, (ymin + ymax) // 2)
 
         for i in range(n_players):
-            loc = (250, 250)
+            loc = centre
             v = random.randint(0, max_vision)
             s = random.randint(0, max_speed)
-            while self.field.contains_point(loc) or self.field.names_in_range(
-                    (loc[0] + 10, loc[1] + 10), 'NW', 10) != []:
-                loc = (random.randint(0, 500), random.randint(0, 500))
+            while self.field.contains_point(loc) or next(
+                    self.field.iter_in_range((loc[0] + 10, loc[1] + 10), 'NW',
+                                             10), None) is not None:
+                loc = self._helper_location()
 
             self._humans[str(i)] = Player(str(i), v, s, self, 'green', loc)
             self.field.insert(str(i), loc)
-        z_loc = (251, 251)
+        z_loc = (centre[0] + 1, centre[1] + 1)
         while self.field.contains_point(z_loc):
-            z_loc = (random.randint(0, 500), random.randint(0, 500))
+            z_loc = self._helper_location()
 
         self._zombies[str(n_players)] = Player(str(n_players), max_vision, 1,
                                                self, 'purple', z_loc)
         self.field.insert(str(n_players), z_loc)
 
+        self.field.set_role(str(n_players), 'zombie')
+        self._zombies[str(n_players)].set_roles('human', None)
         for j in self._humans:
+            self.field.set_role(j, 'human')
+            self._humans[j].set_roles(None, 'zombie')
             self._zombies[str(n_players)].select_target(j)
             self._humans[j].select_enemy(str(n_players))
 
@@ -286,7 +349,9 @@ class ZombieTag(Game):
 
     def _h_to_z(self, player: str) -> None:
         """ _h_to_z is h to z
-        It changes player from human to zombie in self"""
+        It changes player from human to zombie in self
+        Every human left takes the new zombie as an enemy, as the 'zombie'
+        role on the field already makes them avoid it."""
         for j in list(self._zombies.keys()):
             self._humans[player].ignore_enemy(j)
             self._zombies[j].ignore_target(player)
@@ -294,8 +359,11 @@ class ZombieTag(Game):
         del self._humans[player]
         self._zombies[player].set_speed(1)
         self._zombies[player].set_colour('purple')
+        self.field.set_role(player, 'zombie')
+        self._zombies[player].set_roles('human', None)
         for i in list(self._humans.keys()):
             self._zombies[player].select_target(i)
+            self._humans[i].select_enemy(player)
 
 
 class EliminationTag(Game):
@@ -325,14 +393,15 @@ class EliminationTag(Game):
     True
     """
     _players: Dict[str, Player]
-    field: Union[QuadTree, TwoDTree]
+    field: Tree
 
     def __init__(self, n_players: int,
-                 field_type: Union[QuadTree, TwoDTree],
+                 field_type: Tree,
                  max_speed: int,
                  max_vision: int) -> None:
         """ Initialize new Game instance with n_players in self on a field of
         field_type and size as specified.
+        Players start at random points within the field's bounds.
         In alphabetical order, each next player is the previous player's target
 
         === Preconditions ===
@@ -349,11 +418,12 @@ class EliminationTag(Game):
         for i in range(n_players):
             vision = random.randint(0, max_vision)
             speed = random.randint(1, max_speed)
-            location = (random.randint(0, 500), random.randint(0, 500))
-            while self.field.contains_point(
-                    location) or self.field.names_in_range(
-                        (location[0] + 10, location[1] + 10), 'NW', 10) != []:
-                location = (random.randint(0, 500), random.randint(0, 500))
+            location = self._helper_location()
+            while self.field.contains_point(location) or next(
+                    self.field.iter_in_range((location[0] + 10,
+                                              location[1] + 10), 'NW', 10),
+                    None) is not None:
+                location = self._helper_location()
             self._players[str(i)] = Player(str(i), vision, speed, self,
                                            'random', location)
             self.field.insert(str(i), location)
@@ -38,6 +38,12 @@ class Player:
 
     _direction: A direction that this player faces and moves towards.
 
+    _target_role: The role tag of the players this player targets, or None if
+    it targets the players named in <_targets>.
+
+    _enemy_role: The role tag of the players this player avoids, or None if
+    it avoids the players named in <_enemies>.
+
 
     === Representation Invariants ===
     - the <_location> of a player must be within the bounds of the game grid
@@ -53,7 +59,13 @@ class Player:
     <_enemies> and vice versa.
 
     - the <_direction> of a player must belong to th set {'N', 'S', 'E', 'W'}.
+
+    - if <_target_role> or <_enemy_role> is not None, the players with those
+    roles on the field are the ones this player targets and avoids.
     """
+    __slots__ = ('_name', '_location', '_colour', '_vision', '_speed', '_game',
+                 '_points', '_targets', '_enemies', '_direction',
+                 '_target_role', '_enemy_role')
     _name: str
     _location: Tuple[int, int]
     _colour: str
@@ -64,6 +76,8 @@ class Player:
     _targets: List[str]
     _enemies: List[str]
     _direction: str
+    _target_role: Optional[str]
+    _enemy_role: Optional[str]
 
     def __init__(self, name: str, vision: int, speed: int, game: 'Game',
                  colour: str, location: Tuple[int, int]) -> None:
@@ -85,6 +99,8 @@ class Player:
         self._targets = []
         self._enemies = []
         self._direction = 'N'
+        self._target_role = None
+        self._enemy_role = None
 
     def set_colour(self, colour: str) -> None:
         """ set_colour changes the <_colour> of the player to one of
@@ -232,6 +248,24 @@ class Player:
 
         return self._enemies
 
+    def set_roles(self, target_role: Optional[str],
+                  enemy_role: Optional[str]) -> None:
+        """ set_roles makes the player in self target the players tagged
+        target_role and avoid the players tagged enemy_role on the field (see
+        Tree.set_role). Each direction is then chosen from one
+        count_roles_in_range call per quadrant instead of checking every name
+        in sight against <_targets> and <_enemies>. Passing None for both goes
+        back to the lists.
+
+        === DocTests ===
+        >>> player = Player('ethan', 1, 2, game, 'green', (100, 100))
+        >>> player.set_roles('not-it', None)
+        >>> player._target_role, player._enemy_role
+        ('not-it', None)
+        """
+        self._target_role = target_role
+        self._enemy_role = enemy_role
+
     def reverse_direction(self) -> None:
         """ reverse_direction changes the <_direction> of a player so that they
         face in the exact opposite direction in self .
@@ -271,57 +305,46 @@ class Player:
         if speed >= 0:
             self._speed = speed
 
-    def _helper_tally(self, name_list1: List[str], name_list2: List[str],
+    def _helper_tally(self, seen1: Tuple[int, int], seen2: Tuple[int, int],
                       first_d: str, second_d: str) -> List[int]:
         """ _helper_tally is helper tally
-        It takes two lists of the two directions as well as the two
-        directions, name_list1 name_list2 first_d second_d and then
+        It takes the (targets, enemies) seen in each of the two directions as
+        well as the two directions, seen1 seen2 first_d second_d and then
         tallies the number of people as a target and enemy in each direction.
+        A target counts towards the directions of its quadrant and an enemy
+        towards the directions away from it.
         Preconditions
         """
-        N = 0
-        E = 0
-        S = 0
-        W = 0
-        for person in self._targets:
-            if person in name_list1:
-                if 'N' in first_d:
-                    N += 1
-                if 'E' in first_d:
-                    E += 1
-                if 'S' in first_d:
-                    S += 1
-                if 'W' in first_d:
-                    W += 1
-            if person in name_list2:
-                if 'N' in second_d:
-                    N += 1
-                if 'E' in second_d:
-                    E += 1
-                if 'S' in second_d:
-                    S += 1
-                if 'W' in second_d:
-                    W += 1
-        for person in self._enemies:
-            if person in name_list1:
-                if 'N' not in first_d:
-                    N += 1
-                if 'E' not in first_d:
-                    E += 1
-                if 'S' not in first_d:
-                    S += 1
-                if 'W' not in first_d:
-                    W += 1
-            if person in name_list2:
-                if 'N' not in second_d:
-                    N += 1
-                if 'E' not in second_d:
-                    E += 1
-                if 'S' not in second_d:
-                    S += 1
-                if 'W' not in second_d:
-                    W += 1
-        return [N, E, S, W]
+        tally = []
+        for way in 'NESW':
+            total = 0
+            for (targets, enemies), quadrant in ((seen1, first_d),
+                                                 (seen2, second_d)):
+                if way in quadrant:
+                    total += targets
+                else:
+                    total += enemies
+            tally.append(total)
+        return tally
+
+    def _helper_seen(self, query: Tuple[Tuple[int, int], str, int],
+                     names: Optional[List[str]] = None) -> Tuple[int, int]:
+        """ _helper_seen is helper seen
+        It takes self, a vision query and the names the query finds (looked
+        up on the field if not given) and returns how many targets and
+        enemies the query sees. If self has roles, the names are not needed
+        since the field counts the roles in the box itself.
+        """
+        if self._target_role is not None or self._enemy_role is not None:
+            counts = self._game.field.count_roles_in_range(*query)
+            return (counts.get(self._target_role, 0),
+                    counts.get(self._enemy_role, 0))
+        if names is None:
+            names = self._game.field.names_in_range(*query)
+        targets = set(self._targets)
+        enemies = set(self._enemies)
+        return (sum(1 for name in names if name in targets),
+                sum(1 for name in names if name in enemies))
 
     def next_direction(self) -> Set[str]:
         """ Updates the <_direction> of the player for the next time the
@@ -338,16 +361,68 @@ class Player:
         >>> player1._direction in ['N', 'E', 'W', 'S']
         True
         """
+        queries = self._helper_vision_queries()
+        return self._helper_choose_direction(
+            queries, [self._helper_seen(query) for query in queries])
+
+    @staticmethod
+    def next_directions(players: List[Player]) -> List[Set[str]]:
+        """ Update the <_direction> of every player in players the same way
+        next_direction does and return their sets of equally good directions
+        in the same order. The vision queries of all the players without roles
+        are answered by one names_in_ranges call on the field. next_directions
+
+        === Preconditions ===
+        All players in players are in the same game.
+
+        === DocTests ===
+        >>> player1 = Player('ethan', 1, 2, game, 'green', (100, 100))
+        >>> player2 = Player('eric', 1, 2, game, 'green', (200, 200))
+        >>> len(Player.next_directions([player1, player2]))
+        2
+        """
+        if not players:
+            return []
+        queries = [player._helper_vision_queries() for player in players]
+        listed = [i for i, player in enumerate(players) if
+                  player._target_role is None and player._enemy_role is None]
+        people = players[0]._game.field.names_in_ranges(
+            [query for i in listed for query in queries[i]])
+        found = {}
+        for j, i in enumerate(listed):
+            found[i] = people[2 * j: 2 * j + 2]
+        result = []
+        for i, player in enumerate(players):
+            names = found.get(i, [None, None])
+            result.append(player._helper_choose_direction(queries[i], [
+                player._helper_seen(query, names[k])
+                for k, query in enumerate(queries[i])]))
+        return result
+
+    def _helper_vision_queries(self) -> List[Tuple[Tuple[int, int], str, int]]:
+        """ _helper_vision_queries is helper vision queries
+        It picks two different random quadrants around self and returns the
+        names_in_range queries that look into them as (point, direction,
+        distance).
+        """
         dirs = ['NW', 'NE', 'SW', 'SE']
         first_d = random.choice(dirs)
         dirs.remove(first_d)
         second_d = random.choice(dirs)
-        people_first = self._game.field.names_in_range(self._location, first_d,
-                                                       self._vision)
-        people_second = self._game.field.names_in_range(self._location,
-                                                        second_d, self._vision)
-        dirs = self._helper_tally(people_first, people_second, first_d,
-                                  second_d)
+        return [(self._location, first_d, self._vision),
+                (self._location, second_d, self._vision)]
+
+    def _helper_choose_direction(self, queries: List[Tuple[Tuple[int, int],
+                                                           str, int]],
+                                 seen: List[Tuple[int, int]]) -> Set[str]:
+        """ _helper_choose_direction is helper choose direction
+        It takes the two queries from _helper_vision_queries and the
+        (targets, enemies) each of them saw, sets <_direction> to one of the
+        best directions and returns the set of all of the best directions.
+        """
+        first_d = queries[0][1]
+        second_d = queries[1][1]
+        dirs = self._helper_tally(seen[0], seen[1], first_d, second_d)
         N = dirs[0]
         E = dirs[1]
         S = dirs[2]
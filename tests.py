@@ -1,4 +1,5 @@
 import pytest
+import random
 from typing import Tuple, List
 import trees
 import players
@@ -8,6 +9,9 @@ import games
 ##### TREES #####
 
 class TreesTest:
+    def test_bounds(self):
+        assert self.tree.bounds() == (0, 0, 500, 500)
+
     def test_contains(self):
         self.tree.insert('jon', (250, 250))
         assert 'jon' in self.tree
@@ -171,6 +175,155 @@ class Test2DTree(TreesTest):
         assert job.depth(minnie) == 1
 
 
+class TestScapegoatTwoDTree(Test2DTree):
+    def setup_method(self):
+        self.tree = trees.TwoDTree((0, 0), (500, 500), 0.7)
+
+
+class TestStaticTwoDTree(TreesTest):
+    def setup_method(self):
+        self.tree = trees.StaticTwoDTree((0, 0), (500, 500))
+
+    def test_height(self):
+        assert self.tree.height() == 1
+        self.tree.insert('jon', (250, 250))
+        assert self.tree.height() == 1
+        self.tree.insert('joe', (300, 300))
+        assert self.tree.height() == 2
+
+    def test_depth(self):
+        self.tree.insert('jon', (250, 250))
+        assert self.tree.depth(self.tree) is None
+
+    def test_rebuild(self):
+        for i in range(10):
+            self.tree.insert(str(i), (i * 50, 500 - i * 50))
+        self.tree.remove('4')
+        self.tree.move('5', 'N', 1)
+        self.tree.rebuild()
+        assert not self.tree._pending and self.tree._stale == 0
+        assert len([name for name in self.tree._names if name]) == 9
+        assert sorted(self.tree.names_in_range((200, 200), 'SE', 100)) == [
+            '5', '6']
+
+
+class TestGridField(TreesTest):
+    def setup_method(self):
+        self.tree = trees.GridField((0, 0), (500, 500), 10)
+
+    def test_height(self):
+        assert self.tree.height() == 1
+        self.tree.insert('jon', (250, 250))
+        assert self.tree.height() == 1
+        self.tree.insert('joe', (300, 300))
+        assert self.tree.height() == 2
+        self.tree.insert('job', (50, 50))
+        assert self.tree.height() == 2
+
+    def test_depth(self):
+        self.tree.insert('jon', (250, 250))
+        assert self.tree.depth(self.tree) is None
+
+    def test_cell_size(self):
+        self.tree = trees.GridField((0, 0), (500, 500), 64)
+        self.tree.insert('jon', (250, 250))
+        self.tree.insert('joe', (255, 200))
+        self.tree.insert('job', (0, 500))
+        assert self.tree.size() == 3
+        assert set(self.tree.names_in_range((256, 256), 'NW', 56)) == {'jon',
+                                                                      'joe'}
+
+
+class TestBucketQuadTree(TreesTest):
+    def setup_method(self):
+        self.tree = trees.BucketQuadTree((250, 250), 2)
+
+    def test_height(self):
+        assert self.tree.height() == 1
+        self.tree.insert('jon', (250, 250))
+        self.tree.insert('joe', (300, 300))
+        assert self.tree.height() == 1
+        self.tree.insert('job', (50, 50))
+        assert self.tree.height() == 2
+
+    def test_depth(self):
+        self.tree.insert('jon', (250, 250))
+        self.tree.insert('joe', (300, 300))
+        self.tree.insert('job', (50, 50))
+        assert self.tree.depth(self.tree._se) == 1
+        assert self.tree.depth(self.tree) is None
+
+    def test_min_size(self):
+        self.tree = trees.BucketQuadTree((250, 250), 2, 8)
+        for i in range(5):
+            self.tree.insert(str(i), (i, 0))
+        assert self.tree.height() < 10
+        assert sorted(self.tree.names_in_range((0, 0), 'SE', 4)) == [
+            '0', '1', '2', '3', '4']
+
+
+class TestLinearQuadTree(TreesTest):
+    def setup_method(self):
+        self.tree = trees.LinearQuadTree((250, 250))
+
+    def test_height(self):
+        assert self.tree.height() == 1
+        self.tree.insert('jon', (250, 250))
+        assert self.tree.height() == 1
+        self.tree.insert('joe', (300, 300))
+        assert self.tree.height() == 2
+
+    def test_depth(self):
+        self.tree.insert('jon', (250, 250))
+        assert self.tree.depth(self.tree) is None
+
+    def test_codes_sorted(self):
+        for i in range(20):
+            self.tree.insert(str(i), ((i * 37) % 500, (i * 91) % 500))
+        assert list(self.tree._codes) == sorted(self.tree._codes)
+        assert all(self.tree._helper_point(code) == self.tree._index[name]
+                   for code, name in zip(self.tree._codes, self.tree._names))
+
+
+class TestPersistentQuadTree(TreesTest):
+    def setup_method(self):
+        self.tree = trees.PersistentQuadTree((250, 250))
+
+    def test_height(self):
+        assert self.tree.height() == 1
+        self.tree.insert('jon', (250, 250))
+        assert self.tree.height() == 1
+        self.tree.insert('joe', (300, 300))
+        assert self.tree.height() == 2
+
+    def test_depth(self):
+        self.tree.insert('jon', (250, 250))
+        assert self.tree.depth(self.tree) is None
+
+
+@pytest.mark.skipif(trees.np is None, reason='ArrayField needs NumPy')
+class TestArrayField(TreesTest):
+    def setup_method(self):
+        self.tree = trees.ArrayField((0, 0), (500, 500))
+
+    def test_height(self):
+        assert self.tree.height() == 1
+        self.tree.insert('jon', (250, 250))
+        assert self.tree.height() == 1
+        self.tree.insert('joe', (300, 300))
+        assert self.tree.height() == 2
+
+    def test_depth(self):
+        self.tree.insert('jon', (250, 250))
+        assert self.tree.depth(self.tree) is None
+
+
+@pytest.mark.skipif(trees.np is None, reason='ArrayField needs NumPy')
+class TestArrayFieldSorted(TestArrayField):
+    def setup_method(self):
+        self.tree = trees.ArrayField((0, 0), (500, 500), True)
+
+
 ##### PLAYERS #####
 
 class PlayersTest:
@@ -203,6 +356,10 @@ class PlayersTest:
         player._points = 33
         assert player.get_points() == 33
 
+    def test_slots(self):
+        player = players.Player('eric', 1, 2, self.game, 'green', (100, 100))
+        assert not hasattr(player, '__dict__')
+
     def test_select_target(self):
         player = players.Player('eric', 1, 2, self.game, 'green', (100, 100))
         targets = set(player._targets)
@@ -253,6 +410,7 @@ class PlayersTest:
         player._location = loc
         player._targets = []
         player._enemies = []
+        player.set_roles(None, None)
         player._vision = 100
         self.game.field.remove(player._name)
         self.game.field.insert(player._name, loc)
@@ -280,6 +438,36 @@ class PlayersTest:
         assert player.next_direction() == set('NSEW')
         assert player._direction in set('NSEW')
 
+    def test_next_direction_roles(self):
+        coords = [(50, 50), (50, 450), (450, 450), (450, 50)]
+        player, others = self._move_into_starting_position(coords, [0], [2])
+        player._vision = 300
+        self.game.field.set_role(others[0]._name, 'prey')
+        self.game.field.set_role(others[2]._name, 'hunter')
+        for seed in range(20):
+            random.seed(seed)
+            by_lists = players.Player.next_directions([player, others[1]])
+            player.set_roles('prey', 'hunter')
+            random.seed(seed)
+            assert players.Player.next_directions([player, others[1]]) == \
+                by_lists
+            random.seed(seed)
+            assert player.next_direction() == by_lists[0]
+            player.set_roles(None, None)
+
+    def test_next_directions(self):
+        coords = [(50, 50), (50, 450), (450, 450), (450, 50)]
+        targets = [0]
+        enemies = []
+        player, others = self._move_into_starting_position(coords, targets,
+                                                           enemies)
+        player._vision = 300
+        directions = players.Player.next_directions([player, others[1]])
+        assert len(directions) == 2
+        assert player._direction in directions[0]
+        assert others[1]._direction in directions[1]
+        assert directions[0] <= set('NSEW')
+
     def test_move_no_collision(self):
         coords = [(50, 50), (50, 450), (450, 450), (450, 50)]
         targets = []
@@ -324,8 +512,60 @@ class TestPlayers2DTree(PlayersTest):
         self.game = games.Tag(5, trees.TwoDTree((0, 0), (500, 500)), 5, 3, 4)
 
 
+class TestPlayersScapegoatTwoDTree(PlayersTest):
+    def setup_method(self):
+        self.game = games.Tag(5, trees.TwoDTree((0, 0), (500, 500), 0.7), 5,
+                              3, 4)
+
+
+class TestPlayersStaticTwoDTree(PlayersTest):
+    def setup_method(self):
+        self.game = games.Tag(5, trees.StaticTwoDTree((0, 0), (500, 500)), 5,
+                              3, 4)
+
+
+class TestPlayersGridField(PlayersTest):
+    def setup_method(self):
+        self.game = games.Tag(5, trees.GridField((0, 0), (500, 500)), 5, 3, 4)
+
+
+class TestPlayersBucketQuadTree(PlayersTest):
+    def setup_method(self):
+        self.game = games.Tag(5, trees.BucketQuadTree((250, 250)), 5, 3, 4)
+
+
+class TestPlayersLinearQuadTree(PlayersTest):
+    def setup_method(self):
+        self.game = games.Tag(5, trees.LinearQuadTree((250, 250)), 5, 3, 4)
+
+
+class TestPlayersPersistentQuadTree(PlayersTest):
+    def setup_method(self):
+        self.game = games.Tag(5, trees.PersistentQuadTree((250, 250)), 5, 3,
+                              4)
+
+
+@pytest.mark.skipif(trees.np is None, reason='ArrayField needs NumPy')
+class TestPlayersArrayField(PlayersTest):
+    def setup_method(self):
+        self.game = games.Tag(5, trees.ArrayField((0, 0), (500, 500), True),
+                              5, 3, 4)
+
+
 ##### GAMES #####
 
+def _roles_match_lists(people: List[players.Player]) -> None:
+    """ Check that every player in people sees the same targets and enemies
+    through the roles on the field as through its lists. """
+    for player in people:
+        roles = (player._target_role, player._enemy_role)
+        for query in player._helper_vision_queries():
+            by_roles = player._helper_seen(query)
+            player.set_roles(None, None)
+            assert player._helper_seen(query) == by_roles
+            player.set_roles(*roles)
+
+
 ### TAG ###
 
 class TagTests:
@@ -353,10 +593,26 @@ class TagTests:
         assert game._it == not_it
         assert it_points + 1 == game._players[game._it].get_points()
 
+    def test_handle_collisions_none_touching(self):
+        game = games.Tag(10, self.tree, 5, 3, 4)
+        it = game._it
+        game.handle_collisions(0)
+        assert game._it == it
+
     def test_check_for_winner_no_winner(self):
         game = games.Tag(10, self.tree, 5, 3, 4)
         assert game.check_for_winner() is None
 
+    def test_roles_match_lists(self):
+        game = games.Tag(10, self.tree, 5, 3, 300)
+        _roles_match_lists(game._players.values())
+        for _ in range(3):
+            not_it = next(p for p in game._players if p != game._it)
+            game.handle_collision(game._it, not_it)
+            assert game.field.count_roles_in_range((0, 0), 'SE', 500) == {
+                'it': 1, 'not-it': 9}
+            _roles_match_lists(game._players.values())
+
     def test_check_for_winner_one_left(self):
         game = games.Tag(1, self.tree, 5, 3, 4)
         assert game.check_for_winner() == list(game._players)[0]
@@ -377,6 +633,37 @@ class TestTag2dTree(TagTests):
         self.tree = trees.TwoDTree((0, 0), (500, 500))
 
 
+class TestTagStaticTwoDTree(TagTests):
+    def setup_method(self):
+        self.tree = trees.StaticTwoDTree((0, 0), (500, 500))
+
+
+class TestTagGridField(TagTests):
+    def setup_method(self):
+        self.tree = trees.GridField((0, 0), (500, 500))
+
+
+class TestTagBucketQuadTree(TagTests):
+    def setup_method(self):
+        self.tree = trees.BucketQuadTree((250, 250))
+
+
+class TestTagLinearQuadTree(TagTests):
+    def setup_method(self):
+        self.tree = trees.LinearQuadTree((250, 250))
+
+
+class TestTagPersistentQuadTree(TagTests):
+    def setup_method(self):
+        self.tree = trees.PersistentQuadTree((250, 250))
+
+
+@pytest.mark.skipif(trees.np is None, reason='ArrayField needs NumPy')
+class TestTagArrayField(TagTests):
+    def setup_method(self):
+        self.tree = trees.ArrayField((0, 0), (500, 500))
+
+
 ### ZOMBIE TAG ###
 
 class ZombieTagTests:
@@ -408,6 +695,17 @@ class ZombieTagTests:
         assert human._name in game._zombies
         assert human._name not in game._humans
 
+    def test_roles_match_lists(self):
+        game = games.ZombieTag(10, self.tree, 5, 3, 300)
+        for human in list(game._humans)[:4]:
+            _roles_match_lists(list(game._humans.values()) +
+                               list(game._zombies.values()))
+            game.handle_collision(human, next(iter(game._zombies)))
+        assert game.field.count_roles_in_range((0, 0), 'SE', 500) == {
+            'zombie': 5, 'human': 6}
+        _roles_match_lists(list(game._humans.values()) +
+                           list(game._zombies.values()))
+
     def test_check_for_winner_humans_win(self):
         game = games.ZombieTag(2, self.tree, 5, 3, 4)
         assert game.check_for_winner() == 'humans'
@@ -430,6 +728,37 @@ class TestZombieTag2dTree(ZombieTagTests):
         self.tree = trees.TwoDTree((0, 0), (500, 500))
 
 
+class TestZombieTagStaticTwoDTree(ZombieTagTests):
+    def setup_method(self):
+        self.tree = trees.StaticTwoDTree((0, 0), (500, 500))
+
+
+class TestZombieTagGridField(ZombieTagTests):
+    def setup_method(self):
+        self.tree = trees.GridField((0, 0), (500, 500))
+
+
+class TestZombieTagBucketQuadTree(ZombieTagTests):
+    def setup_method(self):
+        self.tree = trees.BucketQuadTree((250, 250))
+
+
+class TestZombieTagLinearQuadTree(ZombieTagTests):
+    def setup_method(self):
+        self.tree = trees.LinearQuadTree((250, 250))
+
+
+class TestZombieTagPersistentQuadTree(ZombieTagTests):
+    def setup_method(self):
+        self.tree = trees.PersistentQuadTree((250, 250))
+
+
+@pytest.mark.skipif(trees.np is None, reason='ArrayField needs NumPy')
+class TestZombieTagArrayField(ZombieTagTests):
+    def setup_method(self):
+        self.tree = trees.ArrayField((0, 0), (500, 500))
+
+
 ### ELIMINATION TAG ###
 
 class EliminationTagTests:
@@ -470,6 +799,13 @@ class EliminationTagTests:
         assert game._players[player1].get_targets()[0] == p2targets[0]
         assert game._players[player1].get_points() - 1 == points
 
+    def test_handle_collisions(self):
+        game = games.EliminationTag(10, self.tree, 3, 4)
+        game.handle_collisions(1000)
+        assert len(game._players) < 10
+        assert all(name in game.field for name in game._players)
+        game.handle_collisions(0)
+
     def test_check_for_winner_no_winner(self):
         game = games.EliminationTag(10, self.tree, 3, 4)
         assert game.check_for_winner() is None
@@ -491,5 +827,69 @@ class TestEliminationTag2dTree(EliminationTagTests):
         self.tree = trees.TwoDTree((0, 0), (500, 500))
 
 
+class TestEliminationTagStaticTwoDTree(EliminationTagTests):
+    def setup_method(self):
+        self.tree = trees.StaticTwoDTree((0, 0), (500, 500))
+
+
+class TestEliminationTagGridField(EliminationTagTests):
+    def setup_method(self):
+        self.tree = trees.GridField((0, 0), (500, 500))
+
+
+class TestEliminationTagBucketQuadTree(EliminationTagTests):
+    def setup_method(self):
+        self.tree = trees.BucketQuadTree((250, 250))
+
+
+class TestEliminationTagLinearQuadTree(EliminationTagTests):
+    def setup_method(self):
+        self.tree = trees.LinearQuadTree((250, 250))
+
+
+class TestEliminationTagPersistentQuadTree(EliminationTagTests):
+    def setup_method(self):
+        self.tree = trees.PersistentQuadTree((250, 250))
+
+
+@pytest.mark.skipif(trees.np is None, reason='ArrayField needs NumPy')
+class TestEliminationTagArrayField(EliminationTagTests):
+    def setup_method(self):
+        self.tree = trees.ArrayField((0, 0), (500, 500))
+
+
+### FIELDS OF ANY SIZE ###
+
+class TestWideFields:
+    def fields(self):
+        return [trees.QuadTree((50000, 20000), (0, 0, 100000, 40000)),
+                trees.PersistentQuadTree((50000, 20000),
+                                         (0, 0, 100000, 40000)),
+                trees.TwoDTree((0, 0), (100000, 40000)),
+                trees.GridField((0, 0), (100000, 40000), 1000)]
+
+    def test_tag(self):
+        for field in self.fields():
+            games.Tag(50, field, 5, 3, 4)
+            assert all(0 <= x <= 100000 and 0 <= y <= 40000 for x, y in
+                       field._index.values())
+            assert len(field._index) == 50
+
+    def test_zombie_tag(self):
+        for field in self.fields():
+            games.ZombieTag(50, field, 5, 3, 4)
+            assert field._index['0'] == (50000, 20000)
+            assert field._index['50'] == (50001, 20001)
+            assert all(0 <= x <= 100000 and 0 <= y <= 40000 for x, y in
+                       field._index.values())
+
+    def test_elimination_tag(self):
+        for field in self.fields():
+            games.EliminationTag(50, field, 3, 4)
+            assert all(0 <= x <= 100000 and 0 <= y <= 40000 for x, y in
+                       field._index.values())
+            assert any(x > 500 for x, _ in field._index.values())
+
+
 if __name__ == '__main__':
     pytest.main(['tests.py'])
@@ -1,8 +1,20 @@
 """ trees.py file is a file that has the Tree classes
-It contains Tree, QuadTree and TwoDTree
+It contains Tree, QuadTree, BucketQuadTree, LinearQuadTree,
+PersistentQuadTree, TwoDTree, StaticTwoDTree, GridField and ArrayField
+ArrayField needs NumPy, the others only need the standard library.
 """
 from __future__ import annotations
-from typing import Optional, List, Tuple, Dict
+import bisect
+import gc
+import heapq
+import mmap
+import struct
+from array import array
+from typing import Optional, List, Tuple, Dict, Callable, Iterator
+try:
+    import numpy as np
+except ImportError:
+    np = None
 
 
 class OutOfBoundsError(Exception):
@@ -11,9 +23,62 @@ class OutOfBoundsError(Exception):
     pass
 
 
+class _VisitStack(list):
+    """ _VisitStack is the stack of a walk over a tree that is counting its
+    work (see Tree.enable_stats). It is a list that counts how many times
+    something is popped off it, which is how many nodes the walk visits, so
+    the walks of a tree that is not counting use a plain list and do not pay
+    for the count.
+
+    === Attributes ===
+    visits : the number of times pop was called
+    """
+    __slots__ = ('visits',)
+    visits: int
+
+    def __init__(self, items: list) -> None:
+        """ Initialize a stack holding items in self with no visits yet """
+        super().__init__(items)
+        self.visits = 0
+
+    def pop(self, *args: int) -> object:
+        """ Remove and return the last item (or the one at the index in args)
+        of self, counting one more visit.
+
+        === DocTests ===
+        >>> stack = _VisitStack([1, 2])
+        >>> stack.pop(), stack.visits
+        (2, 1)
+        """
+        self.visits += 1
+        return super().pop(*args)
+
+
 class Tree:
-    """ Tree is the parent class of QuadTree and TwoDTree. It is completely
-    empty because everything is not implemented yet."""
+    """ Tree is the parent class of QuadTree, BucketQuadTree, LinearQuadTree,
+    PersistentQuadTree, TwoDTree, StaticTwoDTree, GridField and ArrayField.
+    It holds the defaults that work on any tree with a name index, and the
+    methods every tree has to implement itself.
+    Every Tree lists its attributes in __slots__, so that nodes do not carry a
+    __dict__ each. Tree itself has no attributes, so its __slots__ is empty."""
+    __slots__ = ()
+    _index: Dict[str, Tuple[int, int]]
+    _roles: Dict[str, str]
+    _stats: Optional[Dict[str, int]]
+    # The header of a saved field: b'TAGF', the format version, the kind of
+    # tree, the number of players, the number of nodes, the size of the names
+    # in bytes, six numbers that place the field and the tree's alpha.
+    _HEADER = struct.Struct('<4sHHQQQ6qd')
+    # The counters of a tree that keeps statistics (see enable_stats). Each
+    # operation counts its calls and, under its name with '_visits' added,
+    # the nodes those calls visited.
+    _STATS = ('insert', 'insert_visits', 'remove_point', 'remove_point_visits',
+              'names_in_range', 'names_in_range_visits', 'names_in_ranges',
+              'names_in_ranges_visits', 'count_in_range',
+              'count_in_range_visits', 'count_roles_in_range',
+              'count_roles_in_range_visits', 'allocated', 'freed', 'splits',
+              'merges', 'rebuilds')
+
     def __contains__(self, name: str) -> bool:
         """ Return True if a player named <name> is stored in this tree.
         __contains__ checks if name is contained in self
@@ -117,6 +182,400 @@ class Tree:
         """
         raise NotImplementedError
 
+    def iter_in_range(self, point: Tuple[int, int], direction: str,
+                      distance: int) -> Iterator[Tuple[str, Tuple[int, int]]]:
+        """ Yield the (name, location) of every player that
+        names_in_range(point, direction, distance) would name, in the same
+        order. iter_in_range streams the players in a box of self
+        Trees that can walk their nodes lazily find the next player only when
+        it is asked for, so a caller that stops early, like one that only
+        checks whether the box is empty, does not pay for the rest. This one
+        looks the players up in the index.
+
+        Runtime: faster than O(n) when distance is small
+
+        === precondition ===
+        direction in ['NW', 'SE', 'NE', 'SW']
+        self is the root of its tree
+        """
+        for name in self.names_in_range(point, direction, distance):
+            yield name, self._index[name]
+
+    def items(self) -> Iterator[Tuple[str, Tuple[int, int]]]:
+        """ Yield the (name, location) of every player in this tree. items
+        This one yields them in the order of the index, trees that can walk
+        their nodes yield them in the order of the walk instead. The tree must
+        not change while it is being iterated over.
+
+        Runtime: O(n) for all of them
+
+        === precondition ===
+        self is the root of its tree
+        """
+        yield from self._index.items()
+
+    def __iter__(self) -> Iterator[str]:
+        """ Yield the name of every player in this tree, in the order that
+        items yields them, so that iterating agrees with __contains__.
+        __iter__ goes over the names in self
+
+        Runtime: O(n) for all of them
+        """
+        for name, _ in self.items():
+            yield name
+
+    def count_in_range(self, point: Tuple[int, int], direction: str,
+                       distance: int) -> int:
+        """ Return the number of players that names_in_range(point,
+        direction, distance) would name. count_in_range counts a box of self
+        Trees that know how many players are below each node add up whole
+        subtrees that lie inside the box instead of going through their
+        players. This one counts what iter_in_range yields.
+
+        Runtime: faster than O(n) when distance is small
+
+        === precondition ===
+        direction in ['NW', 'SE', 'NE', 'SW']
+        self is the root of its tree
+        """
+        return sum(1 for _ in self.iter_in_range(point, direction, distance))
+
+    def set_role(self, name: str, role: Optional[str]) -> None:
+        """ Tag the player named <name> with <role>, or take its tag away if
+        role is None. set_role tags a player in self
+        A game tags its players by what they are, like 'it' or 'zombie', and
+        count_roles_in_range then counts them. The tag belongs to the name,
+        so it stays while the player moves and it can be set before the
+        player is inserted.
+
+        Runtime: O(log(n))
+
+        === precondition ===
+        self is the root of its tree
+        """
+        if role is None:
+            self._roles.pop(name, None)
+        else:
+            self._roles[name] = role
+
+    def count_roles_in_range(self, point: Tuple[int, int], direction: str,
+                             distance: int) -> Dict[str, int]:
+        """ Return how many of the players that names_in_range(point,
+        direction, distance) would name have each role, for the roles that
+        at least one of them has. count_roles_in_range counts roles in self
+        Trees that keep the roles below each node add them up for whole
+        subtrees inside the box. This one goes through iter_in_range.
+
+        Runtime: faster than O(n) when distance is small
+
+        === precondition ===
+        direction in ['NW', 'SE', 'NE', 'SW']
+        self is the root of its tree
+
+        === DocTests ===
+        >>> grid = GridField((0, 0), (500, 500))
+        >>> grid.insert('a', (10, 10))
+        >>> grid.insert('b', (20, 20))
+        >>> grid.set_role('a', 'it')
+        >>> grid.count_roles_in_range((0, 0), 'SE', 50)
+        {'it': 1}
+        """
+        counts = {}
+        for name, _ in self.iter_in_range(point, direction, distance):
+            role = self._roles.get(name)
+            if role is not None:
+                counts[role] = counts.get(role, 0) + 1
+        return counts
+
+    @staticmethod
+    def _helper_add_role(counts: Optional[Dict[str, int]], role: Optional[str],
+                         change: int) -> Optional[Dict[str, int]]:
+        """ _helper_add_role is helper add role.
+        It takes the role counts of a node (None if it has none), a role and
+        a change, and returns the counts with change added to role. Roles
+        that reach 0 are left out and None is returned if none are left, so
+        nodes without tagged players keep no dictionary. Nothing changes if
+        role is None.
+        """
+        if role is None:
+            return counts
+        if counts is None:
+            counts = {}
+        total = counts.get(role, 0) + change
+        if total:
+            counts[role] = total
+        else:
+            del counts[role]
+        return counts or None
+
+    @staticmethod
+    def _helper_merge_roles(counts: Optional[Dict[str, int]],
+                            other: Optional[Dict[str, int]]
+                            ) -> Optional[Dict[str, int]]:
+        """ _helper_merge_roles is helper merge roles.
+        It takes two role counts (either may be None) and returns counts with
+        every count of other added to it.
+        """
+        if not other:
+            return counts
+        if counts is None:
+            counts = {}
+        for role, count in other.items():
+            counts[role] = counts.get(role, 0) + count
+        return counts
+
+    def names_in_ranges(self, queries: List[Tuple[Tuple[int, int], str, int]]
+                        ) -> List[List[str]]:
+        """ Return, for each (point, direction, distance) query in <queries>,
+        the list of names that names_in_range(point, direction, distance) would
+        return. names_in_ranges answers many range queries at once in self
+        All of the queries are answered in one walk over the tree, so a node is
+        visited once no matter how many of the boxes reach it.
+
+        Runtime: faster than one names_in_range call per query
+
+        === precondition ===
+        every direction in queries is in ['NW', 'SE', 'NE', 'SW']
+        """
+        raise NotImplementedError
+
+    def nearest(self, point: Tuple[int, int], k: int = 1,
+                predicate: Optional[Callable[[str], bool]] = None) -> List[str]:
+        """ Return the names of the <k> players closest to <point>, closest
+        first. If <predicate> is given, only players whose name it returns
+        True for are counted. Fewer than k names are returned if there are not
+        enough players. nearest finds the closest players to point in self
+        Distance is the straight line distance between two locations.
+
+        For example: nearest(player_location, 1, set(targets).__contains__)
+        returns the name of the closest target.
+
+        Runtime: O(log(n)) for a small k when most players pass predicate
+        """
+        raise NotImplementedError
+
+    def collisions(self, radius: int) -> List[Tuple[str, str]]:
+        """ Return every pair of names of players in this tree whose locations
+        are at most <radius> apart (straight line distance). collisions finds
+        the players touching each other in self
+        Each pair is given once as (smaller name, bigger name) and the pairs are
+        sorted, so the same field always gives the same pairs in the same order.
+        Every player looks for others in the box around it with one
+        names_in_ranges walk, so pairs far apart are never compared.
+
+        Runtime: about O(n log(n)) when radius is small
+
+        === Preconditions ===
+        radius >= 0
+        self is the root of its tree
+
+        === DocTests ===
+        >>> quad = QuadTree((250, 250))
+        >>> quad.insert('b', (100, 100))
+        >>> quad.insert('a', (103, 104))
+        >>> quad.insert('c', (106, 100))
+        >>> quad.collisions(5)
+        [('a', 'b'), ('a', 'c')]
+        >>> quad.collisions(6)
+        [('a', 'b'), ('a', 'c'), ('b', 'c')]
+        """
+        players = [(name, point) for name, point in self._index.items()]
+        queries = [((point[0] - radius, point[1] - radius), 'SE', 2 * radius)
+                   for _, point in players]
+        result = set()
+        limit = radius * radius
+        for (name, point), names in zip(players,
+                                        self.names_in_ranges(queries)):
+            for other in names:
+                if other > name:
+                    there = self._index[other]
+                    if (there[0] - point[0]) ** 2 + (
+                            there[1] - point[1]) ** 2 <= limit:
+                        result.add((name, other))
+        return sorted(result)
+
+    @staticmethod
+    def _helper_distance(point: Tuple[int, int],
+                         bounds: Tuple[float, float, float, float]) -> float:
+        """ _helper_distance is helper distance.
+        It takes a point and bounds as smallest x, largest x, smallest y and
+        largest y and returns the squared distance from point to the closest
+        location inside bounds (0 if point is inside).
+        """
+        dx = max(bounds[0] - point[0], 0, point[0] - bounds[1])
+        dy = max(bounds[2] - point[1], 0, point[1] - bounds[3])
+        return dx * dx + dy * dy
+
+    @staticmethod
+    def _helper_box(point: Tuple[int, int], direction: str,
+                    distance: int) -> Tuple[int, int, int, int]:
+        """ _helper_box is helper box.
+        It takes a point direction and distance and returns the box that
+        names_in_range searches as its smallest x, largest x, smallest y and
+        largest y.
+
+        === Preconditions ===
+        direction in ['NW', 'SE', 'NE', 'SW']
+        """
+        if 'W' in direction:
+            xmin, xmas = point[0] - distance, point[0]
+        else:
+            xmin, xmas = point[0], point[0] + distance
+        if 'N' in direction:
+            ymin, ymax = point[1] - distance, point[1]
+        else:
+            ymin, ymax = point[1], point[1] + distance
+        return min(xmin, xmas), max(xmin, xmas), min(ymin, ymax), max(ymin,
+                                                                      ymax)
+
+    def save(self, path: str) -> None:
+        """ Save the players and the shape of this tree to the file at <path>,
+        so that load(path) gives the same tree back. save writes self to a file
+        The file is binary: a header, then the x and y of every player, the
+        length of every name, one byte per node for the shape of the tree and
+        the names themselves.
+
+        Runtime: O(n)
+
+        === Preconditions ===
+        self is the root of its tree
+        """
+        raise NotImplementedError
+
+    @classmethod
+    def load(cls, path: str) -> Tree:
+        """ Return the tree that save wrote to the file at <path>. load
+        The file is mapped into memory and the tree is built straight from it.
+        Raise a ValueError if the file was not saved by this kind of tree.
+
+        Runtime: O(n)
+        """
+        raise NotImplementedError
+
+    @staticmethod
+    def _helper_save(path: str, kind: int, numbers: Tuple[int, ...],
+                     alpha: float, points: array, names: List[str],
+                     topology: bytearray) -> None:
+        """ _helper_save is helper save.
+        It takes the path of a file, the kind of tree, the six numbers that
+        place the field, the alpha (0 if there is none), the x and y of every
+        player as an array, the names in the same order and one byte per node,
+        and writes them to the file in the layout that _helper_load reads.
+        The player at record i is at points[2 * i], points[2 * i + 1], so
+        players need no id of their own. The names are kept as their lengths
+        in characters followed by all of them in UTF-8. Points and name
+        lengths are written in the byte order of this machine.
+        """
+        blob = ''.join(names).encode('utf-8')
+        lengths = array('I', [len(name) for name in names])
+        with open(path, 'wb') as file:
+            file.write(Tree._HEADER.pack(b'TAGF', 1, kind, len(names),
+                                         len(topology), len(blob), *numbers,
+                                         alpha))
+            file.write(points)
+            file.write(lengths)
+            file.write(topology)
+            file.write(blob)
+
+    @staticmethod
+    def _helper_load(path: str, kind: int,
+                     build: Callable[[Tuple[int, ...], float, memoryview,
+                                      List[str], memoryview], Tree]) -> Tree:
+        """ _helper_load is helper load.
+        It takes the path of a file that _helper_save wrote, the kind of tree
+        it should hold and a function build, and returns what build gives for
+        the six numbers, the alpha, the points, the names and the topology
+        in the file. The file is mapped into memory and the points and the
+        topology are handed to build as views of it, so nothing is parsed
+        node by node. The views are released before the file is closed.
+        Raise a ValueError if the file is not a saved tree of this kind.
+        """
+        with open(path, 'rb') as file, mmap.mmap(
+                file.fileno(), 0, access=mmap.ACCESS_READ) as mapped, \
+                memoryview(mapped) as view:
+            if len(view) < Tree._HEADER.size:
+                raise ValueError('not a saved field: ' + path)
+            header = Tree._HEADER.unpack_from(view)
+            if header[0] != b'TAGF' or header[1] != 1 or header[2] != kind:
+                raise ValueError('not a saved field of this kind: ' + path)
+            count, nodes, size = header[3], header[4], header[5]
+            start = Tree._HEADER.size
+            middle = start + 16 * count
+            end = middle + 4 * count
+            with view[start:middle].cast('q') as points, \
+                    view[middle:end].cast('I') as lengths, \
+                    view[end:end + nodes] as topology:
+                text = str(view[end + nodes:end + nodes + size], 'utf-8')
+                names = []
+                offset = 0
+                for length in lengths:
+                    names.append(text[offset:offset + length])
+                    offset += length
+                return build(header[6:12], header[12], points, names,
+                             topology)
+
+    def _helper_stack(self, items: list) -> list:
+        """ _helper_stack is helper stack.
+        It takes self and the items a walk starts from, and returns the stack
+        for the walk: a _VisitStack if self is counting, so the walk can be
+        added to the counters with its visits, or else a plain list.
+        """
+        return items if self._stats is None else _VisitStack(items)
+
+    def _helper_record(self, operation: str, visits: int) -> None:
+        """ _helper_record is helper record.
+        It takes self, the name of an operation in _STATS and the number of
+        nodes one call of it visited, and adds the call and the visits to the
+        counters of self.
+
+        === Preconditions ===
+        self is counting
+        """
+        self._stats[operation] += 1
+        self._stats[operation + '_visits'] += visits
+
+    def enable_stats(self, enabled: bool = True) -> None:
+        """ Start counting the work done by the operations of this tree from
+        zero, or stop counting if <enabled> is False. enable_stats in self
+        The counters are listed in _STATS: the calls to and nodes visited by
+        insert, remove_point (which remove and move use too), names_in_range
+        (and iter_in_range), names_in_ranges, count_in_range and
+        count_roles_in_range, and the nodes allocated and freed, leaves split
+        and merged and subtrees rebuilt. A tree that is not counting only
+        checks once per operation whether it is.
+
+        === precondition ===
+        self is the root of its tree
+        """
+        raise NotImplementedError
+
+    def stats(self) -> Dict[str, int]:
+        """ Return a copy of the counters of this tree, or an empty dictionary
+        if it is not counting. stats reads the counters of self
+
+        === precondition ===
+        self is the root of its tree
+        """
+        raise NotImplementedError
+
+    def reset_stats(self) -> None:
+        """ Set every counter of this tree back to 0, for example at the start
+        of every tick. reset_stats clears the counters of self
+        Nothing happens if the tree is not counting.
+
+        === precondition ===
+        self is the root of its tree
+        """
+        raise NotImplementedError
+
+    def bounds(self) -> Tuple[int, int, int, int]:
+        """ Return the smallest x, smallest y, largest x and largest y that a
+        player on this field can have. bounds
+
+        Runtime: O(1)
+        """
+        raise NotImplementedError
+
     def size(self) -> int:
         """ Return the number of nodes in <self>
 
@@ -160,8 +619,8 @@ class Tree:
 
 class QuadTree(Tree):
     """ QuadTree is a Quad Tree that is a subclass of Tree.
-    It sorts players/people into a square field where each quadrant is named
-    and may have sub-quadrants.
+    It sorts players/people into a rectangular field where each quadrant is
+    named and may have sub-quadrants.
     If there are two players in the same quadrants, we want to sort them into
     sub-quadrants of this quadrant. This means that quadrants with a name
     and point will only exist in leaves of the tree.
@@ -176,10 +635,30 @@ class QuadTree(Tree):
     _nw : the north-western quadrant in this field of this centre
     _se : the south-eastern quadrant in this field of this centre
     _sw : the south-western quadrant in this field of this centre
+    _bounds : the extent of this quadrant, as the smallest x, smallest y,
+        largest x and largest y a point in this quadrant can have
+    _index : a dictionary mapping the names of players in this field to their
+        points (or None if this is a sub-quadrant)
+    _count : the number of players in this quadrant and its sub-quadrants
+    _size : the number of quadrants in this quadrant's subtree, counting
+        itself
+    _roles : a dictionary mapping the names of players to their role tags
+        (or None if this is a sub-quadrant)
+    _role_counts : how many of the players in this quadrant and its
+        sub-quadrants have each role (or None if none of them has one)
+    _stats : the counters of the work done by the operations of this field
+        (or None if it is not counting or this is a sub-quadrant)
 
     === Representation Invariants ===
     If any of _ne, _nw, _se, _sw are not None, then this quadrant cannot have
         a _name or _point value.
+    The _bounds of a sub-quadrant are the part of its parent's _bounds on its
+        side of the parent's _centre, and its _centre is the middle of them.
+    _count is 1 for a leaf with a player, 0 for an empty tree, and otherwise
+        the sum of the _count of the sub-quadrants. _size is 1 plus the sum of
+        the _size of the sub-quadrants. _role_counts adds up the same way.
+    Only the root of a tree has an _index, and it holds exactly the players
+        stored in the tree.
     If all of those are None, then this can have a _name and _point value.
     If all of those are None and there are no _name or _point value then
         the tree is considered empty.
@@ -199,6 +678,9 @@ class QuadTree(Tree):
     >>> quad._centre == (250, 250)
     True
     """
+    __slots__ = ('_centre', '_name', '_point', '_ne', '_nw', '_se', '_sw',
+                 '_bounds', '_index', '_count', '_size', '_roles',
+                 '_role_counts', '_stats')
     _centre: Tuple[int, int]
     _name: Optional[str]
     _point: Optional[Tuple[int, int]]
@@ -206,15 +688,30 @@ class QuadTree(Tree):
     _nw: Optional[QuadTree]
     _se: Optional[QuadTree]
     _sw: Optional[QuadTree]
-
-    def __init__(self, centre: Tuple[int, int]) -> None:
+    _bounds: Tuple[int, int, int, int]
+    _index: Optional[Dict[str, Tuple[int, int]]]
+    _count: int
+    _size: int
+    _roles: Optional[Dict[str, str]]
+    _role_counts: Optional[Dict[str, int]]
+    _stats: Optional[Dict[str, int]]
+
+    def __init__(self, centre: Tuple[int, int],
+                 bounds: Optional[Tuple[int, int, int, int]] = None) -> None:
         """Initialize a new Tree instance with a centre at self
+        The field covers bounds, given as the smallest x, smallest y, largest
+        x and largest y a point can have. Without bounds the field is the
+        square from (0, 0) whose centre is the largest coordinate of centre.
 
         Runtime: O(1)
 
-        Preconditions
+        === Preconditions ===
+        bounds is None or bounds[0] <= centre[0] <= bounds[2] and
+            bounds[1] <= centre[1] <= bounds[3]
 
         === DocTests ===
+        >>> QuadTree((50000, 20000), (0, 0, 100000, 40000))._bounds
+        (0, 0, 100000, 40000)
         >>> quad = QuadTree((250, 250))
         >>> quad._ne is None
         True
@@ -228,6 +725,10 @@ class QuadTree(Tree):
         True
         >>> quad._centre == (250,250)
         True
+        >>> quad._bounds
+        (0, 0, 500, 500)
+        >>> quad._count, quad._size
+        (0, 1)
         """
         self._centre = centre
         self._name = None
@@ -236,11 +737,275 @@ class QuadTree(Tree):
         self._nw = None
         self._se = None
         self._sw = None
+        if bounds is None:
+            better = max(centre[0], centre[1])
+            bounds = (0, 0, better * 2, better * 2)
+        self._bounds = bounds
+        self._index = {}
+        self._count = 0
+        self._size = 1
+        self._roles = {}
+        self._role_counts = None
+        self._stats = None
+
+    def _helper_subtree(self, direction: str) -> QuadTree:
+        """ _helper_subtree is helper subtree.
+        It creates and returns the sub-quadrant of self in direction. Its
+        bounds are the part of self's bounds on that side of self's centre
+        and its centre is the middle of those bounds, so points that are
+        not equal always end up in different quadrants eventually.
+        Sub-quadrants do not keep an index or roles, only the root does.
+
+        === Preconditions ===
+        direction in ['NW', 'SW', 'NE', 'SE']
+        """
+        xmin, ymin, xmax, ymax = self._bounds
+        if 'W' in direction:
+            xmax = self._centre[0]
+        else:
+            xmin = self._centre[0] + 1
+        if 'N' in direction:
+            ymax = self._centre[1]
+        else:
+            ymin = self._centre[1] + 1
+        quadrant = QuadTree(((xmin + xmax) // 2, (ymin + ymax) // 2))
+        quadrant._bounds = (xmin, ymin, xmax, ymax)
+        quadrant._index = None
+        quadrant._roles = None
+        return quadrant
+
+    def _helper_recount(self) -> None:
+        """ _helper_recount is helper recount.
+        It takes self and sets its _count and _size from its own player and
+        the _count and _size of its sub-quadrants. Quadrants that change are
+        recounted from the bottom up, so the sub-quadrants are already right.
+        """
+        count = 0 if self._point is None else 1
+        size = 1
+        for child in (self._nw, self._sw, self._ne, self._se):
+            if child is not None:
+                count += child._count
+                size += child._size
+        self._count = count
+        self._size = size
+
+    @classmethod
+    def from_points(cls, items: List[Tuple[str, Tuple[int, int]]],
+                    centre: Tuple[int, int],
+                    bounds: Optional[Tuple[int, int, int, int]] = None
+                    ) -> QuadTree:
+        """ Return a new QuadTree with a centre at centre and bounds that holds
+        every (name, point) player in items. from_points builds a tree in one
+        go. The players are split into the four quadrants once per level
+        instead of being inserted one by one, and the tree is the same as the
+        one that inserting them would give. The garbage collector is paused
+        while the quadrants are made, since quadrants never refer back to their
+        parents.
+        Raise an OutOfBoundsError if a point is out of bounds or two players are
+        at the same point.
+
+        Runtime: O(n log(n))
+
+        === DocTests ===
+        >>> quad = QuadTree.from_points([('1', (250, 250)), ('2', (450, 450)),
+        ...                              ('3', (300, 300))], (250, 250))
+        >>> quad._nw._name
+        '1'
+        >>> quad._se._nw._name, quad._se._se._name
+        ('3', '2')
+        """
+        tree = cls(centre, bounds)
+        points = set()
+        for _, point in items:
+            if point[0] < tree._bounds[0] or point[1] < tree._bounds[
+                    1] or point[0] > tree._bounds[2] or point[1] > \
+                    tree._bounds[3] or point in points:
+                raise OutOfBoundsError
+            points.add(point)
+        enabled = gc.isenabled()
+        gc.disable()
+        try:
+            tree._helper_build(items)
+        finally:
+            if enabled:
+                gc.enable()
+        tree._index = {name: point for name, point in items}
+        return tree
+
+    def _helper_build(self, items: List[Tuple[str, Tuple[int, int]]]) -> None:
+        """ _helper_build is helper build.
+        It takes self and items and puts every player in items into this empty
+        quadrant by splitting them between the sub-quadrants. The quadrants
+        still to be filled are kept on a stack instead of recursing. A
+        quadrant is filled after its parent, so going through them backwards
+        counts every quadrant after its sub-quadrants.
+
+        === Preconditions ===
+        Every point in items is in this quadrant's bounds and no two are equal
+        """
+        stack = [(self, items)]
+        made = []
+        while stack:
+            quadrant, players = stack.pop()
+            made.append(quadrant)
+            if len(players) == 1:
+                quadrant._name, quadrant._point = players[0]
+                quadrant._count = 1
+                continue
+            nw, sw, ne, se = [], [], [], []
+            cx, cy = quadrant._centre
+            for item in players:
+                x, y = item[1]
+                if x <= cx:
+                    if y <= cy:
+                        nw.append(item)
+                    else:
+                        sw.append(item)
+                elif y <= cy:
+                    ne.append(item)
+                else:
+                    se.append(item)
+            if nw:
+                quadrant._nw = quadrant._helper_subtree('NW')
+                stack.append((quadrant._nw, nw))
+            if sw:
+                quadrant._sw = quadrant._helper_subtree('SW')
+                stack.append((quadrant._sw, sw))
+            if ne:
+                quadrant._ne = quadrant._helper_subtree('NE')
+                stack.append((quadrant._ne, ne))
+            if se:
+                quadrant._se = quadrant._helper_subtree('SE')
+                stack.append((quadrant._se, se))
+        for quadrant in reversed(made):
+            quadrant._helper_recount()
+
+    def save(self, path: str) -> None:
+        """ Save the players and the shape of this tree to the file at <path>,
+        so that load(path) gives the same tree back. save writes self to a file
+        The quadrants are written in preorder (nw, sw, ne, se), each as one
+        byte whose bits say which of its nw, sw, ne and se sub-quadrants exist,
+        so a leaf is 0. The players are written in the order of their leaves.
+
+        Runtime: O(n)
+
+        === Preconditions ===
+        self is the root of its tree
+
+        === DocTests ===
+        >>> import os, tempfile
+        >>> quad = QuadTree.from_points([('1', (250, 250)), ('2', (450, 450)),
+        ...                              ('3', (300, 300))], (250, 250))
+        >>> path = os.path.join(tempfile.mkdtemp(), 'field.tag')
+        >>> quad.save(path)
+        >>> loaded = QuadTree.load(path)
+        >>> loaded._nw._name, loaded._se._nw._name, loaded._se._se._name
+        ('1', '3', '2')
+        >>> loaded._index == quad._index
+        True
+        """
+        points = array('q')
+        names = []
+        topology = bytearray()
+        stack = [self] if self._name is not None or not self.is_leaf() else []
+        while stack:
+            quadrant = stack.pop()
+            if quadrant._name is not None:
+                topology.append(0)
+                points.append(quadrant._point[0])
+                points.append(quadrant._point[1])
+                names.append(quadrant._name)
+                continue
+            children = (quadrant._nw, quadrant._sw, quadrant._ne, quadrant._se)
+            topology.append(sum(1 << bit for bit, child in enumerate(children)
+                                if child is not None))
+            stack.extend(child for child in reversed(children)
+                         if child is not None)
+        Tree._helper_save(path, 1, self._centre + self._bounds, 0.0, points,
+                          names, topology)
+
+    @classmethod
+    def load(cls, path: str) -> QuadTree:
+        """ Return the QuadTree that save wrote to the file at <path>. load
+        The file is mapped into memory and the quadrants are made from its
+        topology bytes in one pass, with the garbage collector paused as in
+        from_points. No point is routed or checked again.
+        Raise a ValueError if the file was not saved by a QuadTree.
+
+        Runtime: O(n)
+        """
+        return Tree._helper_load(path, 1, cls._helper_from_file)
+
+    @classmethod
+    def _helper_from_file(cls, numbers: Tuple[int, ...], _: float,
+                          points: memoryview, names: List[str],
+                          topology: memoryview) -> QuadTree:
+        """ _helper_from_file is helper from file.
+        It takes the centre and bounds, the points, the names and the topology
+        bytes of a saved QuadTree and returns the tree they describe. The
+        quadrants still to be filled are kept on a stack in preorder, so each
+        byte belongs to the quadrant on top of it. The quadrants are counted
+        backwards afterwards, as in _helper_build.
+        """
+        tree = cls((numbers[0], numbers[1]), tuple(numbers[2:6]))
+        enabled = gc.isenabled()
+        gc.disable()
+        try:
+            stack = [tree] if names else []
+            made = []
+            record = 0
+            for mask in topology:
+                quadrant = stack.pop()
+                made.append(quadrant)
+                if mask == 0:
+                    quadrant._name = names[record]
+                    quadrant._point = (points[2 * record],
+                                       points[2 * record + 1])
+                    quadrant._count = 1
+                    record += 1
+                    continue
+                if mask & 8:
+                    quadrant._se = quadrant._helper_subtree('SE')
+                    stack.append(quadrant._se)
+                if mask & 4:
+                    quadrant._ne = quadrant._helper_subtree('NE')
+                    stack.append(quadrant._ne)
+                if mask & 2:
+                    quadrant._sw = quadrant._helper_subtree('SW')
+                    stack.append(quadrant._sw)
+                if mask & 1:
+                    quadrant._nw = quadrant._helper_subtree('NW')
+                    stack.append(quadrant._nw)
+            for quadrant in reversed(made):
+                quadrant._helper_recount()
+        finally:
+            if enabled:
+                gc.enable()
+        tree._index = dict(zip(names, zip(points[0::2], points[1::2])))
+        return tree
+
+    def _helper_find(self, name: str) -> Optional[Tuple[int, int]]:
+        """ _helper_find is helper find.
+        It takes self and name and returns the point of the player named name,
+        or None if there is no such player. The root answers from its index,
+        sub-quadrants are searched.
+        """
+        if self._index is not None:
+            return self._index.get(name)
+        stack = [self]
+        while stack:
+            quadrant = stack.pop()
+            if quadrant._name == name:
+                return quadrant._point
+            stack.extend(child for child in (quadrant._se, quadrant._ne,
+                                             quadrant._sw, quadrant._nw)
+                         if child is not None)
+        return None
 
     def __contains__(self, name: str) -> bool:
         """ Return True if a player named <name> is stored in this tree.
         __contains__ checks if name is contained in self
-        Runtime: O(n)
+        Runtime: O(1)
 
         Preconditions
 
@@ -255,21 +1020,7 @@ class QuadTree(Tree):
         >>> '3' in quad
         False
         """
-        if self._name is not None:
-            return name == self._name
-        if self._nw is not None:
-            if self._nw.__contains__(name):
-                return True
-        if self._ne is not None:
-            if self._ne.__contains__(name):
-                return True
-        if self._sw is not None:
-            if self._sw.__contains__(name):
-                return True
-        if self._se is not None:
-            if self._se.__contains__(name):
-                return True
-        return False
+        return self._helper_find(name) is not None
 
     def contains_point(self, point: Tuple[int, int]) -> bool:
         """ Return True if a player at location <point> is stored in this tree.
@@ -289,44 +1040,31 @@ class QuadTree(Tree):
         >>> quad.contains_point((450, 450))
         False
         """
-        if self.is_empty():
-            return False
-        elif self._point is not None:
-            return self._point == point
-        else:
-            if point[0] <= self._centre[0] and point[1] <= self._centre[
-                    1] and self._nw is not None:
-                return self._nw.contains_point(point)
-            elif point[0] <= self._centre[0] and self._sw is not None:
-                return self._sw.contains_point(point)
-            elif point[1] <= self._centre[1] and self._ne is not None:
-                return self._ne.contains_point(point)
-            elif point[1] > self._centre[1] and self._se is not None:
-                return self._se.contains_point(point)
-
-    def _helper_shorten_insert(self, subtree: QuadTree, name: str,
-                               point: Tuple[int, int]) -> None:
-        """ _helper_shorten_insert is helper shorten insert.
-        It takes a subtree name and point and returns nothing in self.
-        It checks if something is out of bounds then sets a new subquadrant
-        and then reinserts the original point
+        quadrant = self._helper_leaf(point)
+        return quadrant is not None and quadrant._point == point
 
-        === Preconditions ===
-        The point is not out of the field's bounds. This is already checked for
-        within insert so it is no problem unless helper method run independently
+    def _helper_child(self, point: Tuple[int, int]) -> Optional[QuadTree]:
+        """ _helper_child is helper child.
+        It takes self and point and returns the sub-quadrant of self that
+        point belongs in (or None if that sub-quadrant does not exist).
         """
-        if subtree._name is not None and subtree._point == point:
-            raise OutOfBoundsError
-        new = self._helper_create_quadrant(subtree, point)
-        if new._name is None and new.is_leaf():
-            new._name = name
-            new._point = point
-        else:
-            subtree.insert(name, point)
-        if subtree._name is not None:
-            na, po = subtree._name, subtree._point
-            subtree._name, subtree._point = None, None
-            self.insert(na, po)
+        if point[0] <= self._centre[0]:
+            if point[1] <= self._centre[1]:
+                return self._nw
+            return self._sw
+        elif point[1] <= self._centre[1]:
+            return self._ne
+        return self._se
+
+    def _helper_leaf(self, point: Tuple[int, int]) -> Optional[QuadTree]:
+        """ _helper_leaf is helper leaf.
+        It takes self and point and walks down to the leaf quadrant that point
+        belongs in, and returns it (or None if the walk falls off the tree).
+        """
+        quadrant = self
+        while quadrant is not None and not quadrant.is_leaf():
+            quadrant = quadrant._helper_child(point)
+        return quadrant
 
     def insert(self, name: str, point: Tuple[int, int]) -> None:
         """Insert a player named <name> into this tree at point <point>. insert
@@ -360,84 +1098,102 @@ class QuadTree(Tree):
         ...     print('Error')
         Error
         """
-        better = max(self._centre[0], self._centre[1])
-        if point[0] > better*2 or point[1] > better*2 or point[0] < 0 or point[
-                1] < 0:
+        if point[0] < self._bounds[0] or point[1] < self._bounds[1] or point[
+                0] > self._bounds[2] or point[1] > self._bounds[3]:
             raise OutOfBoundsError
-        elif self.is_empty():
-            self._name = name
-            self._point = point
-        elif self._point is not None and (self.is_leaf()):
-            n, self._point = self._point, None
-            self.insert(self._name, n)
-            self._name = None
-            self.insert(name, point)
-        else:
-            half = int(self._centre[0] / 2)
-            if point[0] <= self._centre[0] and point[1] <= self._centre[1]:
-                if self._nw is None:
-                    self._nw = QuadTree((half, half))
-                    self._nw._name = name
-                    self._nw._point = point
-                else:
-                    self._helper_shorten_insert(self._nw, name, point)
-            elif point[0] <= self._centre[0]:
-                if self._sw is None:
-                    self._sw = QuadTree((half, self._centre[1] + half))
-                    self._sw.insert(name, point)
-                else:
-                    self._helper_shorten_insert(self._sw, name, point)
-            elif point[1] <= self._centre[1]:
-                if self._ne is None:
-                    self._ne = QuadTree((self._centre[0] + half, half))
-                    self._ne.insert(name, point)
-                else:
-                    self._helper_shorten_insert(self._ne, name, point)
-            else:
-                if self._se is None:
-                    self._se = QuadTree(
-                        (self._centre[0] + half, self._centre[1] + half))
-                    self._se.insert(name, point)
-                else:
-                    self._helper_shorten_insert(self._se, name, point)
+        self._helper_insert(name, point)
+        if self._index is not None:
+            self._index[name] = point
+
+    def _helper_insert(self, name: str, point: Tuple[int, int]) -> None:
+        """ _helper_insert is helper insert.
+        It takes self name and point and places the player in the right
+        quadrant without touching the index.
+
+        A leaf that already has a player is split by moving its player down
+        into a new sub-quadrant, and the walk goes on until an empty quadrant
+        is found. Raise an OutOfBoundsError before changing anything if a
+        player is already at point. The quadrants passed on the way down are
+        kept with the number of sub-quadrants each one got (a new one is the
+        only kind with no players), and once the player is placed each of
+        them counts one more player and the quadrants made below it, and one
+        more of the player's role if it has one. If self is counting, the
+        quadrants visited, made and split are added to its counters.
+
+        === Preconditions ===
+        The point is not out of the field's bounds. This is already checked for
+        within insert so it is no problem unless helper method run independently
+        self is the root of its tree
+        """
+        path = []
+        splits = 0
+        quadrant = self
+        while not quadrant.is_empty():
+            made = 0
+            if quadrant.is_leaf():
+                if quadrant._point == point:
+                    raise OutOfBoundsError
+                old = self._helper_create_quadrant(quadrant, quadrant._point)
+                old._name, old._point = quadrant._name, quadrant._point
+                old._count = 1
+                if quadrant._role_counts is not None:
+                    old._role_counts = dict(quadrant._role_counts)
+                quadrant._name, quadrant._point = None, None
+                made = 1
+                splits += 1
+            child = self._helper_create_quadrant(quadrant, point)
+            if child._count == 0:
+                made += 1
+            path.append((quadrant, made))
+            quadrant = child
+        quadrant._name = name
+        quadrant._point = point
+        quadrant._count = 1
+        added = 0
+        for parent, made in reversed(path):
+            added += made
+            parent._count += 1
+            parent._size += added
+        role = self._roles.get(name)
+        if role is not None:
+            quadrant._role_counts = {role: 1}
+            for parent, _ in path:
+                parent._role_counts = Tree._helper_add_role(
+                    parent._role_counts, role, 1)
+        if self._stats is not None:
+            self._helper_record('insert', len(path) + 1)
+            self._stats['allocated'] += added
+            self._stats['splits'] += splits
 
     def _helper_create_quadrant(self, quadrant: QuadTree,
                                 point: Tuple[int, int]) -> QuadTree:
         """ _helper_create_quadrant is helper create quadrant.
         It takes a quadrant and point and returns a QuadTree in self.
-        It uses the current centre and the quadrant's centre to find
-        the next centre and create and return it. Preconditions
+        It uses the quadrant's bounds to create the sub-quadrant of quadrant
+        that point falls in (if it does not exist yet) and returns it.
+        Preconditions
         """
-        half = abs(self._centre[0] - quadrant._centre[0]) / 2
         if point[0] <= quadrant._centre[0] and point[1] <= quadrant._centre[1]:
             if quadrant._nw is None:
-                quadrant._nw = QuadTree(
-                    (int(quadrant._centre[0] - half),
-                     quadrant._centre[1] - int(half)))
+                quadrant._nw = quadrant._helper_subtree('NW')
             return quadrant._nw
         elif point[0] <= quadrant._centre[0]:
             if quadrant._sw is None:
-                quadrant._sw = QuadTree(
-                    (quadrant._centre[0] - int(half),
-                     int(quadrant._centre[1] + half)))
+                quadrant._sw = quadrant._helper_subtree('SW')
             return quadrant._sw
         elif point[1] <= quadrant._centre[1]:
             if quadrant._ne is None:
-                quadrant._ne = QuadTree(
-                    (int(quadrant._centre[0] + half),
-                     quadrant._centre[1] - int(half)))
+                quadrant._ne = quadrant._helper_subtree('NE')
             return quadrant._ne
         else:
             if quadrant._se is None:
-                quadrant._se = QuadTree(
-                    (int(quadrant._centre[0] + half),
-                     int(quadrant._centre[1] + half)))
+                quadrant._se = quadrant._helper_subtree('SE')
             return quadrant._se
 
     def remove(self, name: str) -> None:
         """ Remove information about a player named <name> from this tree.
         remove a name from self
-        Runtime: O(n)
+        Runtime: O(log(n))
 
         Preconditions
 
@@ -451,71 +1207,54 @@ class QuadTree(Tree):
         >>> '1' in quad
         False
         """
-        if self.is_leaf():
-            if self._name == name:
-                self._name, self._point = None, None
-        else:
-            if self._nw is not None:
-                if name in self.names_in_range(self._centre, 'NW',
-                                               self._centre[0]):
-                    self._nw.remove(name)
-                    self._helper_remove_extra_nodes()
-                    return None
-            if self._sw is not None:
-                if name in self.names_in_range(
-                        (self._centre[0], self._centre[1] + 1), 'SW',
-                        self._centre[0]):
-                    self._sw.remove(name)
-                    self._helper_remove_extra_nodes()
-                    return None
-            if self._ne is not None:
-                if name in self.names_in_range(
-                        (self._centre[0] + 1, self._centre[1]), 'NE',
-                        self._centre[0]):
-                    self._ne.remove(name)
-                    self._helper_remove_extra_nodes()
-                    return None
-            if self._se is not None:
-                if name in self.names_in_range(
-                        (self._centre[0] + 1, self._centre[1] + 1), 'SE',
-                        self._centre[0]):
-                    self._se.remove(name)
-                    self._helper_remove_extra_nodes()
-                    return None
-
-    def _helper_remove_extra_nodes(self) -> None:
+        point = self._helper_find(name)
+        if point is not None:
+            self.remove_point(point)
+
+    def _helper_remove_extra_nodes(self) -> int:
         """ _helper_remove_nodes is helper remove nodes.
-        It takes self and removes its extra empty leaves
+        It takes self and removes its extra empty leaves, and returns how many
+        sub-quadrants it removed. Every one of them is a leaf.
         Preconditions
         """
+        removed = 0
         if self._nw is not None and self._nw.is_empty():
             self._nw = None
+            removed += 1
         if self._sw is not None and self._sw.is_empty():
             self._sw = None
+            removed += 1
         if self._ne is not None and self._ne.is_empty():
             self._ne = None
+            removed += 1
         if self._se is not None and self._se.is_empty():
             self._se = None
+            removed += 1
         if self._nw is not None and self._sw is None and self._se is None and (
                 self._ne is None):
             if self._nw.is_leaf():
                 self._name, self._point = self._nw._name, self._nw._point
                 self._nw = None
+                removed += 1
         if self._sw is not None and self._nw is None and self._se is None and (
                 self._ne is None):
             if self._sw.is_leaf():
                 self._name, self._point = self._sw._name, self._sw._point
                 self._sw = None
+                removed += 1
         if self._ne is not None and self._sw is None and self._se is None and (
                 self._nw is None):
             if self._ne.is_leaf():
                 self._name, self._point = self._ne._name, self._ne._point
                 self._ne = None
+                removed += 1
         if self._se is not None and self._sw is None and self._nw is None and (
                 self._ne is None):
             if self._se.is_leaf():
                 self._name, self._point = self._se._name, self._se._point
                 self._se = None
+                removed += 1
+        return removed
 
     def remove_point(self, point: Tuple[int, int]) -> None:
         """ Remove information about a player at point <point> from this tree.
@@ -534,55 +1273,52 @@ class QuadTree(Tree):
         >>> quad.contains_point((250,250))
         False
         """
-        if self.is_leaf():
-            if self._point == point:
-                self._name, self._point = None, None
-        elif not self.is_empty():
-            if point[0] <= self._centre[0] and point[1] <= self._centre[
-                    1] and self._nw is not None:
-                self._nw.remove_point(point)
-                self._helper_remove_extra_nodes()
-            elif point[0] <= self._centre[0] and self._sw is not None:
-                self._sw.remove_point(point)
-                self._helper_remove_extra_nodes()
-            elif point[1] <= self._centre[1] and self._ne is not None:
-                self._ne.remove_point(point)
-                self._helper_remove_extra_nodes()
-            elif point[1] > self._centre[1] and self._se is not None:
-                self._se.remove_point(point)
-                self._helper_remove_extra_nodes()
-
-    def _helper_move(self, name: str, direction: str, steps: int) -> List[
-            Tuple[int, int], Tuple[int, int]]:
-        """ _helper_move is helper move.
-        It takes self name direction steps and returns a list of tuples.
-        It returns the old point and new point
+        name = self._helper_remove_point(point)
+        if self._index is not None and name is not None and self._index.get(
+                name) == point:
+            del self._index[name]
+
+    def _helper_remove_point(self, point: Tuple[int, int]) -> Optional[str]:
+        """ _helper_remove_point is helper remove point.
+        It takes self and point, removes the player at point without touching
+        the index and returns the name of the removed player (or None if
+        there was no player at point).
+        The quadrants on the way down are kept in a list, so they can drop
+        their emptied sub-quadrants from the bottom up afterwards. Each of
+        them then counts one player less and the quadrants dropped below it,
+        and one less of the player's role if it has one. If self is counting,
+        the quadrants visited, dropped and merged back into a leaf are added
+        to its counters.
 
         === Preconditions ===
-        direction in ['N', 'S', 'E', 'W']
+        self is the root of its tree
         """
-        if self.is_leaf() and self._name == name:
-            if direction == 'N':
-                points = (self._point[0], self._point[1] - steps)
-                return [self._point, points]
-            elif direction == 'S':
-                points = (self._point[0], self._point[1] + steps)
-                return [self._point, points]
-            elif direction == 'W':
-                points = (self._point[0] - steps, self._point[1])
-                return [self._point, points]
-            else:
-                points = (self._point[0] + steps, self._point[1])
-                return [self._point, points]
-        else:
-            if self._nw is not None and name in self._nw:
-                return self._nw._helper_move(name, direction, steps)
-            elif self._sw is not None and name in self._sw:
-                return self._sw._helper_move(name, direction, steps)
-            elif self._ne is not None and name in self._ne:
-                return self._ne._helper_move(name, direction, steps)
-            elif self._se is not None and name in self._se:
-                return self._se._helper_move(name, direction, steps)
+        path = []
+        quadrant = self
+        while quadrant is not None and not quadrant.is_leaf():
+            path.append(quadrant)
+            quadrant = quadrant._helper_child(point)
+        if quadrant is None or quadrant._point != point:
+            return None
+        name = quadrant._name
+        quadrant._name, quadrant._point = None, None
+        quadrant._count = 0
+        quadrant._role_counts = None
+        role = self._roles.get(name)
+        dropped = 0
+        for parent in reversed(path):
+            dropped += parent._helper_remove_extra_nodes()
+            parent._count -= 1
+            parent._size -= dropped
+            if role is not None:
+                parent._role_counts = Tree._helper_add_role(
+                    parent._role_counts, role, -1)
+        if self._stats is not None:
+            self._helper_record('remove_point', len(path) + 1)
+            self._stats['freed'] += dropped
+            self._stats['merges'] += sum(1 for parent in path
+                                         if parent._point is not None)
+        return name
 
     def move(self, name: str, direction: str, steps: int) -> Optional[
             Tuple[int, int]]:
@@ -596,7 +1332,7 @@ class QuadTree(Tree):
         exactly the same coordinates of another player in the Tree (before
         moving the player).
 
-        Runtime: O(n)
+        Runtime: O(log(n))
 
         === Preconditions ===
         direction in ['N', 'S', 'E', 'W']
@@ -617,15 +1353,9 @@ class QuadTree(Tree):
         ...     print('Error')
         Error
         """
-        if name in self:
-            values = self._helper_move(name, direction, steps)
-            self.remove_point(values[0])
-            try:
-                self.insert(name, values[1])
-            except OutOfBoundsError:
-                self.insert(name, values[0])
-                raise OutOfBoundsError
-            return values[1]
+        point = self._helper_find(name)
+        if point is not None:
+            return self.move_point(point, direction, steps)
 
     def _helper_move_point(self, point: Tuple[int, int], direction: str,
                            steps: int) -> List[str, Tuple[int, int]]:
@@ -636,29 +1366,18 @@ class QuadTree(Tree):
         === Preconditions ===
         direction in ['N', 'S', 'E', 'W']
         """
-        if self.is_leaf() and self._point == point:
+        quadrant = self._helper_leaf(point)
+        if quadrant is not None and quadrant._point == point:
             if direction == 'N':
-                points = (self._point[0], self._point[1] - steps)
-                return [self._name, points]
+                points = (point[0], point[1] - steps)
             elif direction == 'S':
-                points = (self._point[0], self._point[1] + steps)
-                return [self._name, points]
+                points = (point[0], point[1] + steps)
             elif direction == 'W':
-                points = (self._point[0] - steps, self._point[1])
-                return [self._name, points]
+                points = (point[0] - steps, point[1])
             else:
-                points = (self._point[0] + steps, self._point[1])
-                return [self._name, points]
-        elif not self.is_empty():
-            if point[0] <= self._centre[0] and point[1] <= self._centre[
-                    1] and self._nw is not None:
-                return self._nw._helper_move_point(point, direction, steps)
-            elif point[0] <= self._centre[0] and self._sw is not None:
-                return self._sw._helper_move_point(point, direction, steps)
-            elif point[1] <= self._centre[1] and self._ne is not None:
-                return self._ne._helper_move_point(point, direction, steps)
-            elif point[1] > self._centre[1] and self._se is not None:
-                return self._se._helper_move_point(point, direction, steps)
+                points = (point[0] + steps, point[1])
+            return [quadrant._name, points]
+        return None
 
     def move_point(self, point: Tuple[int, int], direction: str, steps: int) ->\
             Optional[Tuple[int, int]]:
@@ -731,161 +1450,519 @@ class QuadTree(Tree):
         >>> quad.names_in_range((500,500), 'NW', 500)
         ['1', '2']
         """
-        if direction == 'NW':
-            other = (point[0] - distance, point[1] - distance)
-        elif direction == 'SW':
-            other = (point[0] - distance, point[1] + distance)
-        elif direction == 'SE':
-            other = (point[0] + distance, point[1] + distance)
-        elif direction == 'NE':
-            other = (point[0] + distance, point[1] - distance)
-        xmin = min(point[0], other[0])
-        xmas = max(point[0], other[0])
-        ymin = min(point[1], other[1])
-        ymax = max(point[1], other[1])
-        if self.is_leaf():
-            if not self.is_empty() and (xmin <= self._point[0] <= xmas) and (
-                    ymin <= self._point[1] <= ymax):
-                return [self._name]
-            return []
-        else:
-            result = []
-            if self._nw is not None:
-                result += self._nw.names_in_range(point, direction, distance)
-            if self._sw is not None:
-                result += self._sw.names_in_range(point, direction, distance)
-            if self._ne is not None:
-                result += self._ne.names_in_range(point, direction, distance)
-            if self._se is not None:
-                result += self._se.names_in_range(point, direction, distance)
-            return result
+        return [name for name, _ in self.iter_in_range(point, direction,
+                                                       distance)]
 
-    def size(self) -> int:
-        """ Return the number of nodes in <self>
+    def iter_in_range(self, point: Tuple[int, int], direction: str,
+                      distance: int) -> Iterator[Tuple[str, Tuple[int, int]]]:
+        """ Yield the (name, location) of every player that
+        names_in_range(point, direction, distance) would name, in the same
+        order. iter_in_range streams the players in a box of self
+        The quadrants are walked lazily, so a caller that stops early does not
+        walk the rest of the box.
 
-        Runtime: O(n)
+        Runtime: faster than O(n) when distance is small
 
-        Preconditions
+        === Preconditions ===
+        direction in ['NW', 'SE', 'NE', 'SW']
 
         === DocTests ===
         >>> quad = QuadTree((250, 250))
         >>> quad.insert('1', (250, 250))
         >>> quad.insert('2', (350, 350))
-        >>> quad.size()
-        3
+        >>> next(quad.iter_in_range((500, 500), 'NW', 500))
+        ('1', (250, 250))
         """
-        if self.is_empty() or self.is_leaf():
-            return 1
-        else:
-            count = 1
-            if self._nw is not None:
-                count += self._nw.size()
-            if self._sw is not None:
-                count += self._sw.size()
-            if self._ne is not None:
-                count += self._ne.size()
-            if self._se is not None:
-                count += self._se.size()
-            return count
+        return self._helper_iter_box(*self._helper_box(point, direction,
+                                                       distance))
+
+    def _helper_iter_box(self, xmin: int, xmas: int, ymin: int,
+                         ymax: int) -> Iterator[Tuple[str, Tuple[int, int]]]:
+        """ _helper_iter_box is helper iter box.
+        It takes self and the box from xmin to xmas and ymin to ymax, and
+        yields the name and point of the players inside the box.
+        A quadrant lies on one side of its parent's centre along each axis, so
+        quadrants on the far side of the centre from the box are skipped. The
+        quadrants still to visit are kept on a stack, in the order that
+        recursing would visit them. If self is counting, the walk is counted
+        as a names_in_range call once it ends or the caller stops early.
+        """
+        stack = self._helper_stack([self])
+        try:
+            while stack:
+                quadrant = stack.pop()
+                if quadrant.is_leaf():
+                    if quadrant._point is not None and (
+                            xmin <= quadrant._point[0] <= xmas) and (
+                                ymin <= quadrant._point[1] <= ymax):
+                        yield quadrant._name, quadrant._point
+                    continue
+                west = xmin <= quadrant._centre[0]
+                east = xmas > quadrant._centre[0]
+                north = ymin <= quadrant._centre[1]
+                south = ymax > quadrant._centre[1]
+                if quadrant._se is not None and east and south:
+                    stack.append(quadrant._se)
+                if quadrant._ne is not None and east and north:
+                    stack.append(quadrant._ne)
+                if quadrant._sw is not None and west and south:
+                    stack.append(quadrant._sw)
+                if quadrant._nw is not None and west and north:
+                    stack.append(quadrant._nw)
+        finally:
+            if isinstance(stack, _VisitStack) and self._stats is not None:
+                self._helper_record('names_in_range', stack.visits)
+
+    def items(self) -> Iterator[Tuple[str, Tuple[int, int]]]:
+        """ Yield the (name, location) of every player in this quadrant, in
+        the order of the leaves (nw, sw, ne, se). items walks self lazily
+        The tree must not change while it is being iterated over.
+
+        Runtime: O(n) for all of them
 
-    def height(self) -> int:
-        """ Return the height of <self>
+        === DocTests ===
+        >>> quad = QuadTree((250, 250))
+        >>> quad.insert('1', (350, 350))
+        >>> quad.insert('2', (250, 250))
+        >>> list(quad.items())
+        [('2', (250, 250)), ('1', (350, 350))]
+        >>> list(quad)
+        ['2', '1']
+        """
+        stack = [self]
+        while stack:
+            quadrant = stack.pop()
+            if quadrant._point is not None:
+                yield quadrant._name, quadrant._point
+                continue
+            stack.extend(child for child in (quadrant._se, quadrant._ne,
+                                             quadrant._sw, quadrant._nw)
+                         if child is not None)
+
+    def count_in_range(self, point: Tuple[int, int], direction: str,
+                       distance: int) -> int:
+        """ Return the number of players that names_in_range(point,
+        direction, distance) would name. count_in_range counts a box of self
+        A quadrant whose bounds lie inside the box adds its _count without
+        being walked, so only the quadrants along the edges of the box are
+        looked into.
+
+        Runtime: O(log(n)) plus the quadrants along the edges of the box
 
-        Height is measured as the number of nodes in the path from the root of
-        this tree to the node at the greatest depth in this tree.
+        === Preconditions ===
+        direction in ['NW', 'SE', 'NE', 'SW']
 
-        Runtime: O(n)
+        === DocTests ===
+        >>> quad = QuadTree((250, 250))
+        >>> for i in range(100):
+        ...     quad.insert(str(i), (i, i))
+        >>> quad.count_in_range((10, 10), 'SE', 30)
+        31
+        >>> quad.count_in_range((0, 0), 'SE', 500)
+        100
+        """
+        xmin, xmas, ymin, ymax = self._helper_box(point, direction, distance)
+        count = 0
+        stack = self._helper_stack([self])
+        while stack:
+            quadrant = stack.pop()
+            bounds = quadrant._bounds
+            if xmin <= bounds[0] and bounds[2] <= xmas and ymin <= bounds[
+                    1] and bounds[3] <= ymax:
+                count += quadrant._count
+                continue
+            if quadrant._point is not None:
+                if xmin <= quadrant._point[0] <= xmas and (
+                        ymin <= quadrant._point[1] <= ymax):
+                    count += 1
+                continue
+            west = xmin <= quadrant._centre[0]
+            east = xmas > quadrant._centre[0]
+            north = ymin <= quadrant._centre[1]
+            south = ymax > quadrant._centre[1]
+            if quadrant._se is not None and east and south:
+                stack.append(quadrant._se)
+            if quadrant._ne is not None and east and north:
+                stack.append(quadrant._ne)
+            if quadrant._sw is not None and west and south:
+                stack.append(quadrant._sw)
+            if quadrant._nw is not None and west and north:
+                stack.append(quadrant._nw)
+        if self._stats is not None:
+            self._helper_record('count_in_range', stack.visits)
+        return count
 
-        Preconditions
+    def set_role(self, name: str, role: Optional[str]) -> None:
+        """ Tag the player named <name> with <role>, or take its tag away if
+        role is None. set_role tags a player in self
+        If the player is in the tree, the role counts of the quadrants on the
+        way down to it are changed to match.
+
+        Runtime: O(log(n))
+
+        === Preconditions ===
+        self is the root of its tree
 
         === DocTests ===
         >>> quad = QuadTree((250, 250))
         >>> quad.insert('1', (250, 250))
         >>> quad.insert('2', (350, 350))
-        >>> quad.height()
-        2
+        >>> quad.set_role('1', 'it')
+        >>> quad._role_counts, quad._nw._role_counts, quad._se._role_counts
+        ({'it': 1}, {'it': 1}, None)
         """
-        if self.is_empty() or self.is_leaf():
-            return 1
+        old = self._roles.get(name)
+        if old == role:
+            return
+        if role is None:
+            del self._roles[name]
         else:
-            height = 1
-            nw_h = 0
-            ne_h = 0
-            sw_h = 0
-            se_h = 0
-            if self._nw is not None:
-                nw_h = self._nw.height()
-            if self._sw is not None:
-                sw_h = self._sw.height()
-            if self._ne is not None:
-                ne_h = self._ne.height()
-            if self._se is not None:
-                se_h = self._se.height()
-            height += max(nw_h, sw_h, ne_h, se_h)
-            return height
+            self._roles[name] = role
+        point = self._index.get(name)
+        quadrant = self
+        while point is not None and quadrant is not None:
+            counts = Tree._helper_add_role(quadrant._role_counts, old, -1)
+            quadrant._role_counts = Tree._helper_add_role(counts, role, 1)
+            quadrant = quadrant._helper_child(point)
+
+    def count_roles_in_range(self, point: Tuple[int, int], direction: str,
+                             distance: int) -> Dict[str, int]:
+        """ Return how many of the players that names_in_range(point,
+        direction, distance) would name have each role, for the roles that
+        at least one of them has. count_roles_in_range counts roles in self
+        A quadrant whose bounds lie inside the box adds its _role_counts
+        without being walked, as in count_in_range.
+
+        Runtime: O(log(n)) plus the quadrants along the edges of the box
 
-    def depth(self, tree: QuadTree) -> Optional[int]:
-        """ Return the depth of the subtree <tree> relative to <self>. Return
-        None if <tree> is not a descendant of <self>
+        === Preconditions ===
+        direction in ['NW', 'SE', 'NE', 'SW']
+        self is the root of its tree
 
-        Runtime: O(log(n))
+        === DocTests ===
+        >>> quad = QuadTree((250, 250))
+        >>> for i in range(100):
+        ...     quad.insert(str(i), (i, i))
+        ...     quad.set_role(str(i), 'it' if i == 0 else 'not-it')
+        >>> quad.count_roles_in_range((0, 0), 'SE', 30)
+        {'it': 1, 'not-it': 30}
+        >>> quad.count_roles_in_range((50, 50), 'SE', 500)
+        {'not-it': 50}
+        """
+        xmin, xmas, ymin, ymax = self._helper_box(point, direction, distance)
+        counts = {}
+        stack = self._helper_stack([self])
+        while stack:
+            quadrant = stack.pop()
+            bounds = quadrant._bounds
+            if xmin <= bounds[0] and bounds[2] <= xmas and ymin <= bounds[
+                    1] and bounds[3] <= ymax:
+                Tree._helper_merge_roles(counts, quadrant._role_counts)
+                continue
+            if quadrant._point is not None:
+                if xmin <= quadrant._point[0] <= xmas and (
+                        ymin <= quadrant._point[1] <= ymax):
+                    Tree._helper_merge_roles(counts, quadrant._role_counts)
+                continue
+            west = xmin <= quadrant._centre[0]
+            east = xmas > quadrant._centre[0]
+            north = ymin <= quadrant._centre[1]
+            south = ymax > quadrant._centre[1]
+            if quadrant._se is not None and east and south:
+                stack.append(quadrant._se)
+            if quadrant._ne is not None and east and north:
+                stack.append(quadrant._ne)
+            if quadrant._sw is not None and west and south:
+                stack.append(quadrant._sw)
+            if quadrant._nw is not None and west and north:
+                stack.append(quadrant._nw)
+        if self._stats is not None:
+            self._helper_record('count_roles_in_range', stack.visits)
+        return counts
+
+    def names_in_ranges(self, queries: List[Tuple[Tuple[int, int], str, int]]
+                        ) -> List[List[str]]:
+        """ Return, for each (point, direction, distance) query in <queries>,
+        the list of names that names_in_range(point, direction, distance) would
+        return. names_in_ranges answers many range queries at once in self
+        All of the queries are answered in one walk over the tree, so a
+        quadrant is visited once no matter how many of the boxes reach it.
+
+        Runtime: faster than one names_in_range call per query
 
-        Preconditions
+        === Preconditions ===
+        every direction in queries is in ['NW', 'SE', 'NE', 'SW']
 
         === DocTests ===
         >>> quad = QuadTree((250, 250))
         >>> quad.insert('1', (250, 250))
         >>> quad.insert('2', (350, 350))
-        >>> quad.depth(quad._nw)
-        1
-        >>> t = QuadTree((50,50))
-        >>> quad.depth(t)
+        >>> quad.names_in_ranges([((500, 500), 'NW', 500), ((0, 0), 'SE', 10)])
+        [['1', '2'], []]
         """
-        if self.is_leaf() or self.is_empty() or tree is None:
-            return None
-        else:
-            count = 0
-            if tree._centre[0] < self._centre[0] and tree._centre[1] < \
-                    self._centre[1]:
-                if self._nw is tree:
-                    return 1
-                elif self._nw.depth(tree) is None:
-                    return None
-                count = 1
-                count += self._nw.depth(tree)
-            elif tree._centre[0] < self._centre[0] and tree._centre[1] < \
-                    self._centre[1]:
-                if self._sw is tree:
-                    return 1
-                elif self._sw.depth(tree) is None:
-                    return None
-                count = 1
-                count += self._sw.depth(tree)
-            elif tree._centre[1] < self._centre[1] and tree._centre[0] > \
-                    self._centre[0]:
-                if self._ne is tree:
-                    return 1
-                elif self._ne.depth(tree) is None:
-                    return None
-                count = 1
-                count += self._ne.depth(tree)
-            elif tree._centre[0] > self._centre[0] and tree._centre[1] > \
-                    self._centre[1]:
-                if self._se is tree:
-                    return 1
-                elif self._se.depth(tree) is None:
-                    return None
-                count = 1
-                count += self._se.depth(tree)
-            if count == 0:
-                return None
-            return count
-
-    def is_leaf(self) -> bool:
-        """ Return True if <self> has no children is_leaf
+        boxes = [(i,) + self._helper_box(*query) for i, query in enumerate(
+            queries)]
+        results = [[] for _ in queries]
+        self._helper_names_in_boxes(boxes, results)
+        return results
 
-        Runtime: O(1)
-        Preconditions
+    def _helper_names_in_boxes(self, boxes: List[Tuple[int, int, int, int,
+                                                       int]],
+                               results: List[List[str]]) -> None:
+        """ _helper_names_in_boxes is helper names in boxes.
+        It takes self, boxes as (query number, smallest x, largest x, smallest
+        y, largest y) and adds the names inside each box to results at the
+        query number. Each quadrant is only given the boxes that reach it.
+        If self is counting, the walk is counted as a names_in_ranges call.
+        """
+        stack = self._helper_stack([(self, boxes)])
+        while stack:
+            quadrant, reaching = stack.pop()
+            if not reaching:
+                continue
+            if quadrant.is_leaf():
+                if quadrant._point is not None:
+                    x, y = quadrant._point
+                    for i, xmin, xmas, ymin, ymax in reaching:
+                        if xmin <= x <= xmas and ymin <= y <= ymax:
+                            results[i].append(quadrant._name)
+                continue
+            cx, cy = quadrant._centre
+            west = [box for box in reaching if box[1] <= cx]
+            east = [box for box in reaching if box[2] > cx]
+            if quadrant._se is not None:
+                stack.append((quadrant._se,
+                              [box for box in east if box[4] > cy]))
+            if quadrant._ne is not None:
+                stack.append((quadrant._ne,
+                              [box for box in east if box[3] <= cy]))
+            if quadrant._sw is not None:
+                stack.append((quadrant._sw,
+                              [box for box in west if box[4] > cy]))
+            if quadrant._nw is not None:
+                stack.append((quadrant._nw,
+                              [box for box in west if box[3] <= cy]))
+        if self._stats is not None:
+            self._helper_record('names_in_ranges', stack.visits)
+        return None
+
+    def nearest(self, point: Tuple[int, int], k: int = 1,
+                predicate: Optional[Callable[[str], bool]] = None) -> List[str]:
+        """ Return the names of the <k> players closest to <point>, closest
+        first. If <predicate> is given, only players whose name it returns
+        True for are counted. Fewer than k names are returned if there are not
+        enough players. nearest finds the closest players to point in self
+        Quadrants are searched closest first and the search stops once k
+        players are closer than every quadrant that is left.
+
+        Runtime: O(log(n)) for a small k when most players pass predicate
+
+        === DocTests ===
+        >>> quad = QuadTree((250, 250))
+        >>> quad.insert('1', (250, 250))
+        >>> quad.insert('2', (350, 350))
+        >>> quad.insert('3', (10, 10))
+        >>> quad.nearest((330, 320), 2)
+        ['2', '1']
+        >>> quad.nearest((330, 320), 1, {'1', '3'}.__contains__)
+        ['1']
+        """
+        result = []
+        order = 0
+        bounds = (self._bounds[0], self._bounds[2], self._bounds[1],
+                  self._bounds[3])
+        heap = [(self._helper_distance(point, bounds), order, None, self)]
+        while heap and len(result) < k:
+            _, _, name, quadrant = heapq.heappop(heap)
+            if name is not None:
+                result.append(name)
+            elif quadrant.is_leaf():
+                if quadrant._name is not None and (
+                        predicate is None or predicate(quadrant._name)):
+                    order += 1
+                    distance = self._helper_distance(
+                        point, (quadrant._point[0], quadrant._point[0],
+                                quadrant._point[1], quadrant._point[1]))
+                    heapq.heappush(heap, (distance, order, quadrant._name,
+                                          None))
+            else:
+                for child in (quadrant._nw, quadrant._sw, quadrant._ne,
+                              quadrant._se):
+                    if child is not None:
+                        order += 1
+                        bounds = (child._bounds[0], child._bounds[2],
+                                  child._bounds[1], child._bounds[3])
+                        heapq.heappush(heap, (self._helper_distance(
+                            point, bounds), order, None, child))
+        return result
+
+    def enable_stats(self, enabled: bool = True) -> None:
+        """ Start counting the work done by the operations of this tree from
+        zero, or stop counting if <enabled> is False. enable_stats in self
+        A split is a leaf whose player is pushed down into a new quadrant by
+        insert, and a merge is a quadrant that takes back the player of its
+        last sub-quadrant after remove_point.
+
+        Runtime: O(1)
+
+        === Preconditions ===
+        self is the root of its tree
+
+        === DocTests ===
+        >>> quad = QuadTree((250, 250))
+        >>> quad.enable_stats()
+        >>> quad.insert('1', (250, 250))
+        >>> quad.insert('2', (350, 350))
+        >>> stats = quad.stats()
+        >>> stats['insert'], stats['insert_visits'], stats['allocated']
+        (2, 3, 2)
+        >>> quad.remove('2')
+        >>> stats = quad.stats()
+        >>> stats['splits'], stats['merges'], stats['freed']
+        (1, 1, 2)
+        >>> quad.enable_stats(False)
+        >>> quad.stats()
+        {}
+        """
+        self._stats = dict.fromkeys(Tree._STATS, 0) if enabled else None
+
+    def stats(self) -> Dict[str, int]:
+        """ Return a copy of the counters of this tree, or an empty dictionary
+        if it is not counting. stats reads the counters of self
+
+        Runtime: O(1)
+
+        === Preconditions ===
+        self is the root of its tree
+
+        === DocTests ===
+        >>> quad = QuadTree((250, 250))
+        >>> quad.stats()
+        {}
+        """
+        return {} if self._stats is None else dict(self._stats)
+
+    def reset_stats(self) -> None:
+        """ Set every counter of this tree back to 0, for example at the start
+        of every tick. reset_stats clears the counters of self
+        Nothing happens if the tree is not counting.
+
+        Runtime: O(1)
+
+        === Preconditions ===
+        self is the root of its tree
+
+        === DocTests ===
+        >>> quad = QuadTree((250, 250))
+        >>> quad.enable_stats()
+        >>> quad.insert('1', (250, 250))
+        >>> quad.reset_stats()
+        >>> quad.stats()['insert']
+        0
+        """
+        if self._stats is not None:
+            self.enable_stats()
+
+    def bounds(self) -> Tuple[int, int, int, int]:
+        """ Return the smallest x, smallest y, largest x and largest y that a
+        player on this field can have. bounds
+
+        Runtime: O(1)
+
+        === Preconditions ===
+        self is the root of its tree
+
+        === DocTests ===
+        >>> QuadTree((250, 250)).bounds()
+        (0, 0, 500, 500)
+        >>> QuadTree((500, 200), (0, 0, 1000, 400)).bounds()
+        (0, 0, 1000, 400)
+        """
+        return self._bounds
+
+    def size(self) -> int:
+        """ Return the number of nodes in <self>
+        Every quadrant keeps the number of quadrants below it up to date.
+
+        Runtime: O(1)
+
+        Preconditions
+
+        === DocTests ===
+        >>> quad = QuadTree((250, 250))
+        >>> quad.insert('1', (250, 250))
+        >>> quad.insert('2', (350, 350))
+        >>> quad.size()
+        3
+        """
+        return self._size
+
+    def height(self) -> int:
+        """ Return the height of <self>
+
+        Height is measured as the number of nodes in the path from the root of
+        this tree to the node at the greatest depth in this tree.
+
+        Runtime: O(n)
+
+        Preconditions
+
+        === DocTests ===
+        >>> quad = QuadTree((250, 250))
+        >>> quad.insert('1', (250, 250))
+        >>> quad.insert('2', (350, 350))
+        >>> quad.height()
+        2
+        """
+        height = 0
+        stack = [(self, 1)]
+        while stack:
+            quadrant, level = stack.pop()
+            if level > height:
+                height = level
+            for child in (quadrant._nw, quadrant._sw, quadrant._ne,
+                          quadrant._se):
+                if child is not None:
+                    stack.append((child, level + 1))
+        return height
+
+    def depth(self, tree: QuadTree) -> Optional[int]:
+        """ Return the depth of the subtree <tree> relative to <self>. Return
+        None if <tree> is not a descendant of <self>
+        A quadrant's centre lies inside it, so the quadrants that tree's centre
+        belongs in are followed down from self until tree is found.
+
+        Runtime: O(log(n))
+
+        Preconditions
+
+        === DocTests ===
+        >>> quad = QuadTree((250, 250))
+        >>> quad.insert('1', (250, 250))
+        >>> quad.insert('2', (350, 350))
+        >>> quad.depth(quad._nw)
+        1
+        >>> t = QuadTree((50,50))
+        >>> quad.depth(t)
+        """
+        if tree is None:
+            return None
+        count = 0
+        quadrant = self
+        while not quadrant.is_leaf():
+            quadrant = quadrant._helper_child(tree._centre)
+            if quadrant is None:
+                return None
+            count += 1
+            if quadrant is tree:
+                return count
+        return None
+
+    def is_leaf(self) -> bool:
+        """ Return True if <self> has no children is_leaf
+
+        Runtime: O(1)
+        Preconditions
 
         === DocTests ===
         >>> quad = QuadTree((250, 250))
@@ -920,368 +1997,4683 @@ class QuadTree(Tree):
                 self._sw is None) and self._se is None
 
 
-class TwoDTree(Tree):
-    """ TwoDTree is a Two D Tree that is a subclass of Tree.
-    It sorts players/people into a field where each node has a name and point
-    value.
-    After the first player is inserted, each following player is either
-    placed in the less than or greater than subtree which alternates between
-    sorting along the y-axis and x-axis.
-    This means that no node should ever be empty (without name and point)
-    apart from its initialization.
+class BucketQuadTree(Tree):
+    """ BucketQuadTree is a Quad Tree with buckets that is a subclass of Tree.
+    It sorts players into a rectangular field like QuadTree, but each leaf
+    quadrant keeps a bucket of up to _capacity players instead of just one,
+    and only splits into sub-quadrants when its bucket overflows. Quadrants
+    that are _min_size wide or less never split, so their buckets can grow
+    past _capacity. This keeps the tree short and the number of quadrants
+    small when many players crowd into one spot.
 
     === Attributes ===
-    _name : the name of a player in this tree/node
-    _point : the point of the player in this tree/node
-    _ne : the north-eastern corner of this tree
-        This is None if it is not the root node
-    _se : the south-eastern corner of this tree
-        This is None if it is not the root node
-    _lt : the tree with nodes less than or equal to the current position in
-        either the y or x axis of this current point
-    _gt : the tree with nodes greater than the current position in either
-        the y or x axis of this current point
-    _split_type : the split type of this tree, either along the x axis or y axis
+    _centre : the centre of the field/quadrant
+    _bounds : the extent of this quadrant, as the smallest x, smallest y,
+        largest x and largest y a point in this quadrant can have
+    _bucket : a list of the (name, point) players in this quadrant (or None
+        if there are sub-quadrants)
+    _ne : the north-eastern quadrant in this field of this centre
+    _nw : the north-western quadrant in this field of this centre
+    _se : the south-eastern quadrant in this field of this centre
+    _sw : the south-western quadrant in this field of this centre
+    _capacity : the number of players a bucket holds before it splits
+    _min_size : the width at or below which a quadrant never splits
+    _index : a dictionary mapping the names of players in this field to their
+        points (or None if this is a sub-quadrant)
+    _roles : a dictionary mapping the names of players to their role tags
+        (or None if this is a sub-quadrant)
 
     === Representation Invariants ===
-    If _nw, _se are not None, then this tree is not the root value.
-        Otherwise, it is the root of the tree.
-    Unless upon initialization of the tree, _name and _point must not be None.
-    _split_type is either 'x' or 'y'.
-    _nw must have values less than _se
+    _bucket is None exactly when at least one of _ne, _nw, _se, _sw is not
+        None.
+    A quadrant with sub-quadrants holds more than _capacity players, and none
+        of its sub-quadrants are empty.
+    A bucket holds at most _capacity players unless its quadrant is
+        _min_size wide or less.
+    Every sub-quadrant has the same _capacity and _min_size as its parent.
+    Only the root of a tree has an _index, and it holds exactly the players
+        stored in the tree.
 
     === DocTests ===
-        >>> two = TwoDTree((0, 0), (500, 500))
-        >>> two._nw == (0, 0)
-        True
-        >>> two._se == (500, 500)
-        True
-        >>> two._name is None and two._point is None
-        True
-        >>> two._lt is None and two._gt is None
-        True
-        >>> two._split_type == 'x'
-        True
+    >>> quad = BucketQuadTree((250, 250), 2)
+    >>> quad._bucket
+    []
+    >>> quad._capacity, quad._min_size
+    (2, 4)
+    >>> quad._bounds
+    (0, 0, 500, 500)
     """
-    _name: Optional[str]
-    _point: Optional[Tuple[int, int]]
-    _nw: Optional[Tuple[int, int]]
-    _se: Optional[Tuple[int, int]]
-    _lt: Optional[TwoDTree]
-    _gt: Optional[TwoDTree]
-    _split_type: str
-
-    def __init__(self, nw: Optional[Tuple[int, int]],
-                 se: Optional[Tuple[int, int]]) -> None:
-        """Initialize a new Tree instance in self with nw and se corners.
+    __slots__ = ('_centre', '_bounds', '_bucket', '_ne', '_nw', '_se', '_sw',
+                 '_capacity', '_min_size', '_index', '_roles')
+    _centre: Tuple[int, int]
+    _bounds: Tuple[int, int, int, int]
+    _bucket: Optional[List[Tuple[str, Tuple[int, int]]]]
+    _ne: Optional[BucketQuadTree]
+    _nw: Optional[BucketQuadTree]
+    _se: Optional[BucketQuadTree]
+    _sw: Optional[BucketQuadTree]
+    _capacity: int
+    _min_size: int
+    _index: Optional[Dict[str, Tuple[int, int]]]
+    _roles: Optional[Dict[str, str]]
+
+    def __init__(self, centre: Tuple[int, int], capacity: int = 8,
+                 min_size: int = 4,
+                 bounds: Optional[Tuple[int, int, int, int]] = None) -> None:
+        """Initialize a new empty Tree instance with a centre at self whose
+        buckets hold capacity players and whose quadrants stop splitting at
+        min_size wide. The field covers bounds, like it does for QuadTree.
 
         Runtime: O(1)
 
         === Preconditions ===
-        nw[0] < se[0] and sw[1] < se[1]
+        capacity >= 1 and min_size >= 1
+        bounds is None or bounds[0] <= centre[0] <= bounds[2] and
+            bounds[1] <= centre[1] <= bounds[3]
 
         === DocTests ===
-        >>> two = TwoDTree((0, 0), (500, 500))
-        >>> two._nw == (0, 0)
-        True
-        >>> two._se == (500, 500)
-        True
-        >>> two._name is None and two._point is None
-        True
-        >>> two._lt is None and two._gt is None
-        True
-        >>> two._split_type == 'x'
+        >>> quad = BucketQuadTree((250, 250))
+        >>> quad._capacity, quad._min_size
+        (8, 4)
+        >>> quad.is_empty()
         True
         """
-        self._name = None
-        self._point = None
-        self._nw = nw
-        self._se = se
-        self._lt = None
-        self._gt = None
-        self._split_type = 'x'
+        self._centre = centre
+        if bounds is None:
+            better = max(centre[0], centre[1])
+            bounds = (0, 0, better * 2, better * 2)
+        self._bounds = bounds
+        self._bucket = []
+        self._ne = None
+        self._nw = None
+        self._se = None
+        self._sw = None
+        self._capacity = capacity
+        self._min_size = min_size
+        self._index = {}
+        self._roles = {}
+
+    def _helper_subtree(self, direction: str) -> BucketQuadTree:
+        """ _helper_subtree is helper subtree.
+        It creates and returns the empty sub-quadrant of self in direction,
+        with the part of self's bounds on that side of self's centre.
+
+        === Preconditions ===
+        direction in ['NW', 'SW', 'NE', 'SE']
+        """
+        xmin, ymin, xmax, ymax = self._bounds
+        if 'W' in direction:
+            xmax = self._centre[0]
+        else:
+            xmin = self._centre[0] + 1
+        if 'N' in direction:
+            ymax = self._centre[1]
+        else:
+            ymin = self._centre[1] + 1
+        quadrant = BucketQuadTree(((xmin + xmax) // 2, (ymin + ymax) // 2),
+                                  self._capacity, self._min_size)
+        quadrant._bounds = (xmin, ymin, xmax, ymax)
+        quadrant._index = None
+        quadrant._roles = None
+        return quadrant
+
+    def _helper_direction(self, point: Tuple[int, int]) -> str:
+        """ _helper_direction is helper direction.
+        It takes self and point and returns the direction of the sub-quadrant
+        of self that point belongs in.
+        """
+        if point[0] <= self._centre[0]:
+            return 'NW' if point[1] <= self._centre[1] else 'SW'
+        return 'NE' if point[1] <= self._centre[1] else 'SE'
+
+    def _helper_child(self, direction: str) -> Optional[BucketQuadTree]:
+        """ _helper_child is helper child.
+        It takes self and direction and returns the sub-quadrant of self in
+        direction (or None if there is none).
+        """
+        if direction == 'NW':
+            return self._nw
+        elif direction == 'SW':
+            return self._sw
+        elif direction == 'NE':
+            return self._ne
+        return self._se
+
+    def _helper_set_child(self, direction: str,
+                          child: Optional[BucketQuadTree]) -> None:
+        """ _helper_set_child is helper set child.
+        It takes self, direction and child and makes child the sub-quadrant of
+        self in direction.
+        """
+        if direction == 'NW':
+            self._nw = child
+        elif direction == 'SW':
+            self._sw = child
+        elif direction == 'NE':
+            self._ne = child
+        else:
+            self._se = child
+
+    def _helper_leaf(self, point: Tuple[int, int]) -> Optional[BucketQuadTree]:
+        """ _helper_leaf is helper leaf.
+        It takes self and point and returns the leaf quadrant that point
+        belongs in (or None if that quadrant does not exist).
+        """
+        quadrant = self
+        while quadrant is not None and quadrant._bucket is None:
+            quadrant = quadrant._helper_child(quadrant._helper_direction(point))
+        return quadrant
 
     def __contains__(self, name: str) -> bool:
         """ Return True if a player named <name> is stored in this tree.
         __contains__ checks if name is contained in self
-        Runtime: O(n)
 
-        Preconditions
+        Runtime: O(1) at the root, O(n) for a sub-quadrant
 
         === DocTests ===
-        >>> two = TwoDTree((0, 0), (500, 500))
-        >>> two.insert('1', (250, 250))
-        >>> two.insert('2', (350, 350))
-        >>> '1' in two
-        True
-        >>> '2' in two
+        >>> quad = BucketQuadTree((250, 250))
+        >>> quad.insert('1', (250, 250))
+        >>> '1' in quad
         True
-        >>> '3' in two
+        >>> '2' in quad
         False
         """
-        if self._name == name:
-            return True
-        elif self.is_leaf() or self.is_empty():
-            return False
-        else:
-            indicator_g = False
-            indicator_l = False
-            if self._lt is not None:
-                indicator_l = name in self._lt
-            if self._gt is not None:
-                indicator_g = name in self._gt
-            return indicator_g or indicator_l
+        if self._index is not None:
+            return name in self._index
+        if self._bucket is not None:
+            return any(player == name for player, _ in self._bucket)
+        return any(name in child for child in (self._nw, self._sw, self._ne,
+                                               self._se) if child is not None)
 
     def contains_point(self, point: Tuple[int, int]) -> bool:
         """ Return True if a player at location <point> is stored in this tree.
         contains_point checks if point is in self
-        Runtime: O(log(n))
 
-        === Preconditions ===
-        nw[0] < se[0] and sw[1] < se[1]
+        Runtime: O(log(n) + bucket size)
 
         === DocTests ===
-        >>> two = TwoDTree((0, 0), (500, 500))
-        >>> two.insert('1', (250, 250))
-        >>> two.insert('2', (350, 350))
-        >>> two.contains_point((250, 250))
+        >>> quad = BucketQuadTree((250, 250))
+        >>> quad.insert('1', (250, 250))
+        >>> quad.contains_point((250, 250))
         True
-        >>> two.contains_point((350, 350))
+        >>> quad.contains_point((250, 251))
+        False
+        """
+        leaf = self._helper_leaf(point)
+        return leaf is not None and any(
+            there == point for _, there in leaf._bucket)
+
+    def insert(self, name: str, point: Tuple[int, int]) -> None:
+        """Insert a player named <name> into this tree at point <point>.
+        insert a point and name into self
+        Raise an OutOfBoundsError if <point> is out of bounds.
+
+        Raise an OutOfBoundsError if moving the player would place the player at
+        exactly the same coordinates of another player in the Tree (before
+        moving the player).
+
+        Runtime: O(log(n) + bucket size)
+
+        === DocTests ===
+        >>> quad = BucketQuadTree((250, 250), 2)
+        >>> quad.insert('1', (250, 250))
+        >>> quad.insert('2', (350, 350))
+        >>> quad._bucket
+        [('1', (250, 250)), ('2', (350, 350))]
+        >>> quad.insert('3', (100, 100))
+        >>> quad._bucket is None, quad._nw._bucket
+        (True, [('1', (250, 250)), ('3', (100, 100))])
+        >>> try:
+        ...     quad.insert('4', (250, 250))
+        ... except OutOfBoundsError:
+        ...     print('Error')
+        Error
+        """
+        if point[0] < self._bounds[0] or point[1] < self._bounds[1] or point[
+                0] > self._bounds[2] or point[1] > self._bounds[3]:
+            raise OutOfBoundsError
+        if self.contains_point(point):
+            raise OutOfBoundsError
+        self._helper_insert(name, point)
+        if self._index is not None:
+            self._index[name] = point
+
+    def _helper_insert(self, name: str, point: Tuple[int, int]) -> None:
+        """ _helper_insert is helper insert.
+        It takes self name and point and places the player in the bucket of
+        the right leaf quadrant without touching the index, splitting the
+        leaf if its bucket overflows.
+
+        === Preconditions ===
+        point is in self's bounds and no player is at point
+        """
+        quadrant = self
+        while quadrant._bucket is None:
+            direction = quadrant._helper_direction(point)
+            child = quadrant._helper_child(direction)
+            if child is None:
+                child = quadrant._helper_subtree(direction)
+                quadrant._helper_set_child(direction, child)
+            quadrant = child
+        quadrant._bucket.append((name, point))
+        if len(quadrant._bucket) > quadrant._capacity and (
+                quadrant._bounds[2] - quadrant._bounds[0] + 1 >
+                quadrant._min_size):
+            players, quadrant._bucket = quadrant._bucket, None
+            for player in players:
+                quadrant._helper_insert(*player)
+
+    def remove(self, name: str) -> None:
+        """ Remove information about a player named <name> from this tree.
+        remove a name from self
+
+        Runtime: O(log(n) + bucket size)
+
+        === DocTests ===
+        >>> quad = BucketQuadTree((250, 250))
+        >>> quad.insert('1', (250, 250))
+        >>> quad.remove('1')
+        >>> '1' in quad
+        False
+        """
+        if self._index is not None and name in self._index:
+            self.remove_point(self._index[name])
+
+    def remove_point(self, point: Tuple[int, int]) -> None:
+        """ Remove information about a player at point <point> from this tree.
+        remove_point removes a point in self
+        Quadrants on the way whose players fit back into one bucket are merged
+        into a leaf again.
+
+        Runtime: O(log(n) + bucket size)
+
+        === DocTests ===
+        >>> quad = BucketQuadTree((250, 250), 2)
+        >>> quad.insert('1', (250, 250))
+        >>> quad.insert('2', (350, 350))
+        >>> quad.insert('3', (100, 100))
+        >>> quad.remove_point((350, 350))
+        >>> sorted(quad._bucket)
+        [('1', (250, 250)), ('3', (100, 100))]
+        """
+        name = self._helper_remove_point(point)
+        if self._index is not None and name is not None and self._index.get(
+                name) == point:
+            del self._index[name]
+
+    def _helper_remove_point(self, point: Tuple[int, int]) -> Optional[str]:
+        """ _helper_remove_point is helper remove point.
+        It takes self and point, removes the player at point without touching
+        the index and returns the name of the removed player (or None if there
+        was no player at point). Sub-quadrants left empty are dropped, and
+        self becomes a leaf again if its players fit in one bucket.
+        """
+        if self._bucket is not None:
+            for i, (name, there) in enumerate(self._bucket):
+                if there == point:
+                    self._bucket.pop(i)
+                    return name
+            return None
+        direction = self._helper_direction(point)
+        child = self._helper_child(direction)
+        if child is None:
+            return None
+        name = child._helper_remove_point(point)
+        if name is not None:
+            if child.is_empty():
+                self._helper_set_child(direction, None)
+            children = [quadrant for quadrant in (self._nw, self._sw,
+                                                  self._ne, self._se)
+                        if quadrant is not None]
+            if all(quadrant._bucket is not None for quadrant in children) and \
+                    sum(len(quadrant._bucket) for quadrant in
+                        children) <= self._capacity:
+                self._bucket = [player for quadrant in children for player in
+                                quadrant._bucket]
+                self._nw, self._sw, self._ne, self._se = None, None, None, None
+        return name
+
+    def move(self, name: str, direction: str, steps: int) -> Optional[
+            Tuple[int, int]]:
+        """ Return the new location of the player named <name> after moving it
+        in the given <direction> by <steps> steps.
+        move a name a direction by steps in self
+        Raise an OutOfBoundsError if this would move the player named
+        <name> out of bounds (before moving the player).
+
+        Raise an OutOfBoundsError if moving the player would place the player at
+        exactly the same coordinates of another player in the Tree (before
+        moving the player).
+
+        Runtime: O(log(n) + bucket size)
+
+        === Preconditions ===
+        direction in ['N', 'S', 'E', 'W']
+
+        === DocTests ===
+        >>> quad = BucketQuadTree((250, 250))
+        >>> quad.insert('1', (250, 250))
+        >>> quad.insert('2', (350, 350))
+        >>> quad.move('2', 'N', 100)
+        (350, 250)
+        >>> try:
+        ...     quad.move('1', 'E', 100)
+        ... except OutOfBoundsError:
+        ...     print('Error')
+        Error
+        """
+        if self._index is not None and name in self._index:
+            return self.move_point(self._index[name], direction, steps)
+
+    def move_point(self, point: Tuple[int, int], direction: str, steps: int) ->\
+            Optional[Tuple[int, int]]:
+        """ Return the new location of the player at point <point> after moving
+        it in the given <direction> by <steps> steps.
+        move_point moves a point in direction by steps in self
+        Raise an OutOfBoundsError if this would move the player at point
+        <point> out of bounds (before moving the player).
+
+        Raise an OutOfBoundsError if moving the player would place the player at
+        exactly the same coordinates of another player in the Tree (before
+        moving the player).
+
+        Runtime: O(log(n) + bucket size)
+
+        === Preconditions ===
+        direction in ['N', 'S', 'E', 'W']
+
+        === DocTests ===
+        >>> quad = BucketQuadTree((250, 250))
+        >>> quad.insert('1', (250, 250))
+        >>> quad.insert('2', (350, 350))
+        >>> quad.move_point((350, 350), 'N', 100)
+        (350, 250)
+        >>> try:
+        ...     quad.move_point((250, 250), 'E', 100)
+        ... except OutOfBoundsError:
+        ...     print('Error')
+        Error
+        """
+        leaf = self._helper_leaf(point)
+        if leaf is None:
+            return None
+        names = [name for name, there in leaf._bucket if there == point]
+        if not names:
+            return None
+        if direction == 'N':
+            new_point = (point[0], point[1] - steps)
+        elif direction == 'S':
+            new_point = (point[0], point[1] + steps)
+        elif direction == 'W':
+            new_point = (point[0] - steps, point[1])
+        else:
+            new_point = (point[0] + steps, point[1])
+        self.insert(names[0], new_point)
+        self.remove_point(point)
+        return new_point
+
+    def names_in_range(self, point: Tuple[int, int], direction: str,
+                       distance: int) -> List[str]:
+        """ Return a list of names of players whose location is in the
+        <direction> relative to <point> and whose location is within <distance>
+        along both the x and y axis.
+        names_in_range searches in direction from point for distance in self
+
+        Runtime: faster than O(n) when distance is small
+
+        === Preconditions ===
+        direction in ['NW', 'SE', 'NE', 'SW']
+
+        === DocTests ===
+        >>> quad = BucketQuadTree((250, 250), 1)
+        >>> quad.insert('1', (250, 250))
+        >>> quad.insert('2', (350, 350))
+        >>> quad.names_in_range((200, 200), 'SE', 50)
+        ['1']
+        >>> sorted(quad.names_in_range((400, 400), 'NW', 150))
+        ['1', '2']
+        """
+        result = []
+        self._helper_names_in_box(*self._helper_box(point, direction, distance),
+                                  result)
+        return result
+
+    def _helper_names_in_box(self, xmin: int, xmas: int, ymin: int,
+                             ymax: int, result: List[str]) -> None:
+        """ _helper_names_in_box is helper names in box.
+        It takes self, the box from xmin to xmas and ymin to ymax, and adds the
+        names of the players inside the box to result, skipping quadrants on
+        the far side of the centre from the box.
+        """
+        if self._bucket is not None:
+            for name, (x, y) in self._bucket:
+                if xmin <= x <= xmas and ymin <= y <= ymax:
+                    result.append(name)
+        else:
+            west = xmin <= self._centre[0]
+            east = xmas > self._centre[0]
+            north = ymin <= self._centre[1]
+            south = ymax > self._centre[1]
+            if self._nw is not None and west and north:
+                self._nw._helper_names_in_box(xmin, xmas, ymin, ymax, result)
+            if self._sw is not None and west and south:
+                self._sw._helper_names_in_box(xmin, xmas, ymin, ymax, result)
+            if self._ne is not None and east and north:
+                self._ne._helper_names_in_box(xmin, xmas, ymin, ymax, result)
+            if self._se is not None and east and south:
+                self._se._helper_names_in_box(xmin, xmas, ymin, ymax, result)
+
+    def names_in_ranges(self, queries: List[Tuple[Tuple[int, int], str, int]]
+                        ) -> List[List[str]]:
+        """ Return, for each (point, direction, distance) query in <queries>,
+        the list of names that names_in_range(point, direction, distance) would
+        return. names_in_ranges answers many range queries at once in self
+        All of the queries are answered in one walk over the tree, so a
+        quadrant is visited once no matter how many of the boxes reach it.
+
+        Runtime: faster than one names_in_range call per query
+
+        === Preconditions ===
+        every direction in queries is in ['NW', 'SE', 'NE', 'SW']
+
+        === DocTests ===
+        >>> quad = BucketQuadTree((250, 250), 1)
+        >>> quad.insert('1', (250, 250))
+        >>> quad.insert('2', (350, 350))
+        >>> quad.names_in_ranges([((200, 200), 'SE', 50), ((0, 0), 'SE', 10)])
+        [['1'], []]
+        """
+        boxes = [(i,) + self._helper_box(*query) for i, query in enumerate(
+            queries)]
+        results = [[] for _ in queries]
+        self._helper_names_in_boxes(boxes, results)
+        return results
+
+    def _helper_names_in_boxes(self, boxes: List[Tuple[int, int, int, int,
+                                                       int]],
+                               results: List[List[str]]) -> None:
+        """ _helper_names_in_boxes is helper names in boxes.
+        It takes self, boxes as (query number, smallest x, largest x, smallest
+        y, largest y) and adds the names inside each box to results at the
+        query number. Each quadrant is only given the boxes that reach it.
+        """
+        if not boxes:
+            return None
+        if self._bucket is not None:
+            for name, (x, y) in self._bucket:
+                for i, xmin, xmas, ymin, ymax in boxes:
+                    if xmin <= x <= xmas and ymin <= y <= ymax:
+                        results[i].append(name)
+            return None
+        cx, cy = self._centre
+        west = [box for box in boxes if box[1] <= cx]
+        east = [box for box in boxes if box[2] > cx]
+        if self._nw is not None:
+            self._nw._helper_names_in_boxes(
+                [box for box in west if box[3] <= cy], results)
+        if self._sw is not None:
+            self._sw._helper_names_in_boxes(
+                [box for box in west if box[4] > cy], results)
+        if self._ne is not None:
+            self._ne._helper_names_in_boxes(
+                [box for box in east if box[3] <= cy], results)
+        if self._se is not None:
+            self._se._helper_names_in_boxes(
+                [box for box in east if box[4] > cy], results)
+        return None
+
+    def nearest(self, point: Tuple[int, int], k: int = 1,
+                predicate: Optional[Callable[[str], bool]] = None) -> List[str]:
+        """ Return the names of the <k> players closest to <point>, closest
+        first. If <predicate> is given, only players whose name it returns
+        True for are counted. Fewer than k names are returned if there are not
+        enough players. nearest finds the closest players to point in self
+        Quadrants are searched closest first and the search stops once k
+        players are closer than every quadrant that is left.
+
+        Runtime: O(log(n) + bucket size) for a small k when most players pass
+        predicate
+
+        === DocTests ===
+        >>> quad = BucketQuadTree((250, 250), 1)
+        >>> quad.insert('1', (250, 250))
+        >>> quad.insert('2', (350, 350))
+        >>> quad.insert('3', (10, 10))
+        >>> quad.nearest((330, 320), 2)
+        ['2', '1']
+        >>> quad.nearest((330, 320), 1, {'1', '3'}.__contains__)
+        ['1']
+        """
+        result = []
+        order = 0
+        bounds = (self._bounds[0], self._bounds[2], self._bounds[1],
+                  self._bounds[3])
+        heap = [(self._helper_distance(point, bounds), order, None, self)]
+        while heap and len(result) < k:
+            _, _, name, quadrant = heapq.heappop(heap)
+            if name is not None:
+                result.append(name)
+            elif quadrant._bucket is not None:
+                for player, there in quadrant._bucket:
+                    if predicate is None or predicate(player):
+                        order += 1
+                        distance = self._helper_distance(
+                            point, (there[0], there[0], there[1], there[1]))
+                        heapq.heappush(heap, (distance, order, player, None))
+            else:
+                for child in (quadrant._nw, quadrant._sw, quadrant._ne,
+                              quadrant._se):
+                    if child is not None:
+                        order += 1
+                        bounds = (child._bounds[0], child._bounds[2],
+                                  child._bounds[1], child._bounds[3])
+                        heapq.heappush(heap, (self._helper_distance(
+                            point, bounds), order, None, child))
+        return result
+
+    def bounds(self) -> Tuple[int, int, int, int]:
+        """ Return the smallest x, smallest y, largest x and largest y that a
+        player on this field can have. bounds
+
+        Runtime: O(1)
+
+        === Preconditions ===
+        self is the root of its tree
+
+        === DocTests ===
+        >>> BucketQuadTree((500, 200), bounds=(0, 0, 1000, 400)).bounds()
+        (0, 0, 1000, 400)
+        """
+        return self._bounds
+
+    def size(self) -> int:
+        """ Return the number of nodes in <self>
+
+        Runtime: O(number of quadrants)
+
+        === DocTests ===
+        >>> quad = BucketQuadTree((250, 250), 1)
+        >>> quad.insert('1', (250, 250))
+        >>> quad.insert('2', (350, 350))
+        >>> quad.size()
+        3
+        """
+        return 1 + sum(child.size() for child in (self._nw, self._sw,
+                                                  self._ne, self._se)
+                       if child is not None)
+
+    def height(self) -> int:
+        """ Return the height of <self>
+
+        Height is measured as the number of nodes in the path from the root of
+        this tree to the node at the greatest depth in this tree.
+
+        Runtime: O(number of quadrants)
+
+        === DocTests ===
+        >>> quad = BucketQuadTree((250, 250), 1)
+        >>> quad.insert('1', (250, 250))
+        >>> quad.height()
+        1
+        >>> quad.insert('2', (350, 350))
+        >>> quad.height()
+        2
+        """
+        return 1 + max([child.height() for child in (self._nw, self._sw,
+                                                     self._ne, self._se)
+                        if child is not None] + [0])
+
+    def depth(self, tree: BucketQuadTree) -> Optional[int]:
+        """ Return the depth of the subtree <tree> relative to <self>. Return
+        None if <tree> is not a descendant of <self>
+        The quadrant that holds tree's centre is followed down from self.
+
+        Runtime: O(height)
+
+        === DocTests ===
+        >>> quad = BucketQuadTree((250, 250), 1)
+        >>> quad.insert('1', (250, 250))
+        >>> quad.insert('2', (350, 350))
+        >>> quad.depth(quad._se)
+        1
+        >>> quad.depth(quad) is None
+        True
+        """
+        count = 0
+        quadrant = self
+        while quadrant is not None and quadrant._bucket is None:
+            quadrant = quadrant._helper_child(
+                quadrant._helper_direction(tree._centre))
+            count += 1
+            if quadrant is tree:
+                return count
+        return None
+
+    def is_leaf(self) -> bool:
+        """ Return True if <self> has no children. is_leaf
+        A bucket holding more than one player counts as having children, like
+        a QuadTree would have.
+
+        Runtime: O(1)
+
+        === DocTests ===
+        >>> quad = BucketQuadTree((250, 250))
+        >>> quad.insert('1', (250, 250))
+        >>> quad.is_leaf()
+        True
+        >>> quad.insert('2', (350, 350))
+        >>> quad.is_leaf()
+        False
+        """
+        return self._bucket is not None and len(self._bucket) <= 1
+
+    def is_empty(self) -> bool:
+        """ Return True if <self> or any of its descendants do not store any
+        information about the location of any players. is_empty
+
+        Runtime: O(1)
+
+        === DocTests ===
+        >>> quad = BucketQuadTree((250, 250))
+        >>> quad.is_empty()
+        True
+        >>> quad.insert('1', (250, 250))
+        >>> quad.is_empty()
+        False
+        """
+        return self._bucket is not None and not self._bucket
+
+
+class LinearQuadTree(Tree):
+    """ LinearQuadTree is a Quad Tree without nodes that is a subclass of Tree.
+    Each player's point is turned into a Morton code by interleaving the bits
+    of x and y, and the codes are kept in one sorted array with the names in
+    the same order. Every quadrant of a QuadTree over the field is then a run
+    of neighbouring codes, so a quadrant can be found with bisect instead of
+    by following pointers, and a player only costs an array slot and a list
+    slot on top of the name index.
+
+    === Attributes ===
+    _centre : the centre of the field
+    _bounds : the extent of the field, as the smallest x, smallest y, largest
+        x and largest y a point in the field can have
+    _level : the number of bits in a coordinate, so the whole field fits in a
+        quadrant 2 ** _level wide
+    _codes : the sorted Morton codes of the players' points
+    _names : the names of the players, in the same order as _codes
+    _index : a dictionary mapping the names of players in this field to their
+        points
+    _roles : a dictionary mapping the names of players to their role tags
+
+    === Representation Invariants ===
+    _codes is sorted and has no repeats.
+    _names[i] is the name of the player whose point has the code _codes[i].
+    _index holds exactly the players stored in the field.
+
+    === DocTests ===
+    >>> quad = LinearQuadTree((250, 250))
+    >>> quad._bounds, quad._level
+    ((0, 0, 500, 500), 9)
+    >>> quad.insert('1', (3, 5))
+    >>> list(quad._codes), quad._names
+    ([39], ['1'])
+    """
+    __slots__ = ('_centre', '_bounds', '_level', '_codes', '_names', '_index',
+                 '_roles')
+    _centre: Tuple[int, int]
+    _bounds: Tuple[int, int, int, int]
+    _level: int
+    _codes: array
+    _names: List[str]
+    _index: Dict[str, Tuple[int, int]]
+    _roles: Dict[str, str]
+
+    def __init__(self, centre: Tuple[int, int],
+                 bounds: Optional[Tuple[int, int, int, int]] = None) -> None:
+        """Initialize a new empty Tree instance with a centre at self
+        The field covers bounds, like it does for QuadTree. Morton codes need
+        points that are not negative, and they cover the square from (0, 0)
+        to the largest coordinate in bounds.
+
+        Runtime: O(1)
+
+        === Preconditions ===
+        bounds is None or 0 <= bounds[0] <= bounds[2] and
+            0 <= bounds[1] <= bounds[3]
+
+        === DocTests ===
+        >>> quad = LinearQuadTree((250, 250))
+        >>> quad.is_empty()
+        True
+        >>> LinearQuadTree((50000, 20000), (0, 0, 100000, 40000))._level
+        17
+        """
+        self._centre = centre
+        if bounds is None:
+            better = max(centre[0], centre[1])
+            bounds = (0, 0, better * 2, better * 2)
+        self._bounds = bounds
+        self._level = max(bounds[2], bounds[3]).bit_length()
+        self._codes = array('Q')
+        self._names = []
+        self._index = {}
+        self._roles = {}
+
+    @staticmethod
+    def _helper_code(point: Tuple[int, int]) -> int:
+        """ _helper_code is helper code.
+        It takes point and returns its Morton code, with the bits of x in the
+        even places and the bits of y in the odd places.
+
+        === Preconditions ===
+        0 <= point[0] < 2 ** 32 and 0 <= point[1] < 2 ** 32
+
+        === DocTests ===
+        >>> LinearQuadTree._helper_code((3, 5))
+        39
+        """
+        code = 0
+        for shift, coordinate in [(0, point[0]), (1, point[1])]:
+            value = coordinate
+            value = (value | value << 16) & 0x0000FFFF0000FFFF
+            value = (value | value << 8) & 0x00FF00FF00FF00FF
+            value = (value | value << 4) & 0x0F0F0F0F0F0F0F0F
+            value = (value | value << 2) & 0x3333333333333333
+            value = (value | value << 1) & 0x5555555555555555
+            code |= value << shift
+        return code
+
+    @staticmethod
+    def _helper_point(code: int) -> Tuple[int, int]:
+        """ _helper_point is helper point.
+        It takes code and returns the point whose Morton code it is.
+
+        === DocTests ===
+        >>> LinearQuadTree._helper_point(39)
+        (3, 5)
+        """
+        point = []
+        for shift in [0, 1]:
+            value = code >> shift & 0x5555555555555555
+            value = (value | value >> 1) & 0x3333333333333333
+            value = (value | value >> 2) & 0x0F0F0F0F0F0F0F0F
+            value = (value | value >> 4) & 0x00FF00FF00FF00FF
+            value = (value | value >> 8) & 0x0000FFFF0000FFFF
+            value = (value | value >> 16) & 0x00000000FFFFFFFF
+            point.append(value)
+        return point[0], point[1]
+
+    def _helper_find(self, point: Tuple[int, int]) -> Optional[int]:
+        """ _helper_find is helper find.
+        It takes self and point and returns the place of point's code in
+        _codes (or None if no player is at point).
+        """
+        if point[0] < 0 or point[1] < 0:
+            return None
+        code = self._helper_code(point)
+        i = bisect.bisect_left(self._codes, code)
+        if i < len(self._codes) and self._codes[i] == code:
+            return i
+        return None
+
+    def __contains__(self, name: str) -> bool:
+        """ Return True if a player named <name> is stored in this tree.
+        __contains__ checks if name is contained in self
+
+        Runtime: O(1)
+
+        === DocTests ===
+        >>> quad = LinearQuadTree((250, 250))
+        >>> quad.insert('1', (250, 250))
+        >>> '1' in quad
+        True
+        >>> '2' in quad
+        False
+        """
+        return name in self._index
+
+    def contains_point(self, point: Tuple[int, int]) -> bool:
+        """ Return True if a player at location <point> is stored in this tree.
+        contains_point checks if point is in self
+
+        Runtime: O(log(n))
+
+        === DocTests ===
+        >>> quad = LinearQuadTree((250, 250))
+        >>> quad.insert('1', (250, 250))
+        >>> quad.contains_point((250, 250))
+        True
+        >>> quad.contains_point((250, 251))
+        False
+        """
+        return self._helper_find(point) is not None
+
+    def insert(self, name: str, point: Tuple[int, int]) -> None:
+        """Insert a player named <name> into this tree at point <point>.
+        insert a point and name into self
+        Raise an OutOfBoundsError if <point> is out of bounds.
+
+        Raise an OutOfBoundsError if moving the player would place the player at
+        exactly the same coordinates of another player in the Tree (before
+        moving the player).
+
+        Runtime: O(n) for the array shift, which is a single memory move
+
+        === DocTests ===
+        >>> quad = LinearQuadTree((250, 250))
+        >>> quad.insert('1', (250, 250))
+        >>> quad.insert('2', (0, 0))
+        >>> quad._names
+        ['2', '1']
+        >>> try:
+        ...     quad.insert('3', (250, 250))
+        ... except OutOfBoundsError:
+        ...     print('Error')
+        Error
+        """
+        if point[0] < self._bounds[0] or point[1] < self._bounds[1] or point[
+                0] > self._bounds[2] or point[1] > self._bounds[3]:
+            raise OutOfBoundsError
+        code = self._helper_code(point)
+        i = bisect.bisect_left(self._codes, code)
+        if i < len(self._codes) and self._codes[i] == code:
+            raise OutOfBoundsError
+        self._codes.insert(i, code)
+        self._names.insert(i, name)
+        self._index[name] = point
+
+    def remove(self, name: str) -> None:
+        """ Remove information about a player named <name> from this tree.
+        remove a name from self
+
+        Runtime: O(n) for the array shift, which is a single memory move
+
+        === DocTests ===
+        >>> quad = LinearQuadTree((250, 250))
+        >>> quad.insert('1', (250, 250))
+        >>> quad.remove('1')
+        >>> '1' in quad
+        False
+        """
+        if name in self._index:
+            self.remove_point(self._index[name])
+
+    def remove_point(self, point: Tuple[int, int]) -> None:
+        """ Remove information about a player at point <point> from this tree.
+        remove_point removes a point in self
+
+        Runtime: O(n) for the array shift, which is a single memory move
+
+        === DocTests ===
+        >>> quad = LinearQuadTree((250, 250))
+        >>> quad.insert('1', (250, 250))
+        >>> quad.remove_point((250, 250))
+        >>> quad.contains_point((250, 250)), '1' in quad
+        (False, False)
+        """
+        i = self._helper_find(point)
+        if i is not None:
+            del self._codes[i]
+            name = self._names.pop(i)
+            if self._index.get(name) == point:
+                del self._index[name]
+
+    def move(self, name: str, direction: str, steps: int) -> Optional[
+            Tuple[int, int]]:
+        """ Return the new location of the player named <name> after moving it
+        in the given <direction> by <steps> steps.
+        move a name a direction by steps in self
+        Raise an OutOfBoundsError if this would move the player named
+        <name> out of bounds (before moving the player).
+
+        Raise an OutOfBoundsError if moving the player would place the player at
+        exactly the same coordinates of another player in the Tree (before
+        moving the player).
+
+        Runtime: O(n) for the array shifts, which are single memory moves
+
+        === Preconditions ===
+        direction in ['N', 'S', 'E', 'W']
+
+        === DocTests ===
+        >>> quad = LinearQuadTree((250, 250))
+        >>> quad.insert('1', (250, 250))
+        >>> quad.insert('2', (350, 350))
+        >>> quad.move('2', 'N', 100)
+        (350, 250)
+        >>> try:
+        ...     quad.move('1', 'E', 100)
+        ... except OutOfBoundsError:
+        ...     print('Error')
+        Error
+        """
+        if name in self._index:
+            return self.move_point(self._index[name], direction, steps)
+
+    def move_point(self, point: Tuple[int, int], direction: str, steps: int) ->\
+            Optional[Tuple[int, int]]:
+        """ Return the new location of the player at point <point> after moving
+        it in the given <direction> by <steps> steps.
+        move_point moves a point in direction by steps in self
+        Raise an OutOfBoundsError if this would move the player at point
+        <point> out of bounds (before moving the player).
+
+        Raise an OutOfBoundsError if moving the player would place the player at
+        exactly the same coordinates of another player in the Tree (before
+        moving the player).
+
+        Runtime: O(n) for the array shifts, which are single memory moves
+
+        === Preconditions ===
+        direction in ['N', 'S', 'E', 'W']
+
+        === DocTests ===
+        >>> quad = LinearQuadTree((250, 250))
+        >>> quad.insert('1', (250, 250))
+        >>> quad.insert('2', (350, 350))
+        >>> quad.move_point((350, 350), 'N', 100)
+        (350, 250)
+        >>> try:
+        ...     quad.move_point((250, 250), 'E', 100)
+        ... except OutOfBoundsError:
+        ...     print('Error')
+        Error
+        """
+        i = self._helper_find(point)
+        if i is None:
+            return None
+        if direction == 'N':
+            new_point = (point[0], point[1] - steps)
+        elif direction == 'S':
+            new_point = (point[0], point[1] + steps)
+        elif direction == 'W':
+            new_point = (point[0] - steps, point[1])
+        else:
+            new_point = (point[0] + steps, point[1])
+        self.insert(self._names[i], new_point)
+        self.remove_point(point)
+        return new_point
+
+    def names_in_range(self, point: Tuple[int, int], direction: str,
+                       distance: int) -> List[str]:
+        """ Return a list of names of players whose location is in the
+        <direction> relative to <point> and whose location is within <distance>
+        along both the x and y axis.
+        names_in_range searches in direction from point for distance in self
+        Quadrants inside the box are taken whole as one run of codes, and only
+        the quadrants on the edge of the box are split further.
+
+        Runtime: faster than O(n) when distance is small
+
+        === Preconditions ===
+        direction in ['NW', 'SE', 'NE', 'SW']
+
+        === DocTests ===
+        >>> quad = LinearQuadTree((250, 250))
+        >>> quad.insert('1', (250, 250))
+        >>> quad.insert('2', (350, 350))
+        >>> quad.names_in_range((200, 200), 'SE', 50)
+        ['1']
+        >>> sorted(quad.names_in_range((400, 400), 'NW', 150))
+        ['1', '2']
+        """
+        result = []
+        self._helper_names_in_box(self._helper_box(point, direction, distance),
+                                  (0, 0, self._level, 0),
+                                  (0, len(self._codes)), result)
+        return result
+
+    def _helper_names_in_box(self, box: Tuple[int, int, int, int],
+                             quadrant: Tuple[int, int, int, int],
+                             run: Tuple[int, int], result: List[str]) -> None:
+        """ _helper_names_in_box is helper names in box.
+        It takes self, box as (smallest x, largest x, smallest y, largest y),
+        quadrant as (smallest x, smallest y, level, code of the corner) for the
+        quadrant 2 ** level wide at that corner, and run as the slice of _codes
+        inside that quadrant, and adds the names of the players inside the box
+        to result.
+        """
+        xmin, xmas, ymin, ymax = box
+        x, y, level, base = quadrant
+        lo, hi = run
+        if lo == hi:
+            return None
+        width = 1 << level
+        if xmin <= x and x + width - 1 <= xmas and ymin <= y and \
+                y + width - 1 <= ymax:
+            result.extend(self._names[lo:hi])
+        elif hi - lo <= 8 or level == 0:
+            for i in range(lo, hi):
+                px, py = self._helper_point(self._codes[i])
+                if xmin <= px <= xmas and ymin <= py <= ymax:
+                    result.append(self._names[i])
+        else:
+            half = width >> 1
+            quarter = 1 << (2 * level - 2)
+            cuts = [lo] + [bisect.bisect_left(self._codes, base + quarter * j,
+                                              lo, hi) for j in [1, 2, 3]] + [
+                hi]
+            for j, (cx, cy) in enumerate([(x, y), (x + half, y),
+                                          (x, y + half),
+                                          (x + half, y + half)]):
+                if cx <= xmas and cx + half - 1 >= xmin and cy <= ymax and \
+                        cy + half - 1 >= ymin:
+                    self._helper_names_in_box(
+                        box, (cx, cy, level - 1, base + quarter * j),
+                        (cuts[j], cuts[j + 1]), result)
+        return None
+
+    def names_in_ranges(self, queries: List[Tuple[Tuple[int, int], str, int]]
+                        ) -> List[List[str]]:
+        """ Return, for each (point, direction, distance) query in <queries>,
+        the list of names that names_in_range(point, direction, distance) would
+        return. names_in_ranges answers many range queries at once in self
+
+        Runtime: one names_in_range call per query
+
+        === Preconditions ===
+        every direction in queries is in ['NW', 'SE', 'NE', 'SW']
+
+        === DocTests ===
+        >>> quad = LinearQuadTree((250, 250))
+        >>> quad.insert('1', (250, 250))
+        >>> quad.insert('2', (350, 350))
+        >>> quad.names_in_ranges([((200, 200), 'SE', 50), ((0, 0), 'SE', 10)])
+        [['1'], []]
+        """
+        return [self.names_in_range(*query) for query in queries]
+
+    def nearest(self, point: Tuple[int, int], k: int = 1,
+                predicate: Optional[Callable[[str], bool]] = None) -> List[str]:
+        """ Return the names of the <k> players closest to <point>, closest
+        first. If <predicate> is given, only players whose name it returns
+        True for are counted. Fewer than k names are returned if there are not
+        enough players. nearest finds the closest players to point in self
+        Quadrants are searched closest first and the search stops once k
+        players are closer than every quadrant that is left.
+
+        Runtime: O(log(n)) for a small k when most players pass predicate
+
+        === DocTests ===
+        >>> quad = LinearQuadTree((250, 250))
+        >>> quad.insert('1', (250, 250))
+        >>> quad.insert('2', (350, 350))
+        >>> quad.insert('3', (10, 10))
+        >>> quad.nearest((330, 320), 2)
+        ['2', '1']
+        >>> quad.nearest((330, 320), 1, {'1', '3'}.__contains__)
+        ['1']
+        """
+        result = []
+        order = 0
+        heap = [(0, order, None, (0, 0, self._level, 0, 0, len(self._codes)))]
+        while heap and len(result) < k:
+            _, _, name, quadrant = heapq.heappop(heap)
+            if name is not None:
+                result.append(name)
+                continue
+            x, y, level, base, lo, hi = quadrant
+            if hi - lo <= 8 or level == 0:
+                for i in range(lo, hi):
+                    if predicate is None or predicate(self._names[i]):
+                        px, py = self._helper_point(self._codes[i])
+                        order += 1
+                        heapq.heappush(heap, (self._helper_distance(
+                            point, (px, px, py, py)), order, self._names[i],
+                                              None))
+                continue
+            half = 1 << (level - 1)
+            quarter = 1 << (2 * level - 2)
+            cuts = [lo] + [bisect.bisect_left(self._codes, base + quarter * j,
+                                              lo, hi) for j in [1, 2, 3]] + [
+                hi]
+            for j, (cx, cy) in enumerate([(x, y), (x + half, y),
+                                          (x, y + half),
+                                          (x + half, y + half)]):
+                if cuts[j] < cuts[j + 1]:
+                    order += 1
+                    heapq.heappush(heap, (self._helper_distance(
+                        point, (cx, cx + half - 1, cy, cy + half - 1)), order,
+                                          None, (cx, cy, level - 1,
+                                                 base + quarter * j, cuts[j],
+                                                 cuts[j + 1])))
+        return result
+
+    def bounds(self) -> Tuple[int, int, int, int]:
+        """ Return the smallest x, smallest y, largest x and largest y that a
+        player on this field can have. bounds
+
+        Runtime: O(1)
+
+        === DocTests ===
+        >>> LinearQuadTree((500, 200), (0, 0, 1000, 400)).bounds()
+        (0, 0, 1000, 400)
+        """
+        return self._bounds
+
+    def size(self) -> int:
+        """ Return the number of nodes in <self>
+        The field is one node and every player is another, unless there is at
+        most one player, in which case the field is a leaf.
+
+        Runtime: O(1)
+
+        === DocTests ===
+        >>> quad = LinearQuadTree((250, 250))
+        >>> quad.size()
+        1
+        >>> quad.insert('1', (250, 250))
+        >>> quad.insert('2', (350, 350))
+        >>> quad.size()
+        3
+        """
+        if self.is_leaf():
+            return 1
+        return 1 + len(self._codes)
+
+    def height(self) -> int:
+        """ Return the height of <self>
+        The field is the root and its players are leaves, so the height is 1
+        while the field is a leaf and 2 after that.
+
+        Runtime: O(1)
+
+        === DocTests ===
+        >>> quad = LinearQuadTree((250, 250))
+        >>> quad.insert('1', (250, 250))
+        >>> quad.height()
+        1
+        >>> quad.insert('2', (350, 350))
+        >>> quad.height()
+        2
+        """
+        if self.is_leaf():
+            return 1
+        return 2
+
+    def depth(self, tree: Tree) -> Optional[int]:
+        """ Return the depth of the subtree <tree> relative to <self>. Return
+        None if <tree> is not a descendant of <self>
+        The quadrants of a LinearQuadTree are runs of codes, not Trees, so no
+        Tree is ever a descendant of it and this is always None.
+
+        Runtime: O(1)
+
+        === DocTests ===
+        >>> quad = LinearQuadTree((250, 250))
+        >>> quad.depth(quad) is None
+        True
+        """
+        return None
+
+    def is_leaf(self) -> bool:
+        """ Return True if <self> has no children. is_leaf
+        A field with at most one player has nothing below it.
+
+        Runtime: O(1)
+
+        === DocTests ===
+        >>> quad = LinearQuadTree((250, 250))
+        >>> quad.insert('1', (250, 250))
+        >>> quad.is_leaf()
+        True
+        >>> quad.insert('2', (350, 350))
+        >>> quad.is_leaf()
+        False
+        """
+        return len(self._codes) <= 1
+
+    def is_empty(self) -> bool:
+        """ Return True if <self> or any of its descendants do not store any
+        information about the location of any players. is_empty
+
+        Runtime: O(1)
+
+        === DocTests ===
+        >>> quad = LinearQuadTree((250, 250))
+        >>> quad.is_empty()
+        True
+        >>> quad.insert('1', (250, 250))
+        >>> quad.is_empty()
+        False
+        """
+        return not self._codes
+
+
+class PersistentQuadTree(Tree):
+    """ PersistentQuadTree is a Quad Tree that never changes its quadrants
+    that is a subclass of Tree.
+    It sorts players into the same quadrants as QuadTree, but each quadrant is
+    a tuple: a leaf is a (name, point) pair and a quadrant with sub-quadrants
+    is a (nw, sw, ne, se) tuple whose empty sub-quadrants are None. Changing
+    the field makes new tuples for the quadrants on the path to the change and
+    shares every other quadrant with the field as it was before, so a
+    snapshot of the field only has to keep the old root.
+    A quadrant's bounds and centre are worked out on the way down from the
+    root's, the same way QuadTree gives them to its sub-quadrants.
+
+    === Attributes ===
+    _centre : the centre of the field
+    _bounds : the extent of the field, as the smallest x, smallest y, largest
+        x and largest y a point in the field can have
+    _root : the quadrant holding every player (or None if there are none)
+    _index : a dictionary mapping the names of players in this field to their
+        points
+    _roles : a dictionary mapping the names of players to their role tags
+    _shared : True if another PersistentQuadTree may be using _index, so it
+        has to be copied before it is changed
+
+    === Representation Invariants ===
+    No quadrant is ever changed once it is made.
+    A (nw, sw, ne, se) quadrant holds at least two players, and a sub-quadrant
+        that holds one player is a leaf.
+    _index holds exactly the players stored in the field.
+
+    === DocTests ===
+    >>> quad = PersistentQuadTree((250, 250))
+    >>> quad.insert('1', (100, 100))
+    >>> quad._root
+    ('1', (100, 100))
+    >>> quad.insert('2', (400, 100))
+    >>> quad._root
+    (('1', (100, 100)), None, ('2', (400, 100)), None)
+    """
+    __slots__ = ('_centre', '_bounds', '_root', '_index', '_roles', '_shared')
+    _centre: Tuple[int, int]
+    _bounds: Tuple[int, int, int, int]
+    _root: Optional[tuple]
+    _index: Dict[str, Tuple[int, int]]
+    _roles: Dict[str, str]
+    _shared: bool
+
+    def __init__(self, centre: Tuple[int, int],
+                 bounds: Optional[Tuple[int, int, int, int]] = None) -> None:
+        """Initialize a new empty Tree instance with a centre at self
+        The field covers bounds, like it does for QuadTree.
+
+        Runtime: O(1)
+
+        === Preconditions ===
+        bounds is None or bounds[0] <= centre[0] <= bounds[2] and
+            bounds[1] <= centre[1] <= bounds[3]
+
+        === DocTests ===
+        >>> quad = PersistentQuadTree((250, 250))
+        >>> quad.is_empty()
+        True
+        >>> quad.bounds()
+        (0, 0, 500, 500)
+        """
+        self._centre = centre
+        if bounds is None:
+            better = max(centre[0], centre[1])
+            bounds = (0, 0, better * 2, better * 2)
+        self._bounds = bounds
+        self._root = None
+        self._index = {}
+        self._roles = {}
+        self._shared = False
+
+    def snapshot(self) -> PersistentQuadTree:
+        """ Return a copy of this field that changes to self do not reach, and
+        whose changes do not reach self. snapshot copies self
+        The copy shares all of its quadrants and its index with self. The
+        index is only copied by whichever of them changes first.
+
+        Runtime: O(1)
+
+        === DocTests ===
+        >>> quad = PersistentQuadTree((250, 250))
+        >>> quad.insert('1', (100, 100))
+        >>> before = quad.snapshot()
+        >>> quad.move('1', 'E', 10)
+        (110, 100)
+        >>> before._index, quad._index
+        ({'1': (100, 100)}, {'1': (110, 100)})
+        >>> before.contains_point((100, 100)), quad.contains_point((100, 100))
+        (True, False)
+        """
+        copy = PersistentQuadTree(self._centre, self._bounds)
+        copy._root = self._root
+        copy._index = self._index
+        copy._shared = self._shared = True
+        return copy
+
+    def rollback(self, snapshot: PersistentQuadTree) -> None:
+        """ Put the players in this field back where they are in snapshot, a
+        snapshot taken of this field earlier. rollback undoes changes to self
+
+        Runtime: O(1)
+
+        === Preconditions ===
+        snapshot has the same centre and bounds as self
+
+        === DocTests ===
+        >>> quad = PersistentQuadTree((250, 250))
+        >>> quad.insert('1', (100, 100))
+        >>> before = quad.snapshot()
+        >>> quad.insert('2', (200, 200))
+        >>> quad.rollback(before)
+        >>> '2' in quad, quad.contains_point((200, 200))
+        (False, False)
+        """
+        self._root = snapshot._root
+        self._index = snapshot._index
+        self._shared = snapshot._shared = True
+
+    def _helper_index(self) -> Dict[str, Tuple[int, int]]:
+        """ _helper_index is helper index.
+        It takes self and returns its index, copying it first if another
+        field may be using it, so that it can be changed.
+        """
+        if self._shared:
+            self._index = dict(self._index)
+            self._shared = False
+        return self._index
+
+    @staticmethod
+    def _helper_child(bounds: Tuple[int, int, int, int],
+                      centre: Tuple[int, int], i: int
+                      ) -> Tuple[Tuple[int, int, int, int], Tuple[int, int]]:
+        """ _helper_child is helper child.
+        It takes the bounds and centre of a quadrant and the place i of one of
+        its sub-quadrants in (nw, sw, ne, se), and returns the bounds and
+        centre of that sub-quadrant.
+
+        === Preconditions ===
+        0 <= i < 4
+
+        === DocTests ===
+        >>> PersistentQuadTree._helper_child((0, 0, 500, 500), (250, 250), 3)
+        ((251, 251, 500, 500), (375, 375))
+        """
+        xmin, ymin, xmax, ymax = bounds
+        if i < 2:
+            xmax = centre[0]
+        else:
+            xmin = centre[0] + 1
+        if i % 2 == 0:
+            ymax = centre[1]
+        else:
+            ymin = centre[1] + 1
+        return (xmin, ymin, xmax, ymax), ((xmin + xmax) // 2,
+                                          (ymin + ymax) // 2)
+
+    @staticmethod
+    def _helper_place(point: Tuple[int, int], centre: Tuple[int, int]) -> int:
+        """ _helper_place is helper place.
+        It takes point and the centre of a quadrant and returns the place in
+        (nw, sw, ne, se) of the sub-quadrant that point belongs in.
+        """
+        if point[0] <= centre[0]:
+            return 0 if point[1] <= centre[1] else 1
+        return 2 if point[1] <= centre[1] else 3
+
+    def _helper_inserted(self, root: Optional[tuple], name: str,
+                         point: Tuple[int, int]) -> tuple:
+        """ _helper_inserted is helper inserted.
+        It takes self, root and a player's name and point, and returns a new
+        root that holds everything root does and the player as well. Only the
+        quadrants on the way down to the player are made again.
+        If the walk ends at a leaf, it is split into a chain of new quadrants
+        until the two players are in different ones. Raise an
+        OutOfBoundsError if a player is already at point.
+
+        === Preconditions ===
+        point is in the field's bounds
+        """
+        path = []
+        node, bounds, centre = root, self._bounds, self._centre
+        while node is not None and len(node) == 4:
+            i = self._helper_place(point, centre)
+            path.append((node, i))
+            bounds, centre = self._helper_child(bounds, centre, i)
+            node = node[i]
+        new = (name, point)
+        if node is not None:
+            if node[1] == point:
+                raise OutOfBoundsError
+            chain = []
+            i = self._helper_place(node[1], centre)
+            j = self._helper_place(point, centre)
+            while i == j:
+                chain.append(i)
+                bounds, centre = self._helper_child(bounds, centre, i)
+                i = self._helper_place(node[1], centre)
+                j = self._helper_place(point, centre)
+            children = [None, None, None, None]
+            children[i], children[j] = node, new
+            new = tuple(children)
+            for i in reversed(chain):
+                children = [None, None, None, None]
+                children[i] = new
+                new = tuple(children)
+        for parent, i in reversed(path):
+            new = parent[:i] + (new,) + parent[i + 1:]
+        return new
+
+    def _helper_removed(self, root: Optional[tuple], point: Tuple[int, int]
+                        ) -> Tuple[Optional[tuple], Optional[str]]:
+        """ _helper_removed is helper removed.
+        It takes self, root and point, and returns a new root that holds
+        everything root does except the player at point, next to the name of
+        that player (or root and None if there is no player at point).
+        On the way back up, a quadrant left with no players is dropped and a
+        quadrant left with one leaf becomes that leaf, like QuadTree does.
+        """
+        path = []
+        node, centre = root, self._centre
+        bounds = self._bounds
+        while node is not None and len(node) == 4:
+            i = self._helper_place(point, centre)
+            path.append((node, i))
+            bounds, centre = self._helper_child(bounds, centre, i)
+            node = node[i]
+        if node is None or node[1] != point:
+            return root, None
+        new = None
+        for parent, i in reversed(path):
+            children = parent[:i] + (new,) + parent[i + 1:]
+            left = [child for child in children if child is not None]
+            if not left:
+                new = None
+            elif len(left) == 1 and len(left[0]) == 2:
+                new = left[0]
+            else:
+                new = children
+        return new, node[0]
+
+    def __contains__(self, name: str) -> bool:
+        """ Return True if a player named <name> is stored in this tree.
+        __contains__ checks if name is contained in self
+
+        Runtime: O(1)
+
+        === DocTests ===
+        >>> quad = PersistentQuadTree((250, 250))
+        >>> quad.insert('1', (250, 250))
+        >>> '1' in quad, '2' in quad
+        (True, False)
+        """
+        return name in self._index
+
+    def contains_point(self, point: Tuple[int, int]) -> bool:
+        """ Return True if a player at location <point> is stored in this tree.
+        contains_point checks if point is in self
+
+        Runtime: O(log(n))
+
+        === DocTests ===
+        >>> quad = PersistentQuadTree((250, 250))
+        >>> quad.insert('1', (250, 250))
+        >>> quad.insert('2', (350, 350))
+        >>> quad.contains_point((350, 350)), quad.contains_point((450, 450))
+        (True, False)
+        """
+        node, bounds, centre = self._root, self._bounds, self._centre
+        while node is not None and len(node) == 4:
+            i = self._helper_place(point, centre)
+            bounds, centre = self._helper_child(bounds, centre, i)
+            node = node[i]
+        return node is not None and node[1] == point
+
+    def insert(self, name: str, point: Tuple[int, int]) -> None:
+        """Insert a player named <name> into this tree at point <point>.
+        insert a point and name into self
+        Raise an OutOfBoundsError if <point> is out of bounds.
+
+        Raise an OutOfBoundsError if moving the player would place the player at
+        exactly the same coordinates of another player in the Tree (before
+        moving the player).
+
+        Runtime: O(log(n))
+
+        === DocTests ===
+        >>> quad = PersistentQuadTree((250, 250))
+        >>> quad.insert('1', (250, 250))
+        >>> try:
+        ...     quad.insert('2', (250, 250))
+        ... except OutOfBoundsError:
+        ...     print('Error')
+        Error
+        >>> try:
+        ...     quad.insert('3', (501, 501))
+        ... except OutOfBoundsError:
+        ...     print('Error')
+        Error
+        """
+        if point[0] < self._bounds[0] or point[1] < self._bounds[1] or point[
+                0] > self._bounds[2] or point[1] > self._bounds[3]:
+            raise OutOfBoundsError
+        self._root = self._helper_inserted(self._root, name, point)
+        self._helper_index()[name] = point
+
+    def remove(self, name: str) -> None:
+        """ Remove information about a player named <name> from this tree.
+        remove a name from self
+
+        Runtime: O(log(n))
+
+        === DocTests ===
+        >>> quad = PersistentQuadTree((250, 250))
+        >>> quad.insert('1', (250, 250))
+        >>> quad.remove('1')
+        >>> '1' in quad
+        False
+        """
+        if name in self._index:
+            self.remove_point(self._index[name])
+
+    def remove_point(self, point: Tuple[int, int]) -> None:
+        """ Remove information about a player at point <point> from this tree.
+        remove_point removes a point in self
+
+        Runtime: O(log(n))
+
+        === DocTests ===
+        >>> quad = PersistentQuadTree((250, 250))
+        >>> quad.insert('1', (250, 250))
+        >>> quad.insert('2', (350, 350))
+        >>> quad.remove_point((250, 250))
+        >>> quad._root
+        ('2', (350, 350))
+        """
+        root, name = self._helper_removed(self._root, point)
+        if name is not None:
+            self._root = root
+            if self._index.get(name) == point:
+                del self._helper_index()[name]
+
+    def move(self, name: str, direction: str, steps: int) -> Optional[
+            Tuple[int, int]]:
+        """ Return the new location of the player named <name> after moving it
+        in the given <direction> by <steps> steps.
+        move a name a direction by steps in self
+        Raise an OutOfBoundsError if this would move the player named
+        <name> out of bounds (before moving the player).
+
+        Raise an OutOfBoundsError if moving the player would place the player at
+        exactly the same coordinates of another player in the Tree (before
+        moving the player).
+
+        Runtime: O(log(n))
+
+        === Preconditions ===
+        direction in ['N', 'S', 'E', 'W']
+
+        === DocTests ===
+        >>> quad = PersistentQuadTree((250, 250))
+        >>> quad.insert('1', (250, 250))
+        >>> quad.insert('2', (350, 350))
+        >>> quad.move('2', 'N', 100)
+        (350, 250)
+        >>> try:
+        ...     quad.move('1', 'E', 100)
+        ... except OutOfBoundsError:
+        ...     print('Error')
+        Error
+        """
+        if name in self._index:
+            return self.move_point(self._index[name], direction, steps)
+
+    def move_point(self, point: Tuple[int, int], direction: str, steps: int) ->\
+            Optional[Tuple[int, int]]:
+        """ Return the new location of the player at point <point> after moving
+        it in the given <direction> by <steps> steps.
+        move_point moves a point in direction by steps in self
+        Raise an OutOfBoundsError if this would move the player at point
+        <point> out of bounds (before moving the player).
+
+        Raise an OutOfBoundsError if moving the player would place the player at
+        exactly the same coordinates of another player in the Tree (before
+        moving the player).
+
+        The player is taken out and put back into new roots, and self only
+        takes the result once both have worked, so a move that raises leaves
+        the field exactly as it was.
+
+        Runtime: O(log(n))
+
+        === Preconditions ===
+        direction in ['N', 'S', 'E', 'W']
+
+        === DocTests ===
+        >>> quad = PersistentQuadTree((250, 250))
+        >>> quad.insert('1', (250, 250))
+        >>> quad.insert('2', (350, 350))
+        >>> quad.move_point((350, 350), 'N', 100)
+        (350, 250)
+        >>> before = quad._root
+        >>> try:
+        ...     quad.move_point((250, 250), 'E', 100)
+        ... except OutOfBoundsError:
+        ...     print('Error')
+        Error
+        >>> quad._root is before
+        True
+        """
+        root, name = self._helper_removed(self._root, point)
+        if name is None:
+            return None
+        if direction == 'N':
+            new_point = (point[0], point[1] - steps)
+        elif direction == 'S':
+            new_point = (point[0], point[1] + steps)
+        elif direction == 'W':
+            new_point = (point[0] - steps, point[1])
+        else:
+            new_point = (point[0] + steps, point[1])
+        if new_point[0] < self._bounds[0] or new_point[1] < self._bounds[
+                1] or new_point[0] > self._bounds[2] or new_point[1] > \
+                self._bounds[3]:
+            raise OutOfBoundsError
+        self._root = self._helper_inserted(root, name, new_point)
+        self._helper_index()[name] = new_point
+        return new_point
+
+    def names_in_range(self, point: Tuple[int, int], direction: str,
+                       distance: int) -> List[str]:
+        """ Return a list of names of players whose location is in the
+        <direction> relative to <point> and whose location is within <distance>
+        along both the x and y axis.
+        names_in_range searches in direction from point for distance in self
+        Quadrants on the far side of a centre from the box are skipped, like
+        QuadTree does. The bounds and centre of each sub-quadrant are worked
+        out in the loop rather than with _helper_child, since this is the
+        query games make most.
+
+        Runtime: faster than O(n) when distance is small
+
+        === Preconditions ===
+        direction in ['NW', 'SE', 'NE', 'SW']
+
+        === DocTests ===
+        >>> quad = PersistentQuadTree((250, 250))
+        >>> quad.insert('1', (250, 250))
+        >>> quad.insert('2', (350, 350))
+        >>> quad.names_in_range((500, 500), 'NW', 500)
+        ['1', '2']
+        """
+        xmin, xmas, ymin, ymax = self._helper_box(point, direction, distance)
+        result = []
+        if self._root is None:
+            return result
+        stack = [(self._root,) + self._bounds + self._centre]
+        while stack:
+            node, left, top, right, bottom, cx, cy = stack.pop()
+            if len(node) == 2:
+                x, y = node[1]
+                if xmin <= x <= xmas and ymin <= y <= ymax:
+                    result.append(node[0])
+                continue
+            if xmas > cx:
+                middle = (cx + 1 + right) // 2
+                if ymax > cy and node[3] is not None:
+                    stack.append((node[3], cx + 1, cy + 1, right, bottom,
+                                  middle, (cy + 1 + bottom) // 2))
+                if ymin <= cy and node[2] is not None:
+                    stack.append((node[2], cx + 1, top, right, cy, middle,
+                                  (top + cy) // 2))
+            if xmin <= cx:
+                middle = (left + cx) // 2
+                if ymax > cy and node[1] is not None:
+                    stack.append((node[1], left, cy + 1, cx, bottom, middle,
+                                  (cy + 1 + bottom) // 2))
+                if ymin <= cy and node[0] is not None:
+                    stack.append((node[0], left, top, cx, cy, middle,
+                                  (top + cy) // 2))
+        return result
+
+    def names_in_ranges(self, queries: List[Tuple[Tuple[int, int], str, int]]
+                        ) -> List[List[str]]:
+        """ Return, for each (point, direction, distance) query in <queries>,
+        the list of names that names_in_range(point, direction, distance) would
+        return. names_in_ranges answers many range queries at once in self
+        All of the queries are answered in one walk over the tree, and each
+        quadrant is only given the boxes that reach it.
+
+        Runtime: faster than one names_in_range call per query
+
+        === Preconditions ===
+        every direction in queries is in ['NW', 'SE', 'NE', 'SW']
+
+        === DocTests ===
+        >>> quad = PersistentQuadTree((250, 250))
+        >>> quad.insert('1', (250, 250))
+        >>> quad.insert('2', (350, 350))
+        >>> quad.names_in_ranges([((500, 500), 'NW', 500), ((0, 0), 'SE', 10)])
+        [['1', '2'], []]
+        """
+        results = [[] for _ in queries]
+        if self._root is None:
+            return results
+        boxes = [(i,) + self._helper_box(*query) for i, query in enumerate(
+            queries)]
+        stack = [(self._root, self._bounds, self._centre, boxes)]
+        while stack:
+            node, bounds, centre, reaching = stack.pop()
+            if not reaching:
+                continue
+            if len(node) == 2:
+                x, y = node[1]
+                for i, xmin, xmas, ymin, ymax in reaching:
+                    if xmin <= x <= xmas and ymin <= y <= ymax:
+                        results[i].append(node[0])
+                continue
+            west = [box for box in reaching if box[1] <= centre[0]]
+            east = [box for box in reaching if box[2] > centre[0]]
+            for i, side, south in [(3, east, True), (2, east, False),
+                                   (1, west, True), (0, west, False)]:
+                if node[i] is not None:
+                    if south:
+                        side_boxes = [box for box in side if box[4] > centre[
+                            1]]
+                    else:
+                        side_boxes = [box for box in side if box[3] <= centre[
+                            1]]
+                    stack.append((node[i],) + self._helper_child(
+                        bounds, centre, i) + (side_boxes,))
+        return results
+
+    def nearest(self, point: Tuple[int, int], k: int = 1,
+                predicate: Optional[Callable[[str], bool]] = None) -> List[str]:
+        """ Return the names of the <k> players closest to <point>, closest
+        first. If <predicate> is given, only players whose name it returns
+        True for are counted. Fewer than k names are returned if there are not
+        enough players. nearest finds the closest players to point in self
+        Quadrants are searched closest first in the same order as QuadTree
+        searches them, so players that are as close as each other come back
+        in the same order too.
+
+        Runtime: O(log(n)) for a small k when most players pass predicate
+
+        === DocTests ===
+        >>> quad = PersistentQuadTree((250, 250))
+        >>> quad.insert('1', (250, 250))
+        >>> quad.insert('2', (350, 350))
+        >>> quad.insert('3', (10, 10))
+        >>> quad.nearest((330, 320), 2)
+        ['2', '1']
+        >>> quad.nearest((330, 320), 1, {'1', '3'}.__contains__)
+        ['1']
+        """
+        result = []
+        if self._root is None:
+            return result
+        order = 0
+        bounds = self._bounds
+        heap = [(self._helper_distance(point, (bounds[0], bounds[2], bounds[1],
+                                               bounds[3])), order, None,
+                 (self._root, bounds, self._centre))]
+        while heap and len(result) < k:
+            _, _, name, quadrant = heapq.heappop(heap)
+            if name is not None:
+                result.append(name)
+                continue
+            node, bounds, centre = quadrant
+            if len(node) == 2:
+                if predicate is None or predicate(node[0]):
+                    order += 1
+                    distance = self._helper_distance(
+                        point, (node[1][0], node[1][0], node[1][1],
+                                node[1][1]))
+                    heapq.heappush(heap, (distance, order, node[0], None))
+                continue
+            for i in range(4):
+                if node[i] is not None:
+                    order += 1
+                    child = self._helper_child(bounds, centre, i)
+                    heapq.heappush(heap, (self._helper_distance(point, (
+                        child[0][0], child[0][2], child[0][1], child[0][3])),
+                        order, None, (node[i],) + child))
+        return result
+
+    def bounds(self) -> Tuple[int, int, int, int]:
+        """ Return the smallest x, smallest y, largest x and largest y that a
+        player on this field can have. bounds
+
+        Runtime: O(1)
+
+        === DocTests ===
+        >>> PersistentQuadTree((500, 200), (0, 0, 1000, 400)).bounds()
+        (0, 0, 1000, 400)
+        """
+        return self._bounds
+
+    def size(self) -> int:
+        """ Return the number of nodes in <self>
+        The field is one node and every player is another, unless there is at
+        most one player, in which case the field is a leaf.
+
+        Runtime: O(1)
+
+        === DocTests ===
+        >>> quad = PersistentQuadTree((250, 250))
+        >>> quad.size()
+        1
+        >>> quad.insert('1', (250, 250))
+        >>> quad.insert('2', (350, 350))
+        >>> quad.size()
+        3
+        """
+        if self.is_leaf():
+            return 1
+        return 1 + len(self._index)
+
+    def height(self) -> int:
+        """ Return the height of <self>
+        The field is the root and its players are leaves, so the height is 1
+        while the field is a leaf and 2 after that.
+
+        Runtime: O(1)
+
+        === DocTests ===
+        >>> quad = PersistentQuadTree((250, 250))
+        >>> quad.insert('1', (250, 250))
+        >>> quad.height()
+        1
+        >>> quad.insert('2', (350, 350))
+        >>> quad.height()
+        2
+        """
+        if self.is_leaf():
+            return 1
+        return 2
+
+    def depth(self, tree: Tree) -> Optional[int]:
+        """ Return the depth of the subtree <tree> relative to <self>. Return
+        None if <tree> is not a descendant of <self>
+        The quadrants of a PersistentQuadTree are tuples, not Trees, so no
+        Tree is ever a descendant of it and this is always None.
+
+        Runtime: O(1)
+
+        === DocTests ===
+        >>> quad = PersistentQuadTree((250, 250))
+        >>> quad.depth(quad) is None
+        True
+        """
+        return None
+
+    def is_leaf(self) -> bool:
+        """ Return True if <self> has no children. is_leaf
+        A field with at most one player has nothing below it.
+
+        Runtime: O(1)
+
+        === DocTests ===
+        >>> quad = PersistentQuadTree((250, 250))
+        >>> quad.insert('1', (250, 250))
+        >>> quad.is_leaf()
+        True
+        >>> quad.insert('2', (350, 350))
+        >>> quad.is_leaf()
+        False
+        """
+        return self._root is None or len(self._root) == 2
+
+    def is_empty(self) -> bool:
+        """ Return True if <self> or any of its descendants do not store any
+        information about the location of any players. is_empty
+
+        Runtime: O(1)
+
+        === DocTests ===
+        >>> quad = PersistentQuadTree((250, 250))
+        >>> quad.is_empty()
+        True
+        >>> quad.insert('1', (250, 250))
+        >>> quad.is_empty()
+        False
+        """
+        return self._root is None
+
+
+class TwoDTree(Tree):
+    """ TwoDTree is a Two D Tree that is a subclass of Tree.
+    It sorts players/people into a field where each node has a name and point
+    value.
+    After the first player is inserted, each following player is either
+    placed in the less than or greater than subtree which alternates between
+    sorting along the y-axis and x-axis.
+    This means that no node should ever be empty (without name and point)
+    apart from its initialization.
+
+    === Attributes ===
+    _name : the name of a player in this tree/node
+    _point : the point of the player in this tree/node
+    _ne : the north-eastern corner of this tree
+        This is None if it is not the root node
+    _se : the south-eastern corner of this tree
+        This is None if it is not the root node
+    _lt : the tree with nodes less than or equal to the current position in
+        either the y or x axis of this current point
+    _gt : the tree with nodes greater than the current position in either
+        the y or x axis of this current point
+    _split_type : the split type of this tree, either along the x axis or y axis
+    _index : a dictionary mapping the names of players in this tree to their
+        points (or None if this is not the root node)
+    _count : the number of players stored in this node and below it
+    _alpha : how lopsided a subtree may get before it is rebuilt, or None if
+        the tree is only balanced when balance is called (always None if this
+        is not the root node)
+    _roles : a dictionary mapping the names of players to their role tags,
+        the same one for every node of the tree so that a subtree being
+        rebuilt can look them up
+    _role_counts : how many of the players stored in this node and below it
+        have each role (or None if none of them has one)
+    _stats : the counters of the work done by the operations of this tree
+        (or None if it is not counting or this is not the root node)
+
+    === Representation Invariants ===
+    If _nw, _se are not None, then this tree is not the root value.
+        Otherwise, it is the root of the tree.
+    Only the root of a tree has an _index, and it holds exactly the players
+        stored in the tree.
+    Unless upon initialization of the tree, _name and _point must not be None.
+    _split_type is either 'x' or 'y'.
+    _nw must have values less than _se
+    _count is 0 for an empty tree, and otherwise 1 plus the _count of _lt and
+        _gt. _role_counts adds up the same way.
+    If _alpha is not None, then 0.5 <= _alpha < 1.
+
+    === DocTests ===
+        >>> two = TwoDTree((0, 0), (500, 500))
+        >>> two._nw == (0, 0)
+        True
+        >>> two._se == (500, 500)
+        True
+        >>> two._name is None and two._point is None
+        True
+        >>> two._lt is None and two._gt is None
+        True
+        >>> two._split_type == 'x'
+        True
+    """
+    __slots__ = ('_name', '_point', '_nw', '_se', '_lt', '_gt', '_split_type',
+                 '_index', '_count', '_alpha', '_roles', '_role_counts',
+                 '_stats')
+    _name: Optional[str]
+    _point: Optional[Tuple[int, int]]
+    _nw: Optional[Tuple[int, int]]
+    _se: Optional[Tuple[int, int]]
+    _lt: Optional[TwoDTree]
+    _gt: Optional[TwoDTree]
+    _split_type: str
+    _index: Optional[Dict[str, Tuple[int, int]]]
+    _count: int
+    _alpha: Optional[float]
+    _roles: Dict[str, str]
+    _role_counts: Optional[Dict[str, int]]
+    _stats: Optional[Dict[str, int]]
+
+    def __init__(self, nw: Optional[Tuple[int, int]],
+                 se: Optional[Tuple[int, int]],
+                 alpha: Optional[float] = None) -> None:
+        """Initialize a new Tree instance in self with nw and se corners.
+        If alpha is given, the tree balances itself as players come and go:
+        a subtree is rebuilt once one side of it holds more than alpha of its
+        players (see _helper_insert and _helper_remove_point). A larger alpha
+        rebuilds less often but lets the tree grow taller.
+
+        Runtime: O(1)
+
+        === Preconditions ===
+        nw[0] < se[0] and sw[1] < se[1]
+        alpha is None or 0.5 <= alpha < 1
+
+        === DocTests ===
+        >>> two = TwoDTree((0, 0), (500, 500))
+        >>> two._nw == (0, 0)
+        True
+        >>> two._se == (500, 500)
+        True
+        >>> two._name is None and two._point is None
+        True
+        >>> two._lt is None and two._gt is None
+        True
+        >>> two._split_type == 'x'
+        True
+        >>> two._count, two._alpha
+        (0, None)
+        """
+        self._name = None
+        self._point = None
+        self._nw = nw
+        self._se = se
+        self._lt = None
+        self._gt = None
+        self._split_type = 'x'
+        self._index = {}
+        self._count = 0
+        self._alpha = alpha
+        self._roles = {}
+        self._role_counts = None
+        self._stats = None
+
+    @staticmethod
+    def _helper_subtree(split_type: str, roles: Dict[str, str]) -> TwoDTree:
+        """ _helper_subtree is helper subtree.
+        It creates and returns a node without corners that splits along
+        split_type and shares the roles of its tree. Only the root keeps an
+        index, so the node has none.
+
+        === Preconditions ===
+        split_type in ['x', 'y']
+        """
+        node = TwoDTree(None, None)
+        node._split_type = split_type
+        node._index = None
+        node._roles = roles
+        return node
+
+    @classmethod
+    def from_points(cls, items: List[Tuple[str, Tuple[int, int]]],
+                    nw: Tuple[int, int], se: Tuple[int, int],
+                    alpha: Optional[float] = None) -> TwoDTree:
+        """ Return a new TwoDTree with nw and se corners and alpha that holds
+        every (name, point) player in items. from_points builds a tree in one
+        go. Each node is the median player along its split axis, so the tree is
+        balanced (see _helper_rebuild).
+        Raise an OutOfBoundsError if a point is out of bounds or two players are
+        at the same point.
+
+        Runtime: O(n log(n))
+
+        === Preconditions ===
+        alpha is None or 0.5 <= alpha < 1
+
+        === DocTests ===
+        >>> two = TwoDTree.from_points([('1', (250, 250)), ('2', (350, 350)),
+        ...                             ('3', (300, 300))], (0, 0), (500, 500))
+        >>> two._name, two._lt._name, two._gt._name
+        ('3', '1', '2')
+        """
+        tree = cls(nw, se, alpha)
+        points = set()
+        for _, point in items:
+            if not (nw[0] <= point[0] <= se[0] and nw[1] <= point[1] <= se[
+                    1]) or point in points:
+                raise OutOfBoundsError
+            points.add(point)
+        tree._helper_rebuild(items)
+        tree._index = {name: point for name, point in items}
+        return tree
+
+    def _helper_rebuild(self, items: List[Tuple[str, Tuple[int, int]]]
+                        ) -> None:
+        """ _helper_rebuild is helper rebuild.
+        It takes self and items and replaces everything stored in this node
+        and below it with the (name, point) players in items, as a balanced
+        tree whose nodes are the median players along their split axis. This
+        node stays the root of it and keeps its split type, index and alpha.
+        The players are sorted by x and by y once, and both orders are kept
+        while they are split between the subtrees. If players tie with the
+        median on the split axis, the last of them becomes the node, so all
+        the ties end up in _lt as they must.
+        The garbage collector is paused while the nodes are made, since nodes
+        never refer back to their parents.
+
+        Runtime: O(n log(n))
+
+        === Preconditions ===
+        no two points in items are equal
+        """
+        self._name, self._point, self._lt, self._gt = None, None, None, None
+        self._count = 0
+        self._role_counts = None
+        if items:
+            players = [(point[0], point[1], name) for name, point in items]
+            enabled = gc.isenabled()
+            gc.disable()
+            try:
+                self._helper_build(sorted(players), sorted(
+                    players, key=lambda player: (player[1], player[0])))
+            finally:
+                if enabled:
+                    gc.enable()
+
+    def _helper_build(self, by_x: List[Tuple[int, int, str]],
+                      by_y: List[Tuple[int, int, str]]) -> None:
+        """ _helper_build is helper build.
+        It takes self and the same (x, y, name) players sorted by x and sorted
+        by y and makes this empty node the median player along its split axis,
+        then builds _lt and _gt from the players on each side. The order that
+        is not along the split axis is cut in one pass, the other is sliced.
+        The nodes still to be built are kept on a stack instead of recursing.
+        A node is built after its parent, so if any player has a role, going
+        through the nodes backwards counts the roles of every subtree before
+        its parent.
+
+        === Preconditions ===
+        by_x and by_y are not empty and no two of their points are equal
+        """
+        stack = [(self, by_x, by_y)]
+        made = []
+        while stack:
+            tree, xs, ys = stack.pop()
+            made.append(tree)
+            tree._count = len(xs)
+            if len(xs) == 1:
+                tree._name, tree._point = xs[0][2], (xs[0][0], xs[0][1])
+                continue
+            if tree._split_type == 'x':
+                ordered, others, axis, other = xs, ys, 0, 'y'
+            else:
+                ordered, others, axis, other = ys, xs, 1, 'x'
+            middle = len(ordered) // 2
+            split = ordered[middle][axis]
+            while middle + 1 < len(ordered) and ordered[middle + 1][
+                    axis] == split:
+                middle += 1
+            node = ordered[middle]
+            tree._name, tree._point = node[2], (node[0], node[1])
+            if middle > 0:
+                lower = [player for player in others if player[axis] <= split]
+                lower.remove(node)
+                tree._lt = TwoDTree._helper_subtree(other, self._roles)
+                if axis == 0:
+                    stack.append((tree._lt, ordered[:middle], lower))
+                else:
+                    stack.append((tree._lt, lower, ordered[:middle]))
+            if middle + 1 < len(ordered):
+                higher = [player for player in others if player[axis] > split]
+                tree._gt = TwoDTree._helper_subtree(other, self._roles)
+                if axis == 0:
+                    stack.append((tree._gt, ordered[middle + 1:], higher))
+                else:
+                    stack.append((tree._gt, higher, ordered[middle + 1:]))
+        if self._roles:
+            for tree in reversed(made):
+                counts = Tree._helper_add_role(None, self._roles.get(
+                    tree._name), 1)
+                for child in (tree._lt, tree._gt):
+                    if child is not None:
+                        counts = Tree._helper_merge_roles(counts,
+                                                          child._role_counts)
+                tree._role_counts = counts
+
+    def save(self, path: str) -> None:
+        """ Save the players and the shape of this tree to the file at <path>,
+        so that load(path) gives the same tree back. save writes self to a file
+        The nodes are written in preorder (node, _lt, _gt), each as its player
+        and one byte whose first bit says it has an _lt and second bit that it
+        has a _gt. The corners and alpha are kept in the header.
+
+        Runtime: O(n)
+
+        === Preconditions ===
+        self is the root of its tree
+
+        === DocTests ===
+        >>> import os, tempfile
+        >>> two = TwoDTree.from_points([('1', (250, 250)), ('2', (350, 350)),
+        ...                             ('3', (300, 300))], (0, 0), (500, 500),
+        ...                            0.7)
+        >>> path = os.path.join(tempfile.mkdtemp(), 'field.tag')
+        >>> two.save(path)
+        >>> loaded = TwoDTree.load(path)
+        >>> loaded._name, loaded._lt._name, loaded._gt._name
+        ('3', '1', '2')
+        >>> loaded._count, loaded._gt._split_type, loaded._alpha
+        (3, 'y', 0.7)
+        """
+        points = array('q')
+        names = []
+        topology = bytearray()
+        stack = [self] if self._name is not None else []
+        while stack:
+            node = stack.pop()
+            points.append(node._point[0])
+            points.append(node._point[1])
+            names.append(node._name)
+            topology.append((node._lt is not None) | (
+                node._gt is not None) << 1)
+            if node._gt is not None:
+                stack.append(node._gt)
+            if node._lt is not None:
+                stack.append(node._lt)
+        Tree._helper_save(path, 2, self._nw + self._se + (0, 0),
+                          self._alpha or 0.0, points, names, topology)
+
+    @classmethod
+    def load(cls, path: str) -> TwoDTree:
+        """ Return the TwoDTree that save wrote to the file at <path>. load
+        The file is mapped into memory and the nodes are made from its
+        topology bytes in one pass, with the garbage collector paused as in
+        from_points, then the counts are added up from the last node back.
+        No point is compared or checked again.
+        Raise a ValueError if the file was not saved by a TwoDTree.
+
+        Runtime: O(n)
+        """
+        return Tree._helper_load(path, 2, cls._helper_from_file)
+
+    @classmethod
+    def _helper_from_file(cls, numbers: Tuple[int, ...], alpha: float,
+                          points: memoryview, names: List[str],
+                          topology: memoryview) -> TwoDTree:
+        """ _helper_from_file is helper from file.
+        It takes the corners, the alpha (0 for none), the points, the names
+        and the topology bytes of a saved TwoDTree and returns the tree they
+        describe. The nodes still to be filled are kept on a stack in
+        preorder, so each record belongs to the node on top of it. A node
+        comes before everything below it, so going through the nodes
+        backwards counts every subtree before its parent.
+        """
+        tree = cls((numbers[0], numbers[1]), (numbers[2], numbers[3]),
+                   alpha or None)
+        nodes = []
+        enabled = gc.isenabled()
+        gc.disable()
+        try:
+            stack = [tree] if names else []
+            for record, mask in enumerate(topology):
+                node = stack.pop()
+                node._name = names[record]
+                node._point = (points[2 * record], points[2 * record + 1])
+                nodes.append(node)
+                other = 'y' if node._split_type == 'x' else 'x'
+                if mask & 2:
+                    node._gt = TwoDTree._helper_subtree(other, tree._roles)
+                    stack.append(node._gt)
+                if mask & 1:
+                    node._lt = TwoDTree._helper_subtree(other, tree._roles)
+                    stack.append(node._lt)
+        finally:
+            if enabled:
+                gc.enable()
+        for node in reversed(nodes):
+            node._count = 1 + (node._lt._count if node._lt is not None else 0
+                               ) + (node._gt._count if node._gt is not None
+                                    else 0)
+        tree._index = dict(zip(names, zip(points[0::2], points[1::2])))
+        return tree
+
+    def _helper_find(self, name: str) -> Optional[Tuple[int, int]]:
+        """ _helper_find is helper find.
+        It takes self and name and returns the point of the player named name,
+        or None if there is no such player. The root answers from its index,
+        other nodes are searched.
+        """
+        if self._index is not None:
+            return self._index.get(name)
+        stack = [self]
+        while stack:
+            node = stack.pop()
+            if node._name == name:
+                return node._point
+            if node._gt is not None:
+                stack.append(node._gt)
+            if node._lt is not None:
+                stack.append(node._lt)
+        return None
+
+    def __contains__(self, name: str) -> bool:
+        """ Return True if a player named <name> is stored in this tree.
+        __contains__ checks if name is contained in self
+        Runtime: O(1)
+
+        Preconditions
+
+        === DocTests ===
+        >>> two = TwoDTree((0, 0), (500, 500))
+        >>> two.insert('1', (250, 250))
+        >>> two.insert('2', (350, 350))
+        >>> '1' in two
+        True
+        >>> '2' in two
+        True
+        >>> '3' in two
+        False
+        """
+        return self._helper_find(name) is not None
+
+    def contains_point(self, point: Tuple[int, int]) -> bool:
+        """ Return True if a player at location <point> is stored in this tree.
+        contains_point checks if point is in self
+        Runtime: O(log(n))
+
+        === Preconditions ===
+        nw[0] < se[0] and sw[1] < se[1]
+
+        === DocTests ===
+        >>> two = TwoDTree((0, 0), (500, 500))
+        >>> two.insert('1', (250, 250))
+        >>> two.insert('2', (350, 350))
+        >>> two.contains_point((250, 250))
+        True
+        >>> two.contains_point((350, 350))
+        True
+        >>> two.contains_point((450, 450))
+        False
+        """
+        node = self._helper_node(point)
+        return node is not None and node._point == point
+
+    def _helper_child(self, point: Tuple[int, int]) -> Optional[TwoDTree]:
+        """ _helper_child is helper child.
+        It takes self and point and returns the child of self on point's side
+        of the split line (or None if there is no child there).
+
+        === Preconditions ===
+        self is not empty
+        """
+        if self._split_type == 'x':
+            lower = point[0] <= self._point[0]
+        else:
+            lower = point[1] <= self._point[1]
+        return self._lt if lower else self._gt
+
+    def _helper_node(self, point: Tuple[int, int]) -> Optional[TwoDTree]:
+        """ _helper_node is helper node.
+        It takes self and point and walks down the sides of the split lines
+        that point is on until it reaches the node at point, and returns it
+        (or None if there is no player at point).
+        """
+        node = self
+        while node is not None and node._point is not None:
+            if node._point == point:
+                return node
+            node = node._helper_child(point)
+        return None
+
+    def insert(self, name: str, point: Tuple[int, int]) -> None:
+        """Insert a player named <name> into this tree at point <point>.
+        insert a point and a name into self
+        Raise an OutOfBoundsError if <point> is out of bounds.
+
+        Raise an OutOfBoundsError if moving the player would place the player at
+        exactly the same coordinates of another player in the Tree (before
+        moving the player).
+
+        Runtime: O(log(n))
+
+        Preconditions
+
+        === DocTests ===
+        >>> two = TwoDTree((0, 0), (500, 500))
+        >>> two.insert('1', (250, 250))
+        >>> two.insert('2', (350, 350))
+        >>> '1' in two
+        True
+        >>> '2' in two
+        True
+        >>> try:
+        ...     two.insert('3', (250, 250))
+        ... except OutOfBoundsError:
+        ...     print('Error')
+        Error
+        >>> try:
+        ...     two.insert('3', (501, 501))
+        ... except OutOfBoundsError:
+        ...     print('Error')
+        Error
+        """
+        self._helper_insert(name, point)
+        if self._index is not None:
+            self._index[name] = point
+
+    def _helper_insert(self, name: str, point: Tuple[int, int]) -> None:
+        """ _helper_insert is helper insert.
+        It takes self name and point and places the player in the right
+        subtree without touching the index. Raise an OutOfBoundsError like
+        insert does.
+        The counts of the nodes passed on the way down only go up once the
+        player is placed, so they are untouched if an error is raised.
+        If self has an _alpha and the new node is deeper than log base
+        1 / _alpha of the number of players, one subtree on the path back up
+        is rebuilt (see _helper_scapegoat). If self is counting, the nodes
+        visited and the new node are added to its counters.
+        Preconditions
+        """
+        if self._nw is not None and self._se is not None and (
+                point[0] < self._nw[0] or point[0] > self._se[0] or point[1] <
+                self._nw[1] or point[1] > self._se[1]):
+            raise OutOfBoundsError
+        path = []
+        node = self
+        while node._point is not None:
+            if node._point == point:
+                raise OutOfBoundsError
+            path.append(node)
+            other = 'y' if node._split_type == 'x' else 'x'
+            axis = 0 if node._split_type == 'x' else 1
+            if point[axis] <= node._point[axis]:
+                if node._lt is None:
+                    node._lt = self._helper_subtree(other, self._roles)
+                node = node._lt
+            else:
+                if node._gt is None:
+                    node._gt = self._helper_subtree(other, self._roles)
+                node = node._gt
+        node._name = name
+        node._point = point
+        node._count = 1
+        for parent in path:
+            parent._count += 1
+        role = self._roles.get(name)
+        if role is not None:
+            node._role_counts = {role: 1}
+            for parent in path:
+                parent._role_counts = Tree._helper_add_role(
+                    parent._role_counts, role, 1)
+        if self._stats is not None:
+            self._helper_record('insert', len(path) + 1)
+            self._stats['allocated'] += 1 if path else 0
+        if self._alpha is not None and (1 / self._alpha) ** len(
+                path) > self._count:
+            self._helper_scapegoat(path)
+
+    def _helper_scapegoat(self, path: List[TwoDTree]) -> None:
+        """ _helper_scapegoat is helper scapegoat.
+        It takes self and the path of nodes from self down to the parent of a
+        node that was just inserted, and rebuilds the subtree of the lowest
+        node on path that the new node is more than log base 1 / _alpha of
+        its count below. Such a subtree is too tall for its size, so one of
+        its nodes has a child holding more than _alpha of its players.
+        Looking for a tall subtree rather than a lopsided node means subtrees
+        that are only lopsided because players tie along a split axis, which
+        a rebuild cannot fix, are not rebuilt over and over.
+
+        === Preconditions ===
+        self._alpha is not None
+
+        === DocTests ===
+        >>> two = TwoDTree((0, 0), (500, 500))
+        >>> for i in range(4):
+        ...     two.insert(str(i), (i, i))
+        >>> two._alpha = 0.6
+        >>> two._helper_scapegoat([two, two._gt, two._gt._gt])
+        >>> two._point, two._lt._point, two._lt._lt._point, two._gt._point
+        ((2, 2), (1, 1), (0, 0), (3, 3))
+        """
+        limit = 1 / self._alpha
+        below = limit
+        for parent in reversed(path):
+            if below > parent._count:
+                self._helper_rebalance(parent)
+                return
+            below *= limit
+
+    def _helper_rebalance(self, node: TwoDTree) -> None:
+        """ _helper_rebalance is helper rebalance.
+        It takes self and a node of its tree that has a player, and rebuilds
+        the subtree of node the way balance does. If self is counting, the
+        rebuild is added to its counters: node stays, while every other node
+        of the subtree is freed and made again.
+        """
+        node._helper_rebuild(list(node.items()))
+        if self._stats is not None:
+            self._stats['rebuilds'] += 1
+            self._stats['allocated'] += node._count - 1
+            self._stats['freed'] += node._count - 1
+
+    def remove(self, name: str) -> None:
+        """ Remove information about a player named <name> from this tree.
+        remove a name from self
+        Runtime: O(log(n))
+
+        Preconditions
+
+        === DocTests ===
+        >>> two = TwoDTree((0, 0), (500, 500))
+        >>> two.insert('1', (250, 250))
+        >>> two.insert('2', (350, 350))
+        >>> '1' in two
+        True
+        >>> '2' in two
+        True
+        >>> two.remove('1')
+        >>> '1' in two
+        False
+        """
+        point = self._helper_find(name)
+        if point is not None:
+            self.remove_point(point)
+
+    def remove_point(self, point: Tuple[int, int]) -> None:
+        """ Remove information about a player at point <point> from this tree.
+        remove_point removes a point in self
+        Runtime: O(log(n))
+
+        Preconditions
+
+        === DocTests ===
+        >>> two = TwoDTree((0, 0), (500, 500))
+        >>> two.insert('1', (250, 250))
+        >>> two.insert('2', (350, 350))
+        >>> '1' in two
+        True
+        >>> '2' in two
+        True
+        >>> two.remove_point((250, 250))
+        >>> two.contains_point((250, 250))
+        False
+        """
+        name = self._helper_remove_point(point)
+        if self._index is not None and name is not None and self._index.get(
+                name) == point:
+            del self._index[name]
+
+    def _helper_remove_point(self, point: Tuple[int, int]) -> Optional[str]:
+        """ _helper_remove_point is helper remove point.
+        It takes self and point, removes the player at point without touching
+        the index and returns the name of the removed player (or None if
+        there was no player at point).
+        A node that is not a leaf takes the player of its _lt subtree that is
+        largest along its split axis, which is then removed from _lt the same
+        way. If there is no _lt, _gt becomes _lt first, since every player
+        left is then no larger than the new node. The walk stops at a node
+        with no children left, which its parent drops, so the rest of the tree
+        is untouched.
+        Every node the walk passes loses one player from its count. If self
+        has an _alpha, the highest of those nodes whose other child now holds
+        more than _alpha of its players has its subtree rebuilt.
+        Each player that moves up leaves the role counts of the nodes from the
+        one it moves to (not included) down to the one it left, and the
+        removed player leaves those from self down to its node.
+        If self is counting, the nodes on the walk and the dropped node are
+        added to its counters.
+        Preconditions
+        """
+        removed = None
+        path = []
+        matches = []
+        parent, node = None, self
+        while node is not None and node._point is not None:
+            path.append(node)
+            if node._point != point:
+                parent, node = node, node._helper_child(point)
+                continue
+            if removed is None:
+                removed = node._name
+            matches.append((len(path) - 1, node._name))
+            if node._lt is None:
+                node._lt, node._gt = node._gt, None
+            if node._lt is None:
+                node._name, node._point = None, None
+                if parent is not None:
+                    if parent._lt is node:
+                        parent._lt = None
+                    else:
+                        parent._gt = None
+                break
+            replace = node._lt._helper_max(node._split_type)
+            node._name, node._point = replace._name, replace._point
+            point = node._point
+            parent, node = node, node._lt
+        if removed is not None:
+            for node in path:
+                node._count -= 1
+            if self._roles:
+                start = 0
+                for end, name in matches:
+                    role = self._roles.get(name)
+                    for node in path[start:end + 1]:
+                        node._role_counts = Tree._helper_add_role(
+                            node._role_counts, role, -1)
+                    start = end + 1
+            if self._stats is not None:
+                self._helper_record('remove_point', len(path))
+                self._stats['freed'] += 1 if len(path) > 1 else 0
+            if self._alpha is not None:
+                for i in range(len(path) - 1):
+                    if path[i]._count - 1 - path[i + 1]._count > \
+                            self._alpha * path[i]._count:
+                        self._helper_rebalance(path[i])
+                        break
+        return removed
+
+    def move(self, name: str, direction: str, steps: int) -> Optional[
+            Tuple[int, int]]:
+        """ Return the new location of the player named <name> after moving it
+        in the given <direction> by <steps> steps.
+        move name a direction for steps in self
+        Raise an OutOfBoundsError if this would move the player named
+        <name> out of bounds (before moving the player).
+
+        Raise an OutOfBoundsError if moving the player would place the player at
+        exactly the same coordinates of another player in the Tree (before
+        moving the player).
+
+        Runtime: O(log(n))
+
+        === Preconditions ===
+        direction in ['N', 'S', 'E', 'W']
+
+        === DocTests ===
+        >>> two = TwoDTree((0, 0), (500, 500))
+        >>> two.insert('1', (250, 250))
+        >>> two.insert('2', (350, 350))
+        >>> two.move('2', 'N', 100)
+        (350, 250)
+        >>> try:
+        ...     two.move('1', 'E', 100)
+        ... except OutOfBoundsError:
+        ...     print('Error')
+        Error
+        """
+        point = self._helper_find(name)
+        if point is not None:
+            return self.move_point(point, direction, steps)
+
+    def _helper_move_point(self, point: Tuple[int, int], direction: str,
+                           steps: int) -> List[str, Tuple[int, int]]:
+        """ _helper_move_point is helper move point.
+        It takes self point direction and steps and returns a list of
+        names to points.
+
+        === Preconditions ===
+        direction in ['N', 'S', 'E', 'W']
+        """
+        node = self._helper_node(point)
+        if node is not None:
+            if direction == 'N':
+                points = (point[0], point[1] - steps)
+            elif direction == 'S':
+                points = (point[0], point[1] + steps)
+            elif direction == 'W':
+                points = (point[0] - steps, point[1])
+            else:
+                points = (point[0] + steps, point[1])
+            return [node._name, points]
+        return None
+
+    def move_point(self, point: Tuple[int, int], direction: str, steps: int) ->\
+            Optional[Tuple[int, int]]:
+        """ Return the new location of the player at point <point> after moving
+        it in the given <direction> by <steps> steps.
+        move_point moves a point a direction for steps in self
+        Raise an OutOfBoundsError if this would move the player at point
+        <point> out of bounds (before moving the player).
+
+        Raise an OutOfBoundsError if moving the player would place the player at
+        exactly the same coordinates of another player in the Tree (before
+        moving the player).
+
+        Moving a point may require the tree to be reorganized. This method
+        should do the minimum amount of tree reorganization possible to move the
+        given point properly.
+
+        Runtime: O(log(n))
+
+        === Preconditions ===
+        direction in ['N', 'S', 'E', 'W']
+
+        === DocTests ===
+        >>> two = TwoDTree((0, 0), (500, 500))
+        >>> two.insert('1', (250, 250))
+        >>> two.insert('2', (350, 350))
+        >>> two.move_point((350, 350), 'N', 100)
+        (350, 250)
+        >>> try:
+        ...     two.move_point((250, 250), 'E', 100)
+        ... except OutOfBoundsError:
+        ...     print('Error')
+        Error
+        """
+        values = self._helper_move_point(point, direction, steps)
+        if values is not None:
+            self.insert(values[0], values[1])
+            self.remove_point(point)
+            return values[1]
+
+    def names_in_range(self, point: Tuple[int, int], direction: str,
+                       distance: int) -> List[str]:
+        """ Return a list of names of players whose location is in the
+        <direction> relative to <point> and whose location is within <distance>
+        along both the x and y axis.
+        names_in_range uses a point and searches in a direction for a certain
+        distance in self
+        For example: names_in_range((100, 100), 'SE', 10) should return the
+        names of all the players south east of (100, 100) and within 10 steps in
+        either direction. In other words, find all players whose location is in
+        the box with corners at: (100, 100) (110, 100) (100, 110) (110, 110)
+
+        Runtime: faster than O(n) when distance is small
+
+        === Preconditions ===
+        direction in ['NE', 'SE', 'NE', 'SW']
+
+        === DocTests ===
+        >>> two = TwoDTree((0, 0), (500, 500))
+        >>> two.insert('1', (250, 250))
+        >>> two.insert('2', (350, 350))
+        >>> two.names_in_range((500,500), 'NW', 500)
+        ['1', '2']
+        """
+        return [name for name, _ in self.iter_in_range(point, direction,
+                                                       distance)]
+
+    def iter_in_range(self, point: Tuple[int, int], direction: str,
+                      distance: int) -> Iterator[Tuple[str, Tuple[int, int]]]:
+        """ Yield the (name, location) of every player that
+        names_in_range(point, direction, distance) would name, in the same
+        order. iter_in_range streams the players in a box of self
+        The nodes are walked lazily, so a caller that stops early does not
+        walk the rest of the box.
+
+        Runtime: faster than O(n) when distance is small
+
+        === Preconditions ===
+        direction in ['NW', 'SE', 'NE', 'SW']
+
+        === DocTests ===
+        >>> two = TwoDTree((0, 0), (500, 500))
+        >>> two.insert('1', (250, 250))
+        >>> two.insert('2', (350, 350))
+        >>> next(two.iter_in_range((500, 500), 'NW', 500))
+        ('1', (250, 250))
+        """
+        return self._helper_iter_box(*self._helper_box(point, direction,
+                                                       distance))
+
+    def _helper_iter_box(self, xmin: int, xmas: int, ymin: int,
+                         ymax: int) -> Iterator[Tuple[str, Tuple[int, int]]]:
+        """ _helper_iter_box is helper iter box.
+        It takes self and the box from xmin to xmas and ymin to ymax, and
+        yields the name and point of the players inside the box.
+        Only the sides of the split line that the box crosses are searched. The
+        nodes still to visit are kept on a stack, in the order that recursing
+        would visit them. If self is counting, the walk is counted as a
+        names_in_range call once it ends or the caller stops early.
+        """
+        stack = self._helper_stack([self] if self._point is not None else [])
+        try:
+            while stack:
+                node = stack.pop()
+                x, y = node._point
+                if xmin <= x <= xmas and ymin <= y <= ymax:
+                    yield node._name, node._point
+                if node._split_type == 'x':
+                    low, high, split = xmin, xmas, x
+                else:
+                    low, high, split = ymin, ymax, y
+                if node._gt is not None and high > split:
+                    stack.append(node._gt)
+                if node._lt is not None and low <= split:
+                    stack.append(node._lt)
+        finally:
+            if isinstance(stack, _VisitStack) and self._stats is not None:
+                self._helper_record('names_in_range', stack.visits)
+
+    def items(self) -> Iterator[Tuple[str, Tuple[int, int]]]:
+        """ Yield the (name, location) of every player in this node and below
+        it, in preorder (node, _lt, _gt). items walks self lazily
+        The tree must not change while it is being iterated over.
+
+        Runtime: O(n) for all of them
+
+        === DocTests ===
+        >>> two = TwoDTree((0, 0), (500, 500))
+        >>> two.insert('1', (350, 350))
+        >>> two.insert('2', (250, 250))
+        >>> list(two.items())
+        [('1', (350, 350)), ('2', (250, 250))]
+        >>> list(two)
+        ['1', '2']
+        """
+        if self._point is None:
+            return
+        stack = [self]
+        while stack:
+            node = stack.pop()
+            yield node._name, node._point
+            if node._gt is not None:
+                stack.append(node._gt)
+            if node._lt is not None:
+                stack.append(node._lt)
+
+    def count_in_range(self, point: Tuple[int, int], direction: str,
+                       distance: int) -> int:
+        """ Return the number of players that names_in_range(point,
+        direction, distance) would name. count_in_range counts a box of self
+        The part of the field each node covers is worked out on the way down
+        from the corners, and a node whose part lies inside the box adds its
+        _count without being walked.
+
+        Runtime: O(sqrt(n)) plus the nodes along the edges of the box for a
+        balanced tree
+
+        === Preconditions ===
+        direction in ['NW', 'SE', 'NE', 'SW']
+        self is the root of its tree
+
+        === DocTests ===
+        >>> two = TwoDTree.from_points([(str(i), (i, i)) for i in range(100)],
+        ...                            (0, 0), (500, 500))
+        >>> two.count_in_range((10, 10), 'SE', 30)
+        31
+        >>> two.count_in_range((0, 0), 'SE', 500)
+        100
+        """
+        if self._point is None:
+            return 0
+        xmin, xmas, ymin, ymax = self._helper_box(point, direction, distance)
+        count = 0
+        stack = self._helper_stack([(self, self._nw[0], self._se[0],
+                                     self._nw[1], self._se[1])])
+        while stack:
+            node, left, right, top, bottom = stack.pop()
+            if xmin <= left and right <= xmas and ymin <= top and \
+                    bottom <= ymax:
+                count += node._count
+                continue
+            x, y = node._point
+            if xmin <= x <= xmas and ymin <= y <= ymax:
+                count += 1
+            if node._split_type == 'x':
+                if node._gt is not None and xmas > x:
+                    stack.append((node._gt, x + 1, right, top, bottom))
+                if node._lt is not None and xmin <= x:
+                    stack.append((node._lt, left, x, top, bottom))
+            else:
+                if node._gt is not None and ymax > y:
+                    stack.append((node._gt, left, right, y + 1, bottom))
+                if node._lt is not None and ymin <= y:
+                    stack.append((node._lt, left, right, top, y))
+        if self._stats is not None:
+            self._helper_record('count_in_range', stack.visits)
+        return count
+
+    def set_role(self, name: str, role: Optional[str]) -> None:
+        """ Tag the player named <name> with <role>, or take its tag away if
+        role is None. set_role tags a player in self
+        If the player is in the tree, the role counts of the nodes on the way
+        down to it are changed to match.
+
+        Runtime: O(log(n)) for a balanced tree
+
+        === Preconditions ===
+        self is the root of its tree
+
+        === DocTests ===
+        >>> two = TwoDTree((0, 0), (500, 500))
+        >>> two.insert('1', (250, 250))
+        >>> two.insert('2', (350, 350))
+        >>> two.set_role('2', 'it')
+        >>> two._role_counts, two._gt._role_counts
+        ({'it': 1}, {'it': 1})
+        """
+        old = self._roles.get(name)
+        if old == role:
+            return
+        if role is None:
+            del self._roles[name]
+        else:
+            self._roles[name] = role
+        point = self._index.get(name)
+        node = self
+        while point is not None and node is not None:
+            counts = Tree._helper_add_role(node._role_counts, old, -1)
+            node._role_counts = Tree._helper_add_role(counts, role, 1)
+            if node._point == point:
+                break
+            node = node._helper_child(point)
+
+    def count_roles_in_range(self, point: Tuple[int, int], direction: str,
+                             distance: int) -> Dict[str, int]:
+        """ Return how many of the players that names_in_range(point,
+        direction, distance) would name have each role, for the roles that
+        at least one of them has. count_roles_in_range counts roles in self
+        A node whose part of the field lies inside the box adds its
+        _role_counts without being walked, as in count_in_range.
+
+        Runtime: O(sqrt(n)) plus the nodes along the edges of the box for a
+        balanced tree
+
+        === Preconditions ===
+        direction in ['NW', 'SE', 'NE', 'SW']
+        self is the root of its tree
+
+        === DocTests ===
+        >>> two = TwoDTree.from_points([(str(i), (i, i)) for i in range(100)],
+        ...                            (0, 0), (500, 500))
+        >>> for i in range(100):
+        ...     two.set_role(str(i), 'it' if i == 0 else 'not-it')
+        >>> sorted(two.count_roles_in_range((0, 0), 'SE', 30).items())
+        [('it', 1), ('not-it', 30)]
+        >>> two.count_roles_in_range((50, 50), 'SE', 500)
+        {'not-it': 50}
+        """
+        counts = {}
+        if self._point is None:
+            return counts
+        xmin, xmas, ymin, ymax = self._helper_box(point, direction, distance)
+        stack = self._helper_stack([(self, self._nw[0], self._se[0],
+                                     self._nw[1], self._se[1])])
+        while stack:
+            node, left, right, top, bottom = stack.pop()
+            if xmin <= left and right <= xmas and ymin <= top and \
+                    bottom <= ymax:
+                Tree._helper_merge_roles(counts, node._role_counts)
+                continue
+            x, y = node._point
+            if xmin <= x <= xmas and ymin <= y <= ymax:
+                Tree._helper_add_role(counts, self._roles.get(node._name), 1)
+            if node._split_type == 'x':
+                if node._gt is not None and xmas > x:
+                    stack.append((node._gt, x + 1, right, top, bottom))
+                if node._lt is not None and xmin <= x:
+                    stack.append((node._lt, left, x, top, bottom))
+            else:
+                if node._gt is not None and ymax > y:
+                    stack.append((node._gt, left, right, y + 1, bottom))
+                if node._lt is not None and ymin <= y:
+                    stack.append((node._lt, left, right, top, y))
+        if self._stats is not None:
+            self._helper_record('count_roles_in_range', stack.visits)
+        return counts
+
+    def names_in_ranges(self, queries: List[Tuple[Tuple[int, int], str, int]]
+                        ) -> List[List[str]]:
+        """ Return, for each (point, direction, distance) query in <queries>,
+        the list of names that names_in_range(point, direction, distance) would
+        return. names_in_ranges answers many range queries at once in self
+        All of the queries are answered in one walk over the tree, so a node is
+        visited once no matter how many of the boxes reach it.
+
+        Runtime: faster than one names_in_range call per query
+
+        === Preconditions ===
+        every direction in queries is in ['NW', 'SE', 'NE', 'SW']
+
+        === DocTests ===
+        >>> two = TwoDTree((0, 0), (500, 500))
+        >>> two.insert('1', (250, 250))
+        >>> two.insert('2', (350, 350))
+        >>> two.names_in_ranges([((500, 500), 'NW', 500), ((0, 0), 'SE', 10)])
+        [['1', '2'], []]
+        """
+        boxes = [(i,) + self._helper_box(*query) for i, query in enumerate(
+            queries)]
+        results = [[] for _ in queries]
+        self._helper_names_in_boxes(boxes, results)
+        return results
+
+    def _helper_names_in_boxes(self, boxes: List[Tuple[int, int, int, int,
+                                                       int]],
+                               results: List[List[str]]) -> None:
+        """ _helper_names_in_boxes is helper names in boxes.
+        It takes self, boxes as (query number, smallest x, largest x, smallest
+        y, largest y) and adds the names inside each box to results at the
+        query number. Each side of the split only gets the boxes that cross
+        into it. If self is counting, the walk is counted as a names_in_ranges
+        call.
+        """
+        if self._point is None:
+            return None
+        stack = self._helper_stack([(self, boxes)])
+        while stack:
+            node, reaching = stack.pop()
+            if not reaching:
+                continue
+            x, y = node._point
+            for i, xmin, xmas, ymin, ymax in reaching:
+                if xmin <= x <= xmas and ymin <= y <= ymax:
+                    results[i].append(node._name)
+            if node._split_type == 'x':
+                low, high, split = 1, 2, x
+            else:
+                low, high, split = 3, 4, y
+            if node._gt is not None:
+                stack.append((node._gt, [box for box in reaching
+                                         if box[high] > split]))
+            if node._lt is not None:
+                stack.append((node._lt, [box for box in reaching
+                                         if box[low] <= split]))
+        if self._stats is not None:
+            self._helper_record('names_in_ranges', stack.visits)
+        return None
+
+    def nearest(self, point: Tuple[int, int], k: int = 1,
+                predicate: Optional[Callable[[str], bool]] = None) -> List[str]:
+        """ Return the names of the <k> players closest to <point>, closest
+        first. If <predicate> is given, only players whose name it returns
+        True for are counted. Fewer than k names are returned if there are not
+        enough players. nearest finds the closest players to point in self
+        Subtrees are searched closest first, using the part of the field on
+        their side of each split line, and the search stops once k players
+        are closer than every subtree that is left.
+
+        Runtime: O(log(n)) for a small k when most players pass predicate
+
+        === DocTests ===
+        >>> two = TwoDTree((0, 0), (500, 500))
+        >>> two.insert('1', (250, 250))
+        >>> two.insert('2', (350, 350))
+        >>> two.insert('3', (10, 10))
+        >>> two.nearest((330, 320), 2)
+        ['2', '1']
+        >>> two.nearest((330, 320), 1, {'1', '3'}.__contains__)
+        ['1']
+        """
+        result = []
+        order = 0
+        if self._nw is not None and self._se is not None:
+            bounds = (self._nw[0], self._se[0], self._nw[1], self._se[1])
+        else:
+            bounds = (-float('inf'), float('inf'), -float('inf'),
+                      float('inf'))
+        heap = [(self._helper_distance(point, bounds), order, None, self,
+                 bounds)]
+        while heap and len(result) < k:
+            _, _, name, node, bounds = heapq.heappop(heap)
+            if name is not None:
+                result.append(name)
+            elif node._point is not None:
+                if predicate is None or predicate(node._name):
+                    order += 1
+                    distance = self._helper_distance(
+                        point, (node._point[0], node._point[0],
+                                node._point[1], node._point[1]))
+                    heapq.heappush(heap, (distance, order, node._name, None,
+                                          None))
+                if node._split_type == 'x':
+                    lt_bounds = (bounds[0], node._point[0], bounds[2],
+                                 bounds[3])
+                    gt_bounds = (node._point[0], bounds[1], bounds[2],
+                                 bounds[3])
+                else:
+                    lt_bounds = (bounds[0], bounds[1], bounds[2],
+                                 node._point[1])
+                    gt_bounds = (bounds[0], bounds[1], node._point[1],
+                                 bounds[3])
+                for child, child_bounds in ((node._lt, lt_bounds),
+                                            (node._gt, gt_bounds)):
+                    if child is not None:
+                        order += 1
+                        heapq.heappush(heap, (self._helper_distance(
+                            point, child_bounds), order, None, child,
+                                              child_bounds))
+        return result
+
+    def enable_stats(self, enabled: bool = True) -> None:
+        """ Start counting the work done by the operations of this tree from
+        zero, or stop counting if <enabled> is False. enable_stats in self
+        Nodes never split or merge, so those counters stay 0. A rebuild, by
+        balance or because of _alpha, frees and makes again every node of the
+        subtree but its top one.
+
+        Runtime: O(1)
+
+        === Preconditions ===
+        self is the root of its tree
+
+        === DocTests ===
+        >>> two = TwoDTree((0, 0), (500, 500))
+        >>> two.enable_stats()
+        >>> for i in range(3):
+        ...     two.insert(str(i), (i, i))
+        >>> two.balance()
+        >>> stats = two.stats()
+        >>> stats['insert'], stats['insert_visits'], stats['rebuilds']
+        (3, 6, 1)
+        >>> stats['allocated'], stats['freed']
+        (4, 2)
+        >>> two.enable_stats(False)
+        >>> two.stats()
+        {}
+        """
+        self._stats = dict.fromkeys(Tree._STATS, 0) if enabled else None
+
+    def stats(self) -> Dict[str, int]:
+        """ Return a copy of the counters of this tree, or an empty dictionary
+        if it is not counting. stats reads the counters of self
+
+        Runtime: O(1)
+
+        === Preconditions ===
+        self is the root of its tree
+
+        === DocTests ===
+        >>> TwoDTree((0, 0), (500, 500)).stats()
+        {}
+        """
+        return {} if self._stats is None else dict(self._stats)
+
+    def reset_stats(self) -> None:
+        """ Set every counter of this tree back to 0, for example at the start
+        of every tick. reset_stats clears the counters of self
+        Nothing happens if the tree is not counting.
+
+        Runtime: O(1)
+
+        === Preconditions ===
+        self is the root of its tree
+
+        === DocTests ===
+        >>> two = TwoDTree((0, 0), (500, 500))
+        >>> two.enable_stats()
+        >>> two.names_in_range((0, 0), 'SE', 10)
+        []
+        >>> two.reset_stats()
+        >>> two.stats()['names_in_range']
+        0
+        """
+        if self._stats is not None:
+            self.enable_stats()
+
+    def bounds(self) -> Tuple[int, int, int, int]:
+        """ Return the smallest x, smallest y, largest x and largest y that a
+        player on this field can have. bounds
+
+        Runtime: O(1)
+
+        === Preconditions ===
+        self is the root of its tree
+
+        === DocTests ===
+        >>> TwoDTree((0, 0), (1000, 400)).bounds()
+        (0, 0, 1000, 400)
+        """
+        return self._nw[0], self._nw[1], self._se[0], self._se[1]
+
+    def size(self) -> int:
+        """ Return the number of nodes in <self>
+        Every node holds one player, so this is its _count, or 1 for the node
+        of an empty tree.
+
+        Runtime: O(1)
+
+        Preconditions
+
+        === DocTests ===
+        >>> two = TwoDTree((0, 0), (500, 500))
+        >>> two.size()
+        1
+        >>> two.insert('1', (250, 250))
+        >>> two.insert('2', (350, 350))
+        >>> two.size()
+        2
+        """
+        return self._count or 1
+
+    def height(self) -> int:
+        """ Return the height of <self>
+
+        Height is measured as the number of nodes in the path from the root of
+        this tree to the node at the greatest depth in this tree.
+
+        Runtime: O(n)
+
+        Preconditions
+
+        === DocTests ===
+        >>> two = TwoDTree((0, 0), (500, 500))
+        >>> two.insert('1', (250, 250))
+        >>> two.insert('2', (350, 350))
+        >>> two.height()
+        2
+        """
+        height = 0
+        stack = [(self, 1)]
+        while stack:
+            node, level = stack.pop()
+            if level > height:
+                height = level
+            if node._lt is not None:
+                stack.append((node._lt, level + 1))
+            if node._gt is not None:
+                stack.append((node._gt, level + 1))
+        return height
+
+    def depth(self, tree: TwoDTree) -> Optional[int]:
+        """ Return the depth of the subtree <tree> relative to <self>. Return
+        None if <tree> is not a descendant of <self>
+
+        Preconditions
+
+        Runtime: O(log(n))
+        === DocTests ===
+        >>> two = TwoDTree((0, 0), (500, 500))
+        >>> two.insert('1', (250, 250))
+        >>> two.insert('2', (350, 350))
+        >>> one = TwoDTree((0, 0), (250, 250))
+        >>> two.depth(one)
+        >>> two.depth(two._gt)
+        1
+        """
+        if tree.is_empty():
+            return None
+        count = 0
+        node = self
+        while node is not None and node._point is not None:
+            node = node._helper_child(tree._point)
+            count += 1
+            if node is tree:
+                return count
+        return None
+
+    def is_leaf(self) -> bool:
+        """ Return True if <self> has no children is_leaf
+
+        Runtime: O(1)
+
+        Preconditions
+
+        === DocTests ===
+        >>> two = TwoDTree((0, 0), (500, 500))
+        >>> two.insert('1', (250, 250))
+        >>> two.insert('2', (350, 350))
+        >>> two._gt.is_leaf()
+        True
+        >>> two.is_leaf()
+        False
+        """
+        return self._lt is None and self._gt is None
+
+    def is_empty(self) -> bool:
+        """ Return True if <self> or any of its descendants do not store any
+        information about the location of any players. is_empty
+
+        Runtime: O(1)
+
+        Preconditions
+
+        === DocTests ===
+        >>> two = TwoDTree((0, 0), (500, 500))
+        >>> two.insert('1', (250, 250))
+        >>> two.insert('2', (350, 350))
+        >>> two.is_empty()
+        False
+        """
+        return self._name is None and self._point is None and (
+            self._lt is None) and self._gt is None
+
+    def _helper_max(self, split: str, visited: Optional[List[int]] = None
+                    ) -> TwoDTree:
+        """ _helper_max is helper max.
+        It takes self and split which is a split type and returns the node in
+        self whose player is largest along split (the first one found if
+        players tie). If visited is given, visited[0] goes up by one for every
+        node looked at.
+        At nodes that split along split, everything in _lt is no larger than
+        the node and everything in _gt is larger, so only _gt is searched, or
+        nothing if there is no _gt. Both children are only searched at nodes
+        that split the other way, so only O(sqrt(n)) nodes of a balanced tree
+        of n players are looked at.
+
+        === Preconditions ===
+        split in ['x', 'y']
+        self is not empty
+
+        === DocTests ===
+        >>> two = TwoDTree.from_points([(str(i), (i, 10 - i)) for i in
+        ...                             range(10)], (0, 0), (500, 500))
+        >>> visited = [0]
+        >>> two._helper_max('x', visited)._point
+        (9, 1)
+        >>> visited
+        [4]
+        >>> two._helper_max('y')._point
+        (0, 10)
+        """
+        axis = 0 if split == 'x' else 1
+        best = None
+        stack = [self]
+        while stack:
+            node = stack.pop()
+            if visited is not None:
+                visited[0] += 1
+            if node._split_type == split:
+                if node._gt is not None:
+                    stack.append(node._gt)
+                    continue
+            else:
+                stack.extend(child for child in (node._gt, node._lt)
+                             if child is not None)
+            if best is None or node._point[axis] > best._point[axis]:
+                best = node
+        return best
+
+    def balance(self) -> None:
+        """ Balance <self> so that there is at most a difference of 1 between
+        the size of the _lt subtree and the size of the _gt subtree for all
+        trees in <self>. balance
+        The players are collected once and the tree is rebuilt around median
+        players, with self staying the root and keeping its split type.
+        A tree made with an alpha never needs this, since it rebuilds its own
+        lopsided subtrees as it goes.
+
+        Runtime: O(n log(n))
+
+        === Preconditions ===
+        It is possible to balance this tree
+
+        === DocTests ===
+        >>> two = TwoDTree((0, 0), (500, 500))
+        >>> two.insert('1', (250, 250))
+        >>> two.insert('2', (350, 350))
+        >>> two.insert('3', (300, 300))
+        >>> two._lt is None
+        True
+        >>> two.balance()
+        >>> two._lt is None
+        False
+        """
+        if self._point is not None:
+            self._helper_rebalance(self)
+
+
+class StaticTwoDTree(Tree):
+    """ StaticTwoDTree is a Two D Tree kept in flat arrays that is a subclass
+    of Tree. It is built for ticks where the field is searched much more often
+    than players move. The tree is rebuilt all at once from the players'
+    current points, balanced around medians, and its nodes are stored in
+    Eytzinger order: the root is at 0 and the children of the node at i are
+    at 2 * i + 1 (less than) and 2 * i + 2 (greater than), so no node needs
+    pointers and the top of the tree sits together in memory.
+    Players inserted or removed after a rebuild are not in the arrays.
+    Inserted players are kept in _pending and searched one by one, and
+    removed players are skipped because _points no longer has them at that
+    point. The tree is rebuilt by the first search that finds too many of
+    these changes, or by calling rebuild at the start of a tick.
+
+    === Attributes ===
+    _nw : the north-western corner of the field
+    _se : the south-eastern corner of the field
+    _xs : the x coordinates of the nodes, in Eytzinger order
+    _ys : the y coordinates of the nodes, in Eytzinger order
+    _names : the names of the nodes, in Eytzinger order (None where there is
+        no node)
+    _pending : a dictionary mapping the points of players inserted since the
+        last rebuild to their names
+    _stale : the number of players removed since the last rebuild
+    _points : a dictionary mapping the points of the players in this field to
+        their names
+    _index : a dictionary mapping the names of players in this field to their
+        points
+    _roles : a dictionary mapping the names of players to their role tags
+
+    === Representation Invariants ===
+    _xs, _ys and _names have the same length, which is one less than a power
+        of two.
+    A node at an even depth splits along x and one at an odd depth splits
+        along y. Nodes below the node at i on the less than side are before
+        it in (x, y) order (or (y, x) order for a y split), and nodes on the
+        greater than side are after it.
+    _points holds exactly the players stored in the field, and _index holds
+        their names.
+    A node in the arrays is a stored player exactly when its point is not in
+        _pending and _points has it at that point.
+
+    === DocTests ===
+    >>> two = StaticTwoDTree((0, 0), (500, 500))
+    >>> for name, point in [('1', (250, 250)), ('2', (350, 350)),
+    ...                     ('3', (300, 300))]:
+    ...     two.insert(name, point)
+    >>> two.rebuild()
+    >>> two._names
+    ['3', '1', '2']
+    >>> two._pending
+    {}
+    """
+    __slots__ = ('_nw', '_se', '_xs', '_ys', '_names', '_pending', '_stale',
+                 '_points', '_index', '_roles')
+    _nw: Tuple[int, int]
+    _se: Tuple[int, int]
+    _xs: array
+    _ys: array
+    _names: List[Optional[str]]
+    _pending: Dict[Tuple[int, int], str]
+    _stale: int
+    _points: Dict[Tuple[int, int], str]
+    _index: Dict[str, Tuple[int, int]]
+    _roles: Dict[str, str]
+
+    def __init__(self, nw: Tuple[int, int], se: Tuple[int, int]) -> None:
+        """Initialize a new empty Tree instance in self with nw and se corners.
+
+        Runtime: O(1)
+
+        === Preconditions ===
+        nw[0] < se[0] and nw[1] < se[1]
+
+        === DocTests ===
+        >>> two = StaticTwoDTree((0, 0), (500, 500))
+        >>> two.is_empty()
+        True
+        """
+        self._nw = nw
+        self._se = se
+        self._xs = array('l')
+        self._ys = array('l')
+        self._names = []
+        self._pending = {}
+        self._stale = 0
+        self._points = {}
+        self._index = {}
+        self._roles = {}
+
+    def rebuild(self) -> None:
+        """ Rebuild the arrays of <self> from the current points of its
+        players, so that no change since the last rebuild is left over.
+        rebuild is meant to be called at the start of a tick
+        The players are sorted by (x, y) and by (y, x) once, and both orders
+        are kept while they are split around each median. Points are never
+        equal, so the median splits them exactly in half and the tree is as
+        short as it can be.
+
+        Runtime: O(n log(n))
+
+        === DocTests ===
+        >>> two = StaticTwoDTree((0, 0), (500, 500))
+        >>> for i in range(4):
+        ...     two.insert(str(i), (i * 100, 400 - i * 100))
+        >>> two.rebuild()
+        >>> two._names
+        ['2', '0', '3', '1', None, None, None]
+        """
+        players = [(x, y, name) for (x, y), name in self._points.items()]
+        size = (1 << len(players).bit_length()) - 1
+        self._xs = array('l', [0]) * size
+        self._ys = array('l', [0]) * size
+        self._names = [None] * size
+        self._pending = {}
+        self._stale = 0
+        if not players:
+            return None
+        stack = [(0, sorted(players), sorted(
+            players, key=lambda player: (player[1], player[0])), 0)]
+        while stack:
+            i, by_x, by_y, axis = stack.pop()
+            ordered, others = (by_x, by_y) if axis == 0 else (by_y, by_x)
+            middle = len(ordered) // 2
+            x, y, name = ordered[middle]
+            self._xs[i], self._ys[i], self._names[i] = x, y, name
+            if axis == 0:
+                lower = [player for player in others if player[0] < x or (
+                    player[0] == x and player[1] < y)]
+                higher = [player for player in others if player[0] > x or (
+                    player[0] == x and player[1] > y)]
+                sides = [(ordered[:middle], lower),
+                         (ordered[middle + 1:], higher)]
+            else:
+                lower = [player for player in others if player[1] < y or (
+                    player[1] == y and player[0] < x)]
+                higher = [player for player in others if player[1] > y or (
+                    player[1] == y and player[0] > x)]
+                sides = [(lower, ordered[:middle]),
+                         (higher, ordered[middle + 1:])]
+            for child, (xs, ys) in zip((2 * i + 1, 2 * i + 2), sides):
+                if xs:
+                    stack.append((child, xs, ys, 1 - axis))
+        return None
+
+    def _helper_fresh(self) -> None:
+        """ _helper_fresh is helper fresh.
+        It takes self and rebuilds it if more players have been inserted or
+        removed since the last rebuild than a sixteenth of the players, so
+        that searching _pending and skipping removed nodes stays cheap.
+        """
+        if len(self._pending) + self._stale > len(self._points) // 16 + 16:
+            self.rebuild()
+
+    def __contains__(self, name: str) -> bool:
+        """ Return True if a player named <name> is stored in this tree.
+        __contains__ checks if name is contained in self
+
+        Runtime: O(1)
+
+        === DocTests ===
+        >>> two = StaticTwoDTree((0, 0), (500, 500))
+        >>> two.insert('1', (250, 250))
+        >>> '1' in two
+        True
+        >>> '2' in two
+        False
+        """
+        return name in self._index
+
+    def contains_point(self, point: Tuple[int, int]) -> bool:
+        """ Return True if a player at location <point> is stored in this tree.
+        contains_point checks if point is in self
+
+        Runtime: O(1)
+
+        === DocTests ===
+        >>> two = StaticTwoDTree((0, 0), (500, 500))
+        >>> two.insert('1', (250, 250))
+        >>> two.contains_point((250, 250))
+        True
+        >>> two.contains_point((250, 251))
+        False
+        """
+        return point in self._points
+
+    def insert(self, name: str, point: Tuple[int, int]) -> None:
+        """Insert a player named <name> into this tree at point <point>.
+        insert a point and name into self
+        Raise an OutOfBoundsError if <point> is out of bounds.
+
+        Raise an OutOfBoundsError if moving the player would place the player at
+        exactly the same coordinates of another player in the Tree (before
+        moving the player).
+
+        Runtime: O(1), the player waits in _pending until the next rebuild
+
+        === DocTests ===
+        >>> two = StaticTwoDTree((0, 0), (500, 500))
+        >>> two.insert('1', (250, 250))
+        >>> two._pending
+        {(250, 250): '1'}
+        >>> try:
+        ...     two.insert('2', (250, 250))
+        ... except OutOfBoundsError:
+        ...     print('Error')
+        Error
+        """
+        if not (self._nw[0] <= point[0] <= self._se[0] and
+                self._nw[1] <= point[1] <= self._se[1]):
+            raise OutOfBoundsError
+        if point in self._points:
+            raise OutOfBoundsError
+        self._points[point] = name
+        self._index[name] = point
+        self._pending[point] = name
+
+    def remove(self, name: str) -> None:
+        """ Remove information about a player named <name> from this tree.
+        remove a name from self
+
+        Runtime: O(1)
+
+        === DocTests ===
+        >>> two = StaticTwoDTree((0, 0), (500, 500))
+        >>> two.insert('1', (250, 250))
+        >>> two.remove('1')
+        >>> '1' in two
+        False
+        """
+        if name in self._index:
+            self.remove_point(self._index[name])
+
+    def remove_point(self, point: Tuple[int, int]) -> None:
+        """ Remove information about a player at point <point> from this tree.
+        remove_point removes a point in self
+        The player's node stays in the arrays until the next rebuild, but is
+        skipped by searches because _points no longer has it there.
+
+        Runtime: O(1)
+
+        === DocTests ===
+        >>> two = StaticTwoDTree((0, 0), (500, 500))
+        >>> two.insert('1', (250, 250))
+        >>> two.rebuild()
+        >>> two.remove_point((250, 250))
+        >>> two.contains_point((250, 250)), two._names, two._stale
+        (False, ['1'], 1)
+        """
+        name = self._points.pop(point, None)
+        if name is None:
+            return None
+        if self._index.get(name) == point:
+            del self._index[name]
+        if point in self._pending:
+            del self._pending[point]
+        else:
+            self._stale += 1
+        return None
+
+    def move(self, name: str, direction: str, steps: int) -> Optional[
+            Tuple[int, int]]:
+        """ Return the new location of the player named <name> after moving it
+        in the given <direction> by <steps> steps.
+        move a name a direction by steps in self
+        Raise an OutOfBoundsError if this would move the player named
+        <name> out of bounds (before moving the player).
+
+        Raise an OutOfBoundsError if moving the player would place the player at
+        exactly the same coordinates of another player in the Tree (before
+        moving the player).
+
+        Runtime: O(1)
+
+        === Preconditions ===
+        direction in ['N', 'S', 'E', 'W']
+
+        === DocTests ===
+        >>> two = StaticTwoDTree((0, 0), (500, 500))
+        >>> two.insert('1', (250, 250))
+        >>> two.insert('2', (350, 350))
+        >>> two.move('2', 'N', 100)
+        (350, 250)
+        >>> try:
+        ...     two.move('1', 'E', 100)
+        ... except OutOfBoundsError:
+        ...     print('Error')
+        Error
+        """
+        if name in self._index:
+            return self.move_point(self._index[name], direction, steps)
+
+    def move_point(self, point: Tuple[int, int], direction: str, steps: int) ->\
+            Optional[Tuple[int, int]]:
+        """ Return the new location of the player at point <point> after moving
+        it in the given <direction> by <steps> steps.
+        move_point moves a point in direction by steps in self
+        Raise an OutOfBoundsError if this would move the player at point
+        <point> out of bounds (before moving the player).
+
+        Raise an OutOfBoundsError if moving the player would place the player at
+        exactly the same coordinates of another player in the Tree (before
+        moving the player).
+
+        Runtime: O(1)
+
+        === Preconditions ===
+        direction in ['N', 'S', 'E', 'W']
+
+        === DocTests ===
+        >>> two = StaticTwoDTree((0, 0), (500, 500))
+        >>> two.insert('1', (250, 250))
+        >>> two.insert('2', (350, 350))
+        >>> two.move_point((350, 350), 'N', 100)
+        (350, 250)
+        >>> try:
+        ...     two.move_point((250, 250), 'E', 100)
+        ... except OutOfBoundsError:
+        ...     print('Error')
+        Error
+        """
+        if point not in self._points:
+            return None
+        if direction == 'N':
+            new_point = (point[0], point[1] - steps)
+        elif direction == 'S':
+            new_point = (point[0], point[1] + steps)
+        elif direction == 'W':
+            new_point = (point[0] - steps, point[1])
+        else:
+            new_point = (point[0] + steps, point[1])
+        self.insert(self._points[point], new_point)
+        self.remove_point(point)
+        return new_point
+
+    def names_in_range(self, point: Tuple[int, int], direction: str,
+                       distance: int) -> List[str]:
+        """ Return a list of names of players whose location is in the
+        <direction> relative to <point> and whose location is within <distance>
+        along both the x and y axis.
+        names_in_range searches in direction from point for distance in self
+        The arrays are walked with a stack of positions, only going to the
+        sides of each split that the box reaches, and then the players in
+        _pending are checked one by one.
+
+        Runtime: O(sqrt(n) + k) for k names found, while _pending is small
+
+        === Preconditions ===
+        direction in ['NW', 'SE', 'NE', 'SW']
+
+        === DocTests ===
+        >>> two = StaticTwoDTree((0, 0), (500, 500))
+        >>> two.insert('1', (250, 250))
+        >>> two.insert('2', (350, 350))
+        >>> two.rebuild()
+        >>> two.insert('3', (260, 260))
+        >>> two.names_in_range((200, 200), 'SE', 100)
+        ['1', '3']
+        >>> two.names_in_range((400, 400), 'NW', 50)
+        ['2']
+        """
+        self._helper_fresh()
+        xmin, xmas, ymin, ymax = self._helper_box(point, direction, distance)
+        xs, ys, names = self._xs, self._ys, self._names
+        size = len(names)
+        changed = self._pending or self._stale
+        result = []
+        stack = [(0, 0)] if size and names[0] is not None else []
+        while stack:
+            i, axis = stack.pop()
+            x, y = xs[i], ys[i]
+            if xmin <= x <= xmas and ymin <= y <= ymax:
+                name = names[i]
+                if not changed or ((x, y) not in self._pending and
+                                   self._points.get((x, y)) == name):
+                    result.append(name)
+            if axis == 0:
+                low, high, split = xmin, xmas, x
+            else:
+                low, high, split = ymin, ymax, y
+            child = 2 * i + 1
+            if child + 1 < size and high >= split and names[
+                    child + 1] is not None:
+                stack.append((child + 1, 1 - axis))
+            if child < size and low <= split and names[child] is not None:
+                stack.append((child, 1 - axis))
+        for (x, y), name in self._pending.items():
+            if xmin <= x <= xmas and ymin <= y <= ymax:
+                result.append(name)
+        return result
+
+    def names_in_ranges(self, queries: List[Tuple[Tuple[int, int], str, int]]
+                        ) -> List[List[str]]:
+        """ Return, for each (point, direction, distance) query in <queries>,
+        the list of names that names_in_range(point, direction, distance) would
+        return. names_in_ranges answers many range queries at once in self
+
+        Runtime: one names_in_range call per query
+
+        === Preconditions ===
+        every direction in queries is in ['NW', 'SE', 'NE', 'SW']
+
+        === DocTests ===
+        >>> two = StaticTwoDTree((0, 0), (500, 500))
+        >>> two.insert('1', (250, 250))
+        >>> two.insert('2', (350, 350))
+        >>> two.names_in_ranges([((200, 200), 'SE', 50), ((0, 0), 'SE', 10)])
+        [['1'], []]
+        """
+        return [self.names_in_range(*query) for query in queries]
+
+    def nearest(self, point: Tuple[int, int], k: int = 1,
+                predicate: Optional[Callable[[str], bool]] = None) -> List[str]:
+        """ Return the names of the <k> players closest to <point>, closest
+        first. If <predicate> is given, only players whose name it returns
+        True for are counted. Fewer than k names are returned if there are not
+        enough players. nearest finds the closest players to point in self
+        Subtrees are searched closest first, using the part of the field on
+        their side of each split line, and the players in _pending are
+        searched alongside them.
+
+        Runtime: O(log(n)) for a small k when most players pass predicate
+
+        === DocTests ===
+        >>> two = StaticTwoDTree((0, 0), (500, 500))
+        >>> two.insert('1', (250, 250))
+        >>> two.insert('2', (350, 350))
+        >>> two.insert('3', (10, 10))
+        >>> two.nearest((330, 320), 2)
+        ['2', '1']
+        >>> two.nearest((330, 320), 1, {'1', '3'}.__contains__)
+        ['1']
+        """
+        self._helper_fresh()
+        xs, ys, names = self._xs, self._ys, self._names
+        size = len(names)
+        changed = self._pending or self._stale
+        result = []
+        order = 0
+        heap = []
+        for there, name in self._pending.items():
+            if predicate is None or predicate(name):
+                order += 1
+                heap.append((self._helper_distance(
+                    point, (there[0], there[0], there[1], there[1])), order,
+                             name, -1, 0, None))
+        if size and names[0] is not None:
+            bounds = (self._nw[0], self._se[0], self._nw[1], self._se[1])
+            heap.append((self._helper_distance(point, bounds), 0, None, 0, 0,
+                         bounds))
+        heapq.heapify(heap)
+        while heap and len(result) < k:
+            _, _, name, i, axis, bounds = heapq.heappop(heap)
+            if name is not None:
+                result.append(name)
+                continue
+            x, y, name = xs[i], ys[i], names[i]
+            fresh = not changed or ((x, y) not in self._pending and
+                                    self._points.get((x, y)) == name)
+            if fresh and (predicate is None or predicate(name)):
+                order += 1
+                heapq.heappush(heap, (self._helper_distance(
+                    point, (x, x, y, y)), order, name, -1, 0, None))
+            if axis == 0:
+                sides = [(bounds[0], x, bounds[2], bounds[3]),
+                         (x, bounds[1], bounds[2], bounds[3])]
+            else:
+                sides = [(bounds[0], bounds[1], bounds[2], y),
+                         (bounds[0], bounds[1], y, bounds[3])]
+            for child, child_bounds in zip((2 * i + 1, 2 * i + 2), sides):
+                if child < size and names[child] is not None:
+                    order += 1
+                    heapq.heappush(heap, (self._helper_distance(
+                        point, child_bounds), order, None, child, 1 - axis,
+                                          child_bounds))
+        return result
+
+    def bounds(self) -> Tuple[int, int, int, int]:
+        """ Return the smallest x, smallest y, largest x and largest y that a
+        player on this field can have. bounds
+
+        Runtime: O(1)
+
+        === DocTests ===
+        >>> StaticTwoDTree((0, 0), (1000, 400)).bounds()
+        (0, 0, 1000, 400)
+        """
+        return self._nw[0], self._nw[1], self._se[0], self._se[1]
+
+    def size(self) -> int:
+        """ Return the number of nodes in <self>
+        The field is one node and every player is another, unless there is at
+        most one player, in which case the field is a leaf.
+
+        Runtime: O(1)
+
+        === DocTests ===
+        >>> two = StaticTwoDTree((0, 0), (500, 500))
+        >>> two.size()
+        1
+        >>> two.insert('1', (250, 250))
+        >>> two.insert('2', (350, 350))
+        >>> two.size()
+        3
+        """
+        if self.is_leaf():
+            return 1
+        return 1 + len(self._points)
+
+    def height(self) -> int:
+        """ Return the height of <self>
+        The field is the root and its players are leaves, so the height is 1
+        while the field is a leaf and 2 after that.
+
+        Runtime: O(1)
+
+        === DocTests ===
+        >>> two = StaticTwoDTree((0, 0), (500, 500))
+        >>> two.insert('1', (250, 250))
+        >>> two.height()
+        1
+        >>> two.insert('2', (350, 350))
+        >>> two.height()
+        2
+        """
+        if self.is_leaf():
+            return 1
+        return 2
+
+    def depth(self, tree: Tree) -> Optional[int]:
+        """ Return the depth of the subtree <tree> relative to <self>. Return
+        None if <tree> is not a descendant of <self>
+        The nodes of a StaticTwoDTree are places in its arrays, not Trees, so
+        no Tree is ever a descendant of it and this is always None.
+
+        Runtime: O(1)
+
+        === DocTests ===
+        >>> two = StaticTwoDTree((0, 0), (500, 500))
+        >>> two.depth(two) is None
+        True
+        """
+        return None
+
+    def is_leaf(self) -> bool:
+        """ Return True if <self> has no children. is_leaf
+        A field with at most one player has nothing below it.
+
+        Runtime: O(1)
+
+        === DocTests ===
+        >>> two = StaticTwoDTree((0, 0), (500, 500))
+        >>> two.insert('1', (250, 250))
+        >>> two.is_leaf()
+        True
+        >>> two.insert('2', (350, 350))
+        >>> two.is_leaf()
+        False
+        """
+        return len(self._points) <= 1
+
+    def is_empty(self) -> bool:
+        """ Return True if <self> or any of its descendants do not store any
+        information about the location of any players. is_empty
+
+        Runtime: O(1)
+
+        === DocTests ===
+        >>> two = StaticTwoDTree((0, 0), (500, 500))
+        >>> two.is_empty()
+        True
+        >>> two.insert('1', (250, 250))
+        >>> two.is_empty()
+        False
+        """
+        return not self._points
+
+
+class GridField(Tree):
+    """ GridField is a uniform grid field that is a subclass of Tree.
+    It cuts a rectangular field into square cells of the same size and keeps
+    the players of each cell together, so finding, adding and removing a
+    player only looks at one cell and a small range search only looks at the
+    cells the range covers.
+    Seen as a tree, the field is the root and every cell with a player in it
+    is a leaf below the root.
+
+    === Attributes ===
+    _nw : the north-western corner of this field
+    _se : the south-eastern corner of this field
+    _cell_size : the width and height of every cell
+    _cells : a dictionary mapping the (column, row) of every cell with a
+        player in it to a dictionary mapping the points in that cell to the
+        names of the players at them
+    _index : a dictionary mapping the names of players in this field to their
+        points
+    _roles : a dictionary mapping the names of players to their role tags
+
+    === Representation Invariants ===
+    _cell_size > 0
+    A point (x, y) is in the cell (x // _cell_size, y // _cell_size).
+    No cell in _cells is empty.
+    _index holds exactly the players stored in _cells.
+
+    === DocTests ===
+    >>> grid = GridField((0, 0), (500, 500), 10)
+    >>> grid._nw == (0, 0) and grid._se == (500, 500)
+    True
+    >>> grid._cell_size
+    10
+    >>> grid._cells == {} and grid._index == {}
+    True
+    """
+    __slots__ = ('_nw', '_se', '_cell_size', '_cells', '_index', '_roles')
+    _nw: Tuple[int, int]
+    _se: Tuple[int, int]
+    _cell_size: int
+    _cells: Dict[Tuple[int, int], Dict[Tuple[int, int], str]]
+    _index: Dict[str, Tuple[int, int]]
+    _roles: Dict[str, str]
+
+    def __init__(self, nw: Tuple[int, int], se: Tuple[int, int],
+                 cell_size: int = 10) -> None:
+        """Initialize a new empty field in self with nw and se corners cut
+        into cells of cell_size by cell_size.
+
+        Runtime: O(1)
+
+        === Preconditions ===
+        nw[0] < se[0] and nw[1] < se[1]
+        cell_size > 0
+
+        === DocTests ===
+        >>> grid = GridField((0, 0), (500, 500))
+        >>> grid._cell_size
+        10
+        >>> grid.is_empty()
+        True
+        """
+        self._nw = nw
+        self._se = se
+        self._cell_size = cell_size
+        self._cells = {}
+        self._index = {}
+        self._roles = {}
+
+    def _helper_cell(self, point: Tuple[int, int]) -> Tuple[int, int]:
+        """ _helper_cell is helper cell.
+        It takes self and point and returns the (column, row) of the cell that
+        point is in.
+        """
+        return point[0] // self._cell_size, point[1] // self._cell_size
+
+    def __contains__(self, name: str) -> bool:
+        """ Return True if a player named <name> is stored in this field.
+        __contains__ checks if name is contained in self
+
+        Runtime: O(1)
+
+        === DocTests ===
+        >>> grid = GridField((0, 0), (500, 500))
+        >>> grid.insert('1', (250, 250))
+        >>> '1' in grid
+        True
+        >>> '2' in grid
+        False
+        """
+        return name in self._index
+
+    def contains_point(self, point: Tuple[int, int]) -> bool:
+        """ Return True if a player at location <point> is stored in this field.
+        contains_point checks if point is in self
+
+        Runtime: O(1)
+
+        === DocTests ===
+        >>> grid = GridField((0, 0), (500, 500))
+        >>> grid.insert('1', (250, 250))
+        >>> grid.contains_point((250, 250))
+        True
+        >>> grid.contains_point((251, 250))
+        False
+        """
+        return point in self._cells.get(self._helper_cell(point), {})
+
+    def insert(self, name: str, point: Tuple[int, int]) -> None:
+        """Insert a player named <name> into this field at point <point>.
+        insert a point and name into self
+        Raise an OutOfBoundsError if <point> is out of bounds.
+
+        Raise an OutOfBoundsError if moving the player would place the player at
+        exactly the same coordinates of another player in the Tree (before
+        moving the player).
+
+        Runtime: O(1)
+
+        === DocTests ===
+        >>> grid = GridField((0, 0), (500, 500))
+        >>> grid.insert('1', (250, 250))
+        >>> grid._cells
+        {(25, 25): {(250, 250): '1'}}
+        >>> try:
+        ...     grid.insert('2', (501, 250))
+        ... except OutOfBoundsError:
+        ...     print('Error')
+        Error
+        """
+        if not (self._nw[0] <= point[0] <= self._se[0] and
+                self._nw[1] <= point[1] <= self._se[1]):
+            raise OutOfBoundsError
+        cell = self._cells.setdefault(self._helper_cell(point), {})
+        if point in cell:
+            raise OutOfBoundsError
+        cell[point] = name
+        self._index[name] = point
+
+    def remove(self, name: str) -> None:
+        """ Remove information about a player named <name> from this field.
+        remove a name from self
+
+        Runtime: O(1)
+
+        === DocTests ===
+        >>> grid = GridField((0, 0), (500, 500))
+        >>> grid.insert('1', (250, 250))
+        >>> grid.remove('1')
+        >>> '1' in grid
+        False
+        """
+        if name in self._index:
+            self.remove_point(self._index[name])
+
+    def remove_point(self, point: Tuple[int, int]) -> None:
+        """ Remove information about a player at point <point> from this field.
+        remove_point removes a point in self
+
+        Runtime: O(1)
+
+        === DocTests ===
+        >>> grid = GridField((0, 0), (500, 500))
+        >>> grid.insert('1', (250, 250))
+        >>> grid.remove_point((250, 250))
+        >>> grid.contains_point((250, 250))
+        False
+        >>> grid._cells
+        {}
+        """
+        key = self._helper_cell(point)
+        cell = self._cells.get(key)
+        if cell is not None and point in cell:
+            name = cell.pop(point)
+            if not cell:
+                del self._cells[key]
+            if self._index.get(name) == point:
+                del self._index[name]
+
+    def move(self, name: str, direction: str, steps: int) -> Optional[
+            Tuple[int, int]]:
+        """ Return the new location of the player named <name> after moving it
+        in the given <direction> by <steps> steps.
+        move name a direction for steps in self
+        Raise an OutOfBoundsError if this would move the player named
+        <name> out of bounds (before moving the player).
+
+        Raise an OutOfBoundsError if moving the player would place the player at
+        exactly the same coordinates of another player in the Tree (before
+        moving the player).
+
+        Runtime: O(1)
+
+        === Preconditions ===
+        direction in ['N', 'S', 'E', 'W']
+
+        === DocTests ===
+        >>> grid = GridField((0, 0), (500, 500))
+        >>> grid.insert('1', (250, 250))
+        >>> grid.insert('2', (350, 350))
+        >>> grid.move('2', 'N', 100)
+        (350, 250)
+        >>> try:
+        ...     grid.move('1', 'E', 100)
+        ... except OutOfBoundsError:
+        ...     print('Error')
+        Error
+        """
+        if name in self._index:
+            return self.move_point(self._index[name], direction, steps)
+
+    def move_point(self, point: Tuple[int, int], direction: str, steps: int) ->\
+            Optional[Tuple[int, int]]:
+        """ Return the new location of the player at point <point> after moving
+        it in the given <direction> by <steps> steps.
+        move_point moves a point a direction for steps in self
+        Raise an OutOfBoundsError if this would move the player at point
+        <point> out of bounds (before moving the player).
+
+        Raise an OutOfBoundsError if moving the player would place the player at
+        exactly the same coordinates of another player in the Tree (before
+        moving the player).
+
+        Moving a point only changes the one or two cells it leaves and enters.
+
+        Runtime: O(1)
+
+        === Preconditions ===
+        direction in ['N', 'S', 'E', 'W']
+
+        === DocTests ===
+        >>> grid = GridField((0, 0), (500, 500))
+        >>> grid.insert('1', (250, 250))
+        >>> grid.insert('2', (350, 350))
+        >>> grid.move_point((350, 350), 'N', 100)
+        (350, 250)
+        >>> try:
+        ...     grid.move_point((250, 250), 'E', 100)
+        ... except OutOfBoundsError:
+        ...     print('Error')
+        Error
+        """
+        name = self._cells.get(self._helper_cell(point), {}).get(point)
+        if name is not None:
+            if direction == 'N':
+                new_point = (point[0], point[1] - steps)
+            elif direction == 'S':
+                new_point = (point[0], point[1] + steps)
+            elif direction == 'W':
+                new_point = (point[0] - steps, point[1])
+            else:
+                new_point = (point[0] + steps, point[1])
+            self.insert(name, new_point)
+            self.remove_point(point)
+            return new_point
+
+    def names_in_range(self, point: Tuple[int, int], direction: str,
+                       distance: int) -> List[str]:
+        """ Return a list of names of players whose location is in the
+        <direction> relative to <point> and whose location is within <distance>
+        along both the x and y axis.
+        names_in_range searches in direction from point for distance in self
+        Only the cells that the box covers are looked at.
+
+        Runtime: O(cells covered + players in them)
+
+        === Preconditions ===
+        direction in ['NW', 'SE', 'NE', 'SW']
+
+        === DocTests ===
+        >>> grid = GridField((0, 0), (500, 500))
+        >>> grid.insert('1', (250, 250))
+        >>> grid.insert('2', (350, 350))
+        >>> grid.names_in_range((200, 200), 'SE', 50)
+        ['1']
+        >>> sorted(grid.names_in_range((400, 400), 'NW', 150))
+        ['1', '2']
+        """
+        result = []
+        self._helper_names_in_box(*self._helper_box(point, direction, distance),
+                                  result)
+        return result
+
+    def _helper_names_in_box(self, xmin: int, xmas: int, ymin: int,
+                             ymax: int, result: List[str]) -> None:
+        """ _helper_names_in_box is helper names in box.
+        It takes self and the smallest x, largest x, smallest y and largest y
+        of a box and adds the names of the players inside the box to result.
+        If the box covers more cells than there are cells with players in
+        them, those cells are looked at instead.
+        """
+        low = self._helper_cell((max(xmin, self._nw[0]),
+                                 max(ymin, self._nw[1])))
+        high = self._helper_cell((min(xmas, self._se[0]),
+                                  min(ymax, self._se[1])))
+        if (high[0] - low[0] + 1) * (high[1] - low[1] + 1) > len(self._cells):
+            for (column, row), cell in self._cells.items():
+                if low[0] <= column <= high[0] and low[1] <= row <= high[1]:
+                    for (x, y), name in cell.items():
+                        if xmin <= x <= xmas and ymin <= y <= ymax:
+                            result.append(name)
+            return
+        for column in range(low[0], high[0] + 1):
+            for row in range(low[1], high[1] + 1):
+                cell = self._cells.get((column, row))
+                if cell is not None:
+                    for (x, y), name in cell.items():
+                        if xmin <= x <= xmas and ymin <= y <= ymax:
+                            result.append(name)
+
+    def names_in_ranges(self, queries: List[Tuple[Tuple[int, int], str, int]]
+                        ) -> List[List[str]]:
+        """ Return, for each (point, direction, distance) query in <queries>,
+        the list of names that names_in_range(point, direction, distance) would
+        return. names_in_ranges answers many range queries at once in self
+        Every query only looks at its own cells, so they are answered one
+        after another.
+
+        Runtime: O(cells covered + players in them) for each query
+
+        === Preconditions ===
+        every direction in queries is in ['NW', 'SE', 'NE', 'SW']
+
+        === DocTests ===
+        >>> grid = GridField((0, 0), (500, 500))
+        >>> grid.insert('1', (250, 250))
+        >>> grid.insert('2', (350, 350))
+        >>> grid.names_in_ranges([((200, 200), 'SE', 50), ((0, 0), 'SE', 10)])
+        [['1'], []]
+        """
+        return [self.names_in_range(point, direction, distance) for
+                point, direction, distance in queries]
+
+    def nearest(self, point: Tuple[int, int], k: int = 1,
+                predicate: Optional[Callable[[str], bool]] = None) -> List[str]:
+        """ Return the names of the <k> players closest to <point>, closest
+        first. If <predicate> is given, only players whose name it returns
+        True for are counted. Fewer than k names are returned if there are not
+        enough players. nearest finds the closest players to point in self
+        Rings of cells around the cell of point are searched one at a time
+        and the search stops once k players are closer than the next ring or
+        every cell with a player in it has been searched. Once the rings
+        cover more cells than there are cells with players in them, the
+        cells with players in them that are left are looked at instead.
+
+        Runtime: O(min(cells searched, cells with players) + players in them)
+
+        === DocTests ===
+        >>> grid = GridField((0, 0), (500, 500))
+        >>> grid.insert('1', (250, 250))
+        >>> grid.insert('2', (350, 350))
+        >>> grid.insert('3', (10, 10))
+        >>> grid.nearest((330, 320), 2)
+        ['2', '1']
+        >>> grid.nearest((330, 320), 1, {'1', '3'}.__contains__)
+        ['1']
+        """
+        found = []
+        centre = self._helper_cell(point)
+        low = self._helper_cell(self._nw)
+        high = self._helper_cell(self._se)
+        most = max(centre[0] - low[0], high[0] - centre[0],
+                   centre[1] - low[1], high[1] - centre[1])
+        ring = 0
+        checked = 0
+        while ring <= most and checked < len(self._cells):
+            if (2 * ring + 1) ** 2 > len(self._cells):
+                for (column, row), cell in self._cells.items():
+                    if max(abs(column - centre[0]),
+                           abs(row - centre[1])) >= ring:
+                        self._helper_nearest_cell(point, cell, predicate,
+                                                  found)
+                found.sort()
+                del found[k:]
+                break
+            for column in range(centre[0] - ring, centre[0] + ring + 1):
+                edge = column in (centre[0] - ring, centre[0] + ring)
+                for row in range(centre[1] - ring, centre[1] + ring + 1,
+                                 1 if edge else 2 * ring):
+                    cell = self._cells.get((column, row))
+                    if cell is not None:
+                        checked += 1
+                        self._helper_nearest_cell(point, cell, predicate,
+                                                  found)
+            found.sort()
+            del found[k:]
+            if len(found) == k and found[-1][0] <= (
+                    ring * self._cell_size) ** 2:
+                break
+            ring += 1
+        return [name for _, name in found]
+
+    def _helper_nearest_cell(self, point: Tuple[int, int],
+                             cell: Dict[Tuple[int, int], str],
+                             predicate: Optional[Callable[[str], bool]],
+                             found: List[Tuple[int, str]]) -> None:
+        """ _helper_nearest_cell is helper nearest cell.
+        It takes self, point, a cell, predicate and found and adds the squared
+        distance to point and the name of every player in cell that predicate
+        accepts to found.
+        """
+        for there, name in cell.items():
+            if predicate is None or predicate(name):
+                found.append(((there[0] - point[0]) ** 2 + (
+                    there[1] - point[1]) ** 2, name))
+
+    def bounds(self) -> Tuple[int, int, int, int]:
+        """ Return the smallest x, smallest y, largest x and largest y that a
+        player on this field can have. bounds
+
+        Runtime: O(1)
+
+        === DocTests ===
+        >>> GridField((0, 0), (1000, 400)).bounds()
+        (0, 0, 1000, 400)
+        """
+        return self._nw[0], self._nw[1], self._se[0], self._se[1]
+
+    def size(self) -> int:
+        """ Return the number of nodes in <self>
+        The field is one node and every cell with a player in it is another,
+        unless there is at most one player, in which case the field is a leaf.
+
+        Runtime: O(1)
+
+        === DocTests ===
+        >>> grid = GridField((0, 0), (500, 500))
+        >>> grid.size()
+        1
+        >>> grid.insert('1', (250, 250))
+        >>> grid.insert('2', (251, 250))
+        >>> grid.insert('3', (350, 350))
+        >>> grid.size()
+        3
+        """
+        if self.is_leaf():
+            return 1
+        return 1 + len(self._cells)
+
+    def height(self) -> int:
+        """ Return the height of <self>
+        The field is the root and its cells are leaves, so the height is 1
+        while the field is a leaf and 2 after that.
+
+        Runtime: O(1)
+
+        === DocTests ===
+        >>> grid = GridField((0, 0), (500, 500))
+        >>> grid.insert('1', (250, 250))
+        >>> grid.height()
+        1
+        >>> grid.insert('2', (350, 350))
+        >>> grid.height()
+        2
+        """
+        if self.is_leaf():
+            return 1
+        return 2
+
+    def depth(self, tree: Tree) -> Optional[int]:
+        """ Return the depth of the subtree <tree> relative to <self>. Return
+        None if <tree> is not a descendant of <self>
+        The cells of a field are not Trees, so no Tree is ever a descendant of
+        a field and this is always None.
+
+        Runtime: O(1)
+
+        === DocTests ===
+        >>> grid = GridField((0, 0), (500, 500))
+        >>> grid.depth(grid) is None
+        True
+        """
+        return None
+
+    def is_leaf(self) -> bool:
+        """ Return True if <self> has no children. is_leaf
+        A field with at most one player has no cells below it.
+
+        Runtime: O(1)
+
+        === DocTests ===
+        >>> grid = GridField((0, 0), (500, 500))
+        >>> grid.is_leaf()
+        True
+        >>> grid.insert('1', (250, 250))
+        >>> grid.is_leaf()
+        True
+        >>> grid.insert('2', (350, 350))
+        >>> grid.is_leaf()
+        False
+        """
+        return len(self._index) <= 1
+
+    def is_empty(self) -> bool:
+        """ Return True if <self> or any of its descendants do not store any
+        information about the location of any players. is_empty
+
+        Runtime: O(1)
+
+        === DocTests ===
+        >>> grid = GridField((0, 0), (500, 500))
+        >>> grid.is_empty()
+        True
+        >>> grid.insert('1', (250, 250))
+        >>> grid.is_empty()
+        False
+        """
+        return not self._cells
+
+
+class ArrayField(Tree):
+    """ ArrayField is an array field that is a subclass of Tree.
+    It keeps the x and y of every player in two NumPy arrays side by side
+    with an array of their names, so a range search is a couple of array
+    comparisons instead of a walk over one node per player. This needs NumPy.
+    If sort_by_x is on, the players are kept in order of x, so a range
+    search first cuts the arrays down to the players between the smallest
+    and largest x of the box with a binary search.
+    Seen as a tree, the field is the root and every player is a leaf below
+    the root.
+
+    === Attributes ===
+    _nw : the north-western corner of this field
+    _se : the south-eastern corner of this field
+    _sort_by_x : whether the players are kept in order of x
+    _count : the number of players in this field
+    _xs : the x of each player (only the first _count are used)
+    _ys : the y of each player (only the first _count are used)
+    _names : the name of each player (only the first _count are used)
+    _slots : a dictionary mapping the point of every player to where it is in
+        the arrays (or None if _sort_by_x is on, where a point is found by
+        a binary search instead)
+    _index : a dictionary mapping the names of players in this field to their
+        points
+    _roles : a dictionary mapping the names of players to their role tags
+
+    === Representation Invariants ===
+    _xs, _ys and _names have the same length, which is at least _count.
+    If _sort_by_x is on, _xs[:_count] is sorted.
+    _index holds exactly the players stored in the first _count places of the
+        arrays.
+
+    === DocTests ===
+    >>> field = ArrayField((0, 0), (500, 500))
+    >>> field._count
+    0
+    >>> field._sort_by_x
+    False
+    """
+    __slots__ = ('_nw', '_se', '_sort_by_x', '_count', '_xs', '_ys', '_names',
+                 '_slots', '_index', '_roles')
+    _nw: Tuple[int, int]
+    _se: Tuple[int, int]
+    _sort_by_x: bool
+    _count: int
+    _xs: np.ndarray
+    _ys: np.ndarray
+    _names: np.ndarray
+    _slots: Optional[Dict[Tuple[int, int], int]]
+    _index: Dict[str, Tuple[int, int]]
+    _roles: Dict[str, str]
+
+    def __init__(self, nw: Tuple[int, int], se: Tuple[int, int],
+                 sort_by_x: bool = False) -> None:
+        """Initialize a new empty field in self with nw and se corners.
+        Raise an ImportError if NumPy is not installed.
+
+        Runtime: O(1)
+
+        === Preconditions ===
+        nw[0] < se[0] and nw[1] < se[1]
+
+        === DocTests ===
+        >>> field = ArrayField((0, 0), (500, 500), True)
+        >>> field._sort_by_x
+        True
+        >>> field.is_empty()
+        True
+        """
+        if np is None:
+            raise ImportError('ArrayField needs NumPy')
+        self._nw = nw
+        self._se = se
+        self._sort_by_x = sort_by_x
+        self._count = 0
+        self._xs = np.zeros(16, dtype=np.int64)
+        self._ys = np.zeros(16, dtype=np.int64)
+        self._names = np.empty(16, dtype=object)
+        self._slots = None if sort_by_x else {}
+        self._index = {}
+        self._roles = {}
+
+    def _helper_slot(self, point: Tuple[int, int]) -> Optional[int]:
+        """ _helper_slot is helper slot.
+        It takes self and point and returns where the player at point is in
+        the arrays (or None if there is no player at point).
+        """
+        if self._slots is not None:
+            return self._slots.get(point)
+        low = int(np.searchsorted(self._xs[:self._count], point[0], 'left'))
+        high = int(np.searchsorted(self._xs[:self._count], point[0], 'right'))
+        found = np.flatnonzero(self._ys[low:high] == point[1])
+        if len(found) == 0:
+            return None
+        return low + int(found[0])
+
+    def __contains__(self, name: str) -> bool:
+        """ Return True if a player named <name> is stored in this field.
+        __contains__ checks if name is contained in self
+
+        Runtime: O(1)
+
+        === DocTests ===
+        >>> field = ArrayField((0, 0), (500, 500))
+        >>> field.insert('1', (250, 250))
+        >>> '1' in field
+        True
+        >>> '2' in field
+        False
+        """
+        return name in self._index
+
+    def contains_point(self, point: Tuple[int, int]) -> bool:
+        """ Return True if a player at location <point> is stored in this field.
+        contains_point checks if point is in self
+
+        Runtime: O(1), or O(log(n)) if the players are kept in order of x
+
+        === DocTests ===
+        >>> field = ArrayField((0, 0), (500, 500), True)
+        >>> field.insert('1', (250, 250))
+        >>> field.contains_point((250, 250))
         True
-        >>> two.contains_point((450, 450))
+        >>> field.contains_point((250, 251))
         False
         """
-        if self._point == point:
-            return True
-        elif self._point is None or self._name is None or (
-                self._lt is None and self._gt is None):
-            return False
-        elif self._split_type == 'x':
-            if point[0] <= self._point[0] and self._lt is not None:
-                return self._lt.contains_point(point)
-            elif self._gt is not None:
-                return self._gt.contains_point(point)
-            return False
-        elif self._split_type == 'y':
-            if point[1] <= self._point[1] and self._lt is not None:
-                return self._lt.contains_point(point)
-            elif self._gt is not None:
-                return self._gt.contains_point(point)
-            return False
+        return self._helper_slot(point) is not None
 
     def insert(self, name: str, point: Tuple[int, int]) -> None:
-        """Insert a player named <name> into this tree at point <point>.
-        insert a point and a name into self
+        """Insert a player named <name> into this field at point <point>.
+        insert a point and name into self
         Raise an OutOfBoundsError if <point> is out of bounds.
 
         Raise an OutOfBoundsError if moving the player would place the player at
         exactly the same coordinates of another player in the Tree (before
         moving the player).
 
-        Runtime: O(log(n))
-
-        Preconditions
+        Runtime: O(1), or O(n) array copying if the players are kept in
+        order of x
 
         === DocTests ===
-        >>> two = TwoDTree((0, 0), (500, 500))
-        >>> two.insert('1', (250, 250))
-        >>> two.insert('2', (350, 350))
-        >>> '1' in two
-        True
-        >>> '2' in two
-        True
-        >>> try:
-        ...     two.insert('3', (250, 250))
-        ... except OutOfBoundsError:
-        ...     print('Error')
-        Error
+        >>> field = ArrayField((0, 0), (500, 500), True)
+        >>> field.insert('1', (250, 250))
+        >>> field.insert('2', (100, 300))
+        >>> field._xs[:field._count].tolist()
+        [100, 250]
         >>> try:
-        ...     two.insert('3', (501, 501))
+        ...     field.insert('3', (100, 300))
         ... except OutOfBoundsError:
         ...     print('Error')
         Error
         """
-        if self._point == point:
+        if not (self._nw[0] <= point[0] <= self._se[0] and
+                self._nw[1] <= point[1] <= self._se[1]):
             raise OutOfBoundsError
-        elif self._nw is not None and self._se is not None and (
-                point[0] < self._nw[0] or point[0] > self._se[0] or point[1] <
-                self._nw[1] or point[1] > self._se[1]):
+        if self._helper_slot(point) is not None:
             raise OutOfBoundsError
-        elif self.is_empty():
-            self._name = name
-            self._point = point
-        elif self._point is not None:
-            if self._split_type == 'x':
-                if point[0] <= self._point[0]:
-                    if self._lt is None:
-                        self._lt = TwoDTree(None, None)
-                        self._lt._split_type = 'y'
-                    self._lt.insert(name, point)
-                else:
-                    if self._gt is None:
-                        self._gt = TwoDTree(None, None)
-                        self._gt._split_type = 'y'
-                    self._gt.insert(name, point)
-            else:
-                if point[1] <= self._point[1]:
-                    if self._lt is None:
-                        self._lt = TwoDTree(None, None)
-                        self._lt._split_type = 'x'
-                    self._lt.insert(name, point)
-                else:
-                    if self._gt is None:
-                        self._gt = TwoDTree(None, None)
-                        self._gt._split_type = 'x'
-                    self._gt.insert(name, point)
-
-    def _helper_remove_empty_leaves(self) -> None:
-        """ _helper_remove_empty_leaves is helper remove empty leaves.
-        It takes self and removes its empty leaves.
-        Preconditions
-        """
-        if self._lt is not None:
-            if self._lt.is_leaf() and self._lt.is_empty():
-                self._lt = None
-            else:
-                self._lt._helper_remove_empty_leaves()
-        if self._gt is not None:
-            if self._gt.is_empty() and self._gt.is_leaf():
-                self._gt = None
-            else:
-                self._gt._helper_remove_empty_leaves()
-
-    def _helper_get_descendants(self) -> List[Tuple[str, Tuple[int, int]]]:
-        """ _helper_get_descendants is helper get descendants.
-        It takes self and reutrns all of its descendants as a list of tuples
-        containing their name and location.
-        Preconditions
-        """
-        results = [(self._name, self._point)]
-        if self._lt is not None:
-            results += self._lt._helper_get_descendants()
-        if self._gt is not None:
-            results += self._gt._helper_get_descendants()
-        return results
+        if self._count == len(self._xs):
+            self._xs = np.concatenate([self._xs, np.zeros_like(self._xs)])
+            self._ys = np.concatenate([self._ys, np.zeros_like(self._ys)])
+            self._names = np.concatenate([self._names,
+                                          np.empty_like(self._names)])
+        slot = self._count
+        if self._sort_by_x:
+            slot = int(np.searchsorted(self._xs[:self._count], point[0],
+                                       'right'))
+            for column in (self._xs, self._ys, self._names):
+                column[slot + 1:self._count + 1] = column[slot:self._count]
+        else:
+            self._slots[point] = slot
+        self._xs[slot], self._ys[slot], self._names[slot] = point[0], point[
+            1], name
+        self._count += 1
+        self._index[name] = point
 
     def remove(self, name: str) -> None:
-        """ Remove information about a player named <name> from this tree.
+        """ Remove information about a player named <name> from this field.
         remove a name from self
-        Runtime: O(n)
 
-        Preconditions
+        Runtime: O(1), or O(n) array copying if the players are kept in
+        order of x
 
         === DocTests ===
-        >>> two = TwoDTree((0, 0), (500, 500))
-        >>> two.insert('1', (250, 250))
-        >>> two.insert('2', (350, 350))
-        >>> '1' in two
-        True
-        >>> '2' in two
-        True
-        >>> two.remove('1')
-        >>> '1' in two
+        >>> field = ArrayField((0, 0), (500, 500))
+        >>> field.insert('1', (250, 250))
+        >>> field.remove('1')
+        >>> '1' in field
         False
         """
-        if self._name == name:
-            self._name = None
-            self._point = None
-            if not self.is_leaf():
-                descendants = self._helper_get_descendants()
-                self._lt = None
-                self._gt = None
-                for person in descendants:
-                    if person[0] is not None and person[1] is not None:
-                        self.insert(person[0], person[1])
-        else:
-            if self._lt is not None and name in self._lt:
-                self._lt.remove(name)
-            elif self._gt is not None and name in self._gt:
-                self._gt.remove(name)
+        if name in self._index:
+            self.remove_point(self._index[name])
 
     def remove_point(self, point: Tuple[int, int]) -> None:
-        """ Remove information about a player at point <point> from this tree.
+        """ Remove information about a player at point <point> from this field.
         remove_point removes a point in self
-        Runtime: O(log(n))
+        Without sort_by_x the last player in the arrays fills the hole left by
+        the removed one.
 
-        Preconditions
+        Runtime: O(1), or O(n) array copying if the players are kept in
+        order of x
 
         === DocTests ===
-        >>> two = TwoDTree((0, 0), (500, 500))
-        >>> two.insert('1', (250, 250))
-        >>> two.insert('2', (350, 350))
-        >>> '1' in two
-        True
-        >>> '2' in two
-        True
-        >>> two.remove_point((250, 250))
-        >>> two.contains_point((250, 250))
-        False
-        """
-        if self._point == point:
-            self._name = None
-            pt = self._point
-            self._point = None
-            if not self.is_leaf():
-                if self._lt is not None:
-                    replace = self._lt._helper_closest(pt, self._split_type)
-                    if replace is not None:
-                        replace_name = replace._name
-                        replace_pt = replace._point
-                        self._lt.remove_point(replace._point)
-                        self._name = replace_name
-                        self._point = replace_pt
-                else:
-                    replace = self._gt._helper_closest(pt, self._split_type)
-                    if replace is not None:
-                        replace_name = replace._name
-                        replace_pt = replace._point
-                        self._gt.remove_point(replace._point)
-                        self._name = replace_name
-                        self._point = replace_pt
-            self._helper_remove_empty_leaves()
-        elif self._point is not None and not self.is_empty():
-            if self._split_type == 'x':
-                if point[0] <= self._point[0]:
-                    if self._lt is not None:
-                        self._lt.remove_point(point)
-                else:
-                    if self._gt is not None:
-                        self._gt.remove_point(point)
-            else:
-                if point[1] <= self._point[1]:
-                    if self._lt is not None:
-                        self._lt.remove_point(point)
-                else:
-                    if self._gt is not None:
-                        self._gt.remove_point(point)
-
-    def _helper_move(self, name: str, direction: str, steps: int) -> List[
-            Tuple[int, int], Tuple[int, int]]:
-        """ _helper_move is helper move.
-        It takes self name direction and steps and returns a list of tuples.
-        It returns the old location and new location of the point.
-
-        === Preconditions ===
-        direction in ['N', 'S', 'E', 'W']
+        >>> field = ArrayField((0, 0), (500, 500))
+        >>> field.insert('1', (250, 250))
+        >>> field.insert('2', (100, 300))
+        >>> field.remove_point((250, 250))
+        >>> field._names[:field._count].tolist()
+        ['2']
+        >>> field._slots
+        {(100, 300): 0}
         """
-        if self._name == name:
-            if direction == 'N':
-                points = (self._point[0], self._point[1] - steps)
-                return [self._point, points]
-            elif direction == 'S':
-                points = (self._point[0], self._point[1] + steps)
-                return [self._point, points]
-            elif direction == 'W':
-                points = (self._point[0] - steps, self._point[1])
-                return [self._point, points]
+        slot = self._helper_slot(point)
+        if slot is not None:
+            name = self._names[slot]
+            last = self._count - 1
+            if self._sort_by_x:
+                for column in (self._xs, self._ys, self._names):
+                    column[slot:last] = column[slot + 1:self._count]
             else:
-                points = (self._point[0] + steps, self._point[1])
-                return [self._point, points]
-        else:
-            if self._lt is not None and name in self._lt:
-                return self._lt._helper_move(name, direction, steps)
-            elif self._gt is not None and name in self._gt:
-                return self._gt._helper_move(name, direction, steps)
+                del self._slots[point]
+                if slot != last:
+                    self._xs[slot] = self._xs[last]
+                    self._ys[slot] = self._ys[last]
+                    self._names[slot] = self._names[last]
+                    self._slots[(int(self._xs[slot]), int(
+                        self._ys[slot]))] = slot
+            self._names[last] = None
+            self._count = last
+            if self._index.get(name) == point:
+                del self._index[name]
 
     def move(self, name: str, direction: str, steps: int) -> Optional[
             Tuple[int, int]]:
@@ -1295,64 +6687,26 @@ class TwoDTree(Tree):
         exactly the same coordinates of another player in the Tree (before
         moving the player).
 
-        Runtime: O(n)
+        Runtime: O(1), or O(n) array copying if the players are kept in
+        order of x
 
         === Preconditions ===
         direction in ['N', 'S', 'E', 'W']
 
         === DocTests ===
-        >>> two = TwoDTree((0, 0), (500, 500))
-        >>> two.insert('1', (250, 250))
-        >>> two.insert('2', (350, 350))
-        >>> two.move('2', 'N', 100)
+        >>> field = ArrayField((0, 0), (500, 500))
+        >>> field.insert('1', (250, 250))
+        >>> field.insert('2', (350, 350))
+        >>> field.move('2', 'N', 100)
         (350, 250)
         >>> try:
-        ...     two.move('1', 'E', 100)
+        ...     field.move('1', 'E', 100)
         ... except OutOfBoundsError:
         ...     print('Error')
         Error
         """
-        if name in self:
-            values = self._helper_move(name, direction, steps)
-            self.insert(name, values[1])
-            self.remove_point(values[0])
-            return values[1]
-
-    def _helper_move_point(self, point: Tuple[int, int], direction: str,
-                           steps: int) -> List[str, Tuple[int, int]]:
-        """ _helper_move_point is helper move point.
-        It takes self point direction and steps and returns a list of
-        names to points.
-
-        === Preconditions ===
-        direction in ['N', 'S', 'E', 'W']
-        """
-        if self._point == point:
-            if direction == 'N':
-                points = (self._point[0], self._point[1] - steps)
-                return [self._name, points]
-            elif direction == 'S':
-                points = (self._point[0], self._point[1] + steps)
-                return [self._name, points]
-            elif direction == 'W':
-                points = (self._point[0] - steps, self._point[1])
-                return [self._name, points]
-            else:
-                points = (self._point[0] + steps, self._point[1])
-                return [self._name, points]
-        elif self._point is not None:
-            if self._split_type == 'x' and point[0] <= self._point[
-                    0] and self._lt is not None:
-                return self._lt._helper_move_point(point, direction, steps)
-            elif self._split_type == 'x' and point[0] > self._point[
-                    0] and self._gt is not None:
-                return self._gt._helper_move_point(point, direction, steps)
-            elif self._split_type == 'y' and point[1] <= self._point[
-                    1] and self._lt is not None:
-                return self._lt._helper_move_point(point, direction, steps)
-            elif self._split_type == 'y' and point[1] > self._point[
-                    1] and self._gt is not None:
-                return self._gt._helper_move_point(point, direction, steps)
+        if name in self._index:
+            return self.move_point(self._index[name], direction, steps)
 
     def move_point(self, point: Tuple[int, int], direction: str, steps: int) ->\
             Optional[Tuple[int, int]]:
@@ -1366,197 +6720,247 @@ class TwoDTree(Tree):
         exactly the same coordinates of another player in the Tree (before
         moving the player).
 
-        Moving a point may require the tree to be reorganized. This method
-        should do the minimum amount of tree reorganization possible to move the
-        given point properly.
-
-        Runtime: O(log(n))
+        Runtime: O(1), or O(n) array copying if the players are kept in
+        order of x
 
         === Preconditions ===
         direction in ['N', 'S', 'E', 'W']
 
         === DocTests ===
-        >>> two = TwoDTree((0, 0), (500, 500))
-        >>> two.insert('1', (250, 250))
-        >>> two.insert('2', (350, 350))
-        >>> two.move_point((350, 350), 'N', 100)
-        (350, 250)
-        >>> try:
-        ...     two.move_point((250, 250), 'E', 100)
-        ... except OutOfBoundsError:
-        ...     print('Error')
-        Error
+        >>> field = ArrayField((0, 0), (500, 500), True)
+        >>> field.insert('1', (250, 250))
+        >>> field.insert('2', (350, 350))
+        >>> field.move_point((350, 350), 'W', 200)
+        (150, 350)
+        >>> field._names[:field._count].tolist()
+        ['2', '1']
         """
-        values = self._helper_move_point(point, direction, steps)
-        if values is not None:
-            self.insert(values[0], values[1])
+        slot = self._helper_slot(point)
+        if slot is not None:
+            name = self._names[slot]
+            if direction == 'N':
+                new_point = (point[0], point[1] - steps)
+            elif direction == 'S':
+                new_point = (point[0], point[1] + steps)
+            elif direction == 'W':
+                new_point = (point[0] - steps, point[1])
+            else:
+                new_point = (point[0] + steps, point[1])
+            self.insert(name, new_point)
             self.remove_point(point)
-            return values[1]
+            return new_point
 
     def names_in_range(self, point: Tuple[int, int], direction: str,
                        distance: int) -> List[str]:
         """ Return a list of names of players whose location is in the
         <direction> relative to <point> and whose location is within <distance>
         along both the x and y axis.
-        names_in_range uses a point and searches in a direction for a certain
-        distance in self
-        For example: names_in_range((100, 100), 'SE', 10) should return the
-        names of all the players south east of (100, 100) and within 10 steps in
-        either direction. In other words, find all players whose location is in
-        the box with corners at: (100, 100) (110, 100) (100, 110) (110, 110)
+        names_in_range searches in direction from point for distance in self
+        Every player is checked at once with NumPy array comparisons. If the
+        players are kept in order of x, only the players between the smallest
+        and largest x of the box are checked.
 
-        Runtime: faster than O(n) when distance is small
+        Runtime: O(n) in NumPy, or O(log(n) + players between the x limits)
+        if the players are kept in order of x
 
         === Preconditions ===
-        direction in ['NE', 'SE', 'NE', 'SW']
+        direction in ['NW', 'SE', 'NE', 'SW']
 
         === DocTests ===
-        >>> two = TwoDTree((0, 0), (500, 500))
-        >>> two.insert('1', (250, 250))
-        >>> two.insert('2', (350, 350))
-        >>> two.names_in_range((500,500), 'NW', 500)
+        >>> field = ArrayField((0, 0), (500, 500))
+        >>> field.insert('1', (250, 250))
+        >>> field.insert('2', (350, 350))
+        >>> field.names_in_range((200, 200), 'SE', 50)
+        ['1']
+        >>> sorted(field.names_in_range((400, 400), 'NW', 150))
         ['1', '2']
         """
-        if direction == 'NW':
-            other = (point[0] - distance, point[1] - distance)
-        elif direction == 'SW':
-            other = (point[0] - distance, point[1] + distance)
-        elif direction == 'SE':
-            other = (point[0] + distance, point[1] + distance)
-        elif direction == 'NE':
-            other = (point[0] + distance, point[1] - distance)
+        xmin, xmas, ymin, ymax = self._helper_box(point, direction, distance)
+        low, high = 0, self._count
+        if self._sort_by_x:
+            low = int(np.searchsorted(self._xs[:high], xmin, 'left'))
+            high = int(np.searchsorted(self._xs[:high], xmas, 'right'))
+            mask = (self._ys[low:high] >= ymin) & (self._ys[low:high] <= ymax)
+        else:
+            xs, ys = self._xs[:high], self._ys[:high]
+            mask = (xs >= xmin) & (xs <= xmas) & (ys >= ymin) & (ys <= ymax)
+        return self._names[low:high][mask].tolist()
+
+    def names_in_ranges(self, queries: List[Tuple[Tuple[int, int], str, int]]
+                        ) -> List[List[str]]:
+        """ Return, for each (point, direction, distance) query in <queries>,
+        the list of names that names_in_range(point, direction, distance) would
+        return. names_in_ranges answers many range queries at once in self
+        Every query is already one set of array comparisons, so they are
+        answered one after another.
+
+        Runtime: the runtime of names_in_range for each query
+
+        === Preconditions ===
+        every direction in queries is in ['NW', 'SE', 'NE', 'SW']
+
+        === DocTests ===
+        >>> field = ArrayField((0, 0), (500, 500))
+        >>> field.insert('1', (250, 250))
+        >>> field.insert('2', (350, 350))
+        >>> field.names_in_ranges([((200, 200), 'SE', 50), ((0, 0), 'SE', 10)])
+        [['1'], []]
+        """
+        return [self.names_in_range(point, direction, distance) for
+                point, direction, distance in queries]
+
+    def nearest(self, point: Tuple[int, int], k: int = 1,
+                predicate: Optional[Callable[[str], bool]] = None) -> List[str]:
+        """ Return the names of the <k> players closest to <point>, closest
+        first. If <predicate> is given, only players whose name it returns
+        True for are counted. Fewer than k names are returned if there are not
+        enough players. nearest finds the closest players to point in self
+        The distances to every player are worked out at once, and players are
+        then tried from closest to furthest until k pass predicate.
+
+        Runtime: O(n log(n)) in NumPy
+
+        === DocTests ===
+        >>> field = ArrayField((0, 0), (500, 500))
+        >>> field.insert('1', (250, 250))
+        >>> field.insert('2', (350, 350))
+        >>> field.insert('3', (10, 10))
+        >>> field.nearest((330, 320), 2)
+        ['2', '1']
+        >>> field.nearest((330, 320), 1, {'1', '3'}.__contains__)
+        ['1']
+        """
+        distances = (self._xs[:self._count] - point[0]) ** 2 + (
+            self._ys[:self._count] - point[1]) ** 2
         result = []
-        if self._point is not None:
-            if min(other[0], point[0]) <= self._point[0] <= max(other[0], point[
-                    0]) and min(other[1], point[1]) <= self._point[1] <= max(
-                        other[1], point[1]):
-                result = [self._name]
-            if self._lt is not None:
-                result += self._lt.names_in_range(point, direction, distance)
-            if self._gt is not None:
-                result += self._gt.names_in_range(point, direction, distance)
+        for slot in np.argsort(distances, kind='stable'):
+            if len(result) >= k:
+                break
+            name = self._names[slot]
+            if predicate is None or predicate(name):
+                result.append(name)
         return result
 
+    def collisions(self, radius: int) -> List[Tuple[str, str]]:
+        """ Return every pair of names of players in this field whose locations
+        are at most <radius> apart (straight line distance). collisions finds
+        the players touching each other in self
+        Each pair is given once as (smaller name, bigger name) and the pairs are
+        sorted. The players are put in order of x and each one is compared at
+        once with the player 1 place after it, then 2 places after it and so
+        on, until no player is within radius along x of the one that many
+        places after it.
+
+        Runtime: O(n log(n)) in NumPy when radius is small
+
+        === Preconditions ===
+        radius >= 0
+
+        === DocTests ===
+        >>> field = ArrayField((0, 0), (500, 500))
+        >>> field.insert('b', (100, 100))
+        >>> field.insert('a', (103, 104))
+        >>> field.insert('c', (106, 100))
+        >>> field.collisions(5)
+        [('a', 'b'), ('a', 'c')]
+        """
+        order = np.argsort(self._xs[:self._count], kind='stable')
+        xs, ys = self._xs[order], self._ys[order]
+        names = self._names[order]
+        result = set()
+        shift = 1
+        while shift < len(order):
+            dx = xs[shift:] - xs[:-shift]
+            close = dx <= radius
+            if not close.any():
+                break
+            dy = ys[shift:] - ys[:-shift]
+            for slot in np.flatnonzero(close & (
+                    dx * dx + dy * dy <= radius * radius)):
+                name, other = names[slot], names[slot + shift]
+                result.add((min(name, other), max(name, other)))
+            shift += 1
+        return sorted(result)
+
+    def bounds(self) -> Tuple[int, int, int, int]:
+        """ Return the smallest x, smallest y, largest x and largest y that a
+        player on this field can have. bounds
+
+        Runtime: O(1)
+        """
+        return self._nw[0], self._nw[1], self._se[0], self._se[1]
+
     def size(self) -> int:
         """ Return the number of nodes in <self>
+        The field is one node and every player is another, unless there is at
+        most one player, in which case the field is a leaf.
 
-        Runtime: O(n)
-
-        Preconditions
+        Runtime: O(1)
 
         === DocTests ===
-        >>> two = TwoDTree((0, 0), (500, 500))
-        >>> two.insert('1', (250, 250))
-        >>> two.insert('2', (350, 350))
-        >>> two.size()
-        2
+        >>> field = ArrayField((0, 0), (500, 500))
+        >>> field.size()
+        1
+        >>> field.insert('1', (250, 250))
+        >>> field.insert('2', (350, 350))
+        >>> field.size()
+        3
         """
-        if self.is_empty() or self.is_leaf():
+        if self.is_leaf():
             return 1
-        else:
-            count = 1
-            if self._gt is not None:
-                count += self._gt.size()
-            if self._lt is not None:
-                count += self._lt.size()
-            return count
+        return 1 + self._count
 
     def height(self) -> int:
         """ Return the height of <self>
+        The field is the root and its players are leaves, so the height is 1
+        while the field is a leaf and 2 after that.
 
-        Height is measured as the number of nodes in the path from the root of
-        this tree to the node at the greatest depth in this tree.
-
-        Runtime: O(n)
-
-        Preconditions
+        Runtime: O(1)
 
         === DocTests ===
-        >>> two = TwoDTree((0, 0), (500, 500))
-        >>> two.insert('1', (250, 250))
-        >>> two.insert('2', (350, 350))
-        >>> two.height()
+        >>> field = ArrayField((0, 0), (500, 500))
+        >>> field.insert('1', (250, 250))
+        >>> field.height()
+        1
+        >>> field.insert('2', (350, 350))
+        >>> field.height()
         2
         """
-        if self.is_empty() or self.is_leaf():
+        if self.is_leaf():
             return 1
-        else:
-            height = 1
-            gt_h = 0
-            lt_h = 0
-            if self._gt is not None:
-                gt_h = self._gt.height()
-            if self._lt is not None:
-                lt_h = self._lt.height()
-            height += max(gt_h, lt_h)
-            return height
+        return 2
 
-    def depth(self, tree: TwoDTree) -> Optional[int]:
+    def depth(self, tree: Tree) -> Optional[int]:
         """ Return the depth of the subtree <tree> relative to <self>. Return
         None if <tree> is not a descendant of <self>
+        The players of a field are not Trees, so no Tree is ever a descendant
+        of a field and this is always None.
 
-        Preconditions
+        Runtime: O(1)
 
-        Runtime: O(log(n))
         === DocTests ===
-        >>> two = TwoDTree((0, 0), (500, 500))
-        >>> two.insert('1', (250, 250))
-        >>> two.insert('2', (350, 350))
-        >>> one = TwoDTree((0, 0), (250, 250))
-        >>> two.depth(one)
-        >>> two.depth(two._gt)
-        1
+        >>> field = ArrayField((0, 0), (500, 500))
+        >>> field.depth(field) is None
+        True
         """
-        count = 0
-        if tree.is_empty():
-            count = 0
-        elif self._split_type == 'x':
-            if tree._point[0] <= self._point[0] and self._lt is not None:
-                if self._lt is tree:
-                    return 1
-                elif self._lt.depth(tree) is not None:
-                    count = 1
-                    count += self._lt.depth(tree)
-            elif tree._point[0] > self._point[0] and self._gt is not None:
-                if self._gt is tree:
-                    return 1
-                elif self._gt.depth(tree) is not None:
-                    count = 1
-                    count += self._gt.depth(tree)
-        else:
-            if tree._point[1] <= self._point[1] and self._lt is not None:
-                if self._lt is tree:
-                    return 1
-                elif self._lt.depth(tree) is not None:
-                    count = 1
-                    count += self._lt.depth(tree)
-            elif tree._point[1] > self._point[1] and self._gt is not None:
-                if self._gt is tree:
-                    return 1
-                elif self._gt.depth(tree) is not None:
-                    count = 1
-                    count += self._gt.depth(tree)
-        if count == 0:
-            return None
-        return count
+        return None
 
     def is_leaf(self) -> bool:
-        """ Return True if <self> has no children is_leaf
+        """ Return True if <self> has no children. is_leaf
+        A field with at most one player has nothing below it.
 
         Runtime: O(1)
 
-        Preconditions
-
         === DocTests ===
-        >>> two = TwoDTree((0, 0), (500, 500))
-        >>> two.insert('1', (250, 250))
-        >>> two.insert('2', (350, 350))
-        >>> two._gt.is_leaf()
+        >>> field = ArrayField((0, 0), (500, 500))
+        >>> field.insert('1', (250, 250))
+        >>> field.is_leaf()
         True
-        >>> two.is_leaf()
+        >>> field.insert('2', (350, 350))
+        >>> field.is_leaf()
         False
         """
-        return self._lt is None and self._gt is None
+        return self._count <= 1
 
     def is_empty(self) -> bool:
         """ Return True if <self> or any of its descendants do not store any
@@ -1564,147 +6968,22 @@ class TwoDTree(Tree):
 
         Runtime: O(1)
 
-        Preconditions
-
-        === DocTests ===
-        >>> two = TwoDTree((0, 0), (500, 500))
-        >>> two.insert('1', (250, 250))
-        >>> two.insert('2', (350, 350))
-        >>> two.is_empty()
-        False
-        """
-        return self._name is None and self._point is None and (
-            self._lt is None) and self._gt is None
-
-    def _helper_closest(self, point: Tuple[int, int], split: str) -> TwoDTree:
-        """ _helper_closest is helper closest.
-        It takes self point and split which is split type and returns a tree.
-        This tree is the closest value to self.
-
-        === Preconditions ===
-        split in ['x', 'y']
-        """
-        lt_v = None
-        gt_v = None
-        if self._lt is not None:
-            lt_v = self._lt._helper_closest(point, split)
-        if self._gt is not None:
-            gt_v = self._gt._helper_closest(point, split)
-        if self.is_empty() or self._point is None:
-            return None
-        elif split == 'x':
-            if lt_v is None and gt_v is None:
-                return self
-            elif lt_v is None:
-                if abs(gt_v._point[0] - point[0]) <= abs(
-                        self._point[0] - point[0]):
-                    return gt_v
-                else:
-                    return self
-            elif gt_v is None:
-                if abs(lt_v._point[0] - point[0]) <= abs(
-                        self._point[0] - point[0]):
-                    return lt_v
-                else:
-                    return self
-            else:
-                if abs(lt_v._point[0] - point[0]) <= abs(
-                        self._point[0] - point[0]) and abs(
-                            lt_v._point[0] - point[0]) <= abs(
-                                gt_v._point[0] - point[0]):
-                    return lt_v
-                elif abs(gt_v._point[0] - point[0]) <= abs(
-                        self._point[0] - point[0]) and abs(
-                            gt_v._point[0] - point[0]) <= abs(
-                                lt_v._point[0] - point[0]):
-                    return gt_v
-                else:
-                    return self
-        else:
-            if lt_v is None and gt_v is None:
-                return self
-            elif lt_v is None:
-                if abs(gt_v._point[1] - point[1]) <= abs(
-                        self._point[1] - point[1]):
-                    return gt_v
-                else:
-                    return self
-            elif gt_v is None:
-                if abs(lt_v._point[1] - point[1]) <= abs(
-                        self._point[1] - point[1]):
-                    return lt_v
-                else:
-                    return self
-            else:
-                if abs(lt_v._point[1] - point[1]) <= abs(
-                        self._point[1] - point[1]) and abs(
-                            lt_v._point[1] - point[1]) <= abs(
-                                gt_v._point[1] - point[1]):
-                    return lt_v
-                elif abs(gt_v._point[1] - point[1]) <= abs(
-                        self._point[1] - point[1]) and abs(
-                            gt_v._point[1] - point[1]) <= abs(
-                                lt_v._point[1] - point[1]):
-                    return gt_v
-                else:
-                    return self
-
-    def balance(self) -> None:
-        """ Balance <self> so that there is at most a difference of 1 between
-        the size of the _lt subtree and the size of the _gt subtree for all
-        trees in <self>. balance
-
-        === Preconditions ===
-        It is possible to balance this tree
-
         === DocTests ===
-        >>> two = TwoDTree((0, 0), (500, 500))
-        >>> two.insert('1', (250, 250))
-        >>> two.insert('2', (350, 350))
-        >>> two.insert('3', (300, 300))
-        >>> two._lt is None
+        >>> field = ArrayField((0, 0), (500, 500))
+        >>> field.is_empty()
         True
-        >>> two.balance()
-        >>> two._lt is None
+        >>> field.insert('1', (250, 250))
+        >>> field.is_empty()
         False
         """
-        if not (self._lt is None and self._gt is None):
-            if self._lt is None and self._gt is not None:
-                if not self._gt.is_leaf():
-                    name, point = self._name, self._point
-                    node = self._gt._helper_closest(point, self._split_type)
-                    self._name, self._point = node._name, node._point
-                    self._gt.remove_point(self._point)
-                    self.insert(name, point)
-                    self.balance()
-            elif self._gt is None and self._lt is not None:
-                if not self._lt.is_leaf():
-                    name, point = self._name, self._point
-                    node = self._lt._helper_closest(point, self._split_type)
-                    self._name, self._point = node._name, node._point
-                    self._lt.remove_point(self._point)
-                    self.insert(name, point)
-                    self.balance()
-            elif (self._lt.size() - self._gt.size()) > 1:
-                name, point = self._name, self._point
-                if self._lt.size() > self._gt.size():
-                    node = self._lt._helper_closest(point, self._split_type)
-                    self._name, self._point = node._name, node._point
-                    self._lt.remove_point(self._point)
-                elif self._gt.size() > self._lt.size():
-                    node = self._gt._helper_closest(point, self._split_type)
-                    self._name, self._point = node._name, node._point
-                    self._gt.remove_point(self._point)
-                self.insert(name, point)
-                self.balance()
-            else:
-                self._lt.balance()
-                self._gt.balance()
+        return self._count == 0
 
 
 if __name__ == '__main__':
     import python_ta
 
-    python_ta.check_all(config={'extra-imports': ['typing'],
+    python_ta.check_all(config={'extra-imports': ['typing', 'bisect', 'gc',
+                                                  'heapq', 'mmap', 'struct',
+                                                  'array', 'numpy'],
                                 'disable': ['R0913', 'R0902', 'W0611', 'R1710',
                                             'R1702']})
@@ -1,4 +1,7 @@
+import math
 import pytest
+import random
+import sys
 import trees
 
 
@@ -157,6 +160,20 @@ class TreesTest:
             return
         raise Exception('this should have raised an OutOfBoundsError')
 
+    def test_remove_after_move(self):
+        self.tree.insert('jon', (250, 250))
+        self.tree.insert('0', (500, 500))
+        self.tree.insert('1', (449, 449))
+        self.tree.move('jon', 'N', 10)
+        self.tree.move_point((449, 449), 'W', 20)
+        self.tree.remove('jon')
+        self.tree.remove('1')
+        assert 'jon' not in self.tree
+        assert '1' not in self.tree
+        assert not self.tree.contains_point((250, 240))
+        assert not self.tree.contains_point((429, 449))
+        assert '0' in self.tree
+
     def test_names_in_range(self):
         self.tree.insert('jon', (250, 250))
         self.tree.insert('joe', (300, 300))
@@ -172,6 +189,170 @@ class TreesTest:
         assert set(self.tree.names_in_range((0, 500), 'NE', 500)) == {'joe', 'jon', '0', '1', '2'}
         assert len(self.tree.names_in_range((448, 448), 'SE', 1)) == 2
 
+    def test_names_in_range_many(self):
+        rng = random.Random(0)
+        points = {}
+        while len(points) < 300:
+            points[(rng.randint(0, 500), rng.randint(0, 500))] = str(len(points))
+        for point, name in points.items():
+            self.tree.insert(name, point)
+        for _ in range(50):
+            x, y = rng.randint(0, 500), rng.randint(0, 500)
+            direction = rng.choice(['NW', 'NE', 'SW', 'SE'])
+            distance = rng.randint(0, 100)
+            dx = -distance if 'W' in direction else distance
+            dy = -distance if 'N' in direction else distance
+            expected = {name for (px, py), name in points.items() if
+                        min(x, x + dx) <= px <= max(x, x + dx) and
+                        min(y, y + dy) <= py <= max(y, y + dy)}
+            assert set(self.tree.names_in_range((x, y), direction,
+                                                distance)) == expected
+
+    def test_names_in_ranges(self):
+        rng = random.Random(1)
+        for i in range(200):
+            try:
+                self.tree.insert(str(i), (rng.randint(0, 500),
+                                          rng.randint(0, 500)))
+            except trees.OutOfBoundsError:
+                pass
+        queries = [((rng.randint(0, 500), rng.randint(0, 500)),
+                    rng.choice(['NW', 'NE', 'SW', 'SE']), rng.randint(0, 80))
+                   for _ in range(50)]
+        results = self.tree.names_in_ranges(queries)
+        assert len(results) == len(queries)
+        for query, result in zip(queries, results):
+            assert sorted(result) == sorted(self.tree.names_in_range(*query))
+
+    def test_iter_in_range_and_items(self):
+        assert list(self.tree) == [] and list(self.tree.items()) == []
+        rng = random.Random(3)
+        points = {}
+        while len(points) < 200:
+            point = (rng.randint(0, 500), rng.randint(0, 500))
+            if point not in points:
+                points[point] = str(len(points))
+                self.tree.insert(points[point], point)
+        assert sorted(self.tree.items()) == sorted(
+            (name, point) for point, name in points.items())
+        assert sorted(self.tree) == sorted(points.values())
+        for _ in range(50):
+            query = ((rng.randint(0, 500), rng.randint(0, 500)),
+                     rng.choice(['NW', 'NE', 'SW', 'SE']), rng.randint(0, 80))
+            found = list(self.tree.iter_in_range(*query))
+            assert [name for name, _ in found] == self.tree.names_in_range(
+                *query)
+            assert all(points[point] == name for name, point in found)
+        everything = self.tree.iter_in_range((0, 0), 'SE', 500)
+        name, point = next(everything)
+        assert points[point] == name
+
+    def test_count_in_range(self):
+        assert self.tree.count_in_range((0, 0), 'SE', 500) == 0
+        rng = random.Random(4)
+        names = []
+        for i in range(300):
+            try:
+                self.tree.insert(str(i), (rng.randint(0, 500),
+                                          rng.randint(0, 500)))
+                names.append(str(i))
+            except trees.OutOfBoundsError:
+                pass
+        for name in names[:100]:
+            self.tree.remove(name)
+        for name in names[100:200]:
+            try:
+                self.tree.move(name, rng.choice('NSEW'), rng.randint(1, 50))
+            except trees.OutOfBoundsError:
+                pass
+        assert self.tree.count_in_range((0, 0), 'SE', 500) == len(names) - 100
+        for _ in range(100):
+            query = ((rng.randint(0, 500), rng.randint(0, 500)),
+                     rng.choice(['NW', 'NE', 'SW', 'SE']), rng.randint(0, 300))
+            assert self.tree.count_in_range(*query) == len(
+                self.tree.names_in_range(*query))
+
+    def test_count_roles_in_range(self):
+        assert self.tree.count_roles_in_range((0, 0), 'SE', 500) == {}
+        rng = random.Random(6)
+        names = []
+        for i in range(300):
+            if rng.random() < 0.5:
+                self.tree.set_role(str(i), rng.choice(['it', 'not-it']))
+            try:
+                self.tree.insert(str(i), (rng.randint(0, 500),
+                                          rng.randint(0, 500)))
+                names.append(str(i))
+            except trees.OutOfBoundsError:
+                pass
+        roles = {}
+
+        def check():
+            for name in names:
+                roles[name] = self.tree._roles.get(name)
+            for _ in range(30):
+                query = ((rng.randint(0, 500), rng.randint(0, 500)),
+                         rng.choice(['NW', 'NE', 'SW', 'SE']),
+                         rng.randint(0, 300))
+                expected = {}
+                for name in self.tree.names_in_range(*query):
+                    if roles[name] is not None:
+                        expected[roles[name]] = expected.get(roles[name],
+                                                             0) + 1
+                assert self.tree.count_roles_in_range(*query) == expected
+        check()
+        for name in names[:60]:
+            self.tree.remove(name)
+        names = names[60:]
+        for name in names[:100]:
+            self.tree.set_role(name, rng.choice(['it', 'zombie', None]))
+            try:
+                self.tree.move(name, rng.choice('NSEW'), rng.randint(1, 50))
+            except trees.OutOfBoundsError:
+                pass
+        check()
+        everyone = self.tree.count_roles_in_range((0, 0), 'SE', 500)
+        assert sum(everyone.values()) == sum(
+            1 for name in names if roles[name] is not None)
+
+    def test_nearest(self):
+        rng = random.Random(2)
+        points = {}
+        while len(points) < 200:
+            points[(rng.randint(0, 500), rng.randint(0, 500))] = str(len(points))
+        for point, name in points.items():
+            self.tree.insert(name, point)
+        where = {name: point for point, name in points.items()}
+        targets = set(rng.sample(sorted(where), 20))
+        for _ in range(30):
+            x, y = rng.randint(0, 500), rng.randint(0, 500)
+
+            def distance(name):
+                return (where[name][0] - x) ** 2 + (where[name][1] - y) ** 2
+            found = self.tree.nearest((x, y), 5)
+            assert [distance(name) for name in found] == sorted(
+                distance(name) for name in where)[:5]
+            found = self.tree.nearest((x, y), 3, targets.__contains__)
+            assert all(name in targets for name in found)
+            assert [distance(name) for name in found] == sorted(
+                distance(name) for name in targets)[:3]
+        assert len(self.tree.nearest((0, 0), 500)) == 200
+        assert self.tree.nearest((0, 0), 3, lambda name: False) == []
+
+    def test_collisions(self):
+        rng = random.Random(3)
+        points = {}
+        while len(points) < 300:
+            points[(rng.randint(0, 500), rng.randint(0, 500))] = str(len(points))
+        for point, name in points.items():
+            self.tree.insert(name, point)
+        for radius in [0, 3, 10]:
+            expected = sorted(
+                (min(n1, n2), max(n1, n2)) for p1, n1 in points.items()
+                for p2, n2 in points.items() if n1 < n2 and
+                (p1[0] - p2[0]) ** 2 + (p1[1] - p2[1]) ** 2 <= radius ** 2)
+            assert self.tree.collisions(radius) == expected
+
     def test_is_empty(self):
         assert self.tree.is_empty()
         self.tree.insert('jon', (250, 250))
@@ -186,6 +367,13 @@ class TreesTest:
         self.tree.insert('joe', (300, 300))
         assert not self.tree.is_leaf()
 
+    def test_slots(self):
+        self.tree.insert('jon', (250, 250))
+        self.tree.insert('joe', (300, 300))
+        assert not hasattr(self.tree, '__dict__')
+        with pytest.raises(AttributeError):
+            self.tree.colour = 'green'
+
 
 class TestQuadTree(TreesTest):
     def setup_method(self):
@@ -218,6 +406,254 @@ class TestQuadTree(TreesTest):
         assert job.depth(jay) is None
         assert self.tree.depth(self.tree) is None
 
+    def test_insert_close_points(self):
+        self.tree.insert('0', (59, 249))
+        self.tree.insert('1', (63, 245))
+        self.tree.insert('2', (63, 246))
+        assert self.tree.contains_point((59, 249))
+        assert self.tree.contains_point((63, 245))
+        assert self.tree.contains_point((63, 246))
+
+    def test_from_points(self):
+        rng = random.Random(4)
+        points = {}
+        while len(points) < 300:
+            points[(rng.randint(0, 500), rng.randint(0, 500))] = str(len(points))
+        items = [(name, point) for point, name in points.items()]
+        for name, point in items:
+            self.tree.insert(name, point)
+        built = trees.QuadTree.from_points(items, (250, 250))
+
+        def shape(quad):
+            if quad is None:
+                return None
+            return (quad._name, quad._point, quad._bounds, shape(quad._nw),
+                    shape(quad._sw), shape(quad._ne), shape(quad._se))
+        assert shape(built) == shape(self.tree)
+        assert all(name in built for name, _ in items)
+        with pytest.raises(trees.OutOfBoundsError):
+            trees.QuadTree.from_points([('a', (1, 1)), ('b', (1, 1))],
+                                       (250, 250))
+        with pytest.raises(trees.OutOfBoundsError):
+            trees.QuadTree.from_points([('a', (501, 1))], (250, 250))
+
+    def test_rectangular_field(self):
+        bounds = (0, 0, 100000, 40000)
+        self.tree = trees.QuadTree((50000, 20000), bounds)
+        rng = random.Random(10)
+        points = {}
+        while len(points) < 2000:
+            points[(rng.randint(0, 100000), rng.randint(0, 40000))] = str(
+                len(points))
+        for point, name in points.items():
+            self.tree.insert(name, point)
+        self.tree.insert('corner', (100000, 40000))
+        points[(100000, 40000)] = 'corner'
+        with pytest.raises(trees.OutOfBoundsError):
+            self.tree.insert('out', (50000, 40001))
+        assert self.tree.bounds() == bounds
+
+        def check(quad):
+            xmin, ymin, xmax, ymax = quad._bounds
+            assert xmin <= quad._centre[0] <= xmax
+            assert ymin <= quad._centre[1] <= ymax
+            if quad._point is not None:
+                assert xmin <= quad._point[0] <= xmax
+                assert ymin <= quad._point[1] <= ymax
+            for child in (quad._nw, quad._sw, quad._ne, quad._se):
+                if child is not None:
+                    check(child)
+        check(self.tree)
+        for point in list(points)[:50]:
+            direction = rng.choice(['NW', 'NE', 'SW', 'SE'])
+            xs = sorted([point[0], point[0] + (-3000 if 'W' in direction
+                                               else 3000)])
+            ys = sorted([point[1], point[1] + (-3000 if 'N' in direction
+                                               else 3000)])
+            assert sorted(self.tree.names_in_range(point, direction,
+                                                   3000)) == sorted(
+                name for (x, y), name in points.items()
+                if xs[0] <= x <= xs[1] and ys[0] <= y <= ys[1])
+        built = trees.QuadTree.from_points(
+            [(name, point) for point, name in points.items()], (50000, 20000),
+            bounds)
+        assert built.size() == self.tree.size()
+
+    def test_odd_bounds(self):
+        self.tree = trees.QuadTree((2, 0), (-7, -3, 12, 4))
+        points = [(x, y) for x in range(-7, 13) for y in range(-3, 5)]
+        for point in points:
+            self.tree.insert(str(point), point)
+        assert all(self.tree.contains_point(point) for point in points)
+        assert sorted(self.tree.names_in_range((-7, -3), 'SE', 1)) == sorted(
+            str(point) for point in [(-7, -3), (-7, -2), (-6, -3), (-6, -2)])
+        for point in points[::2]:
+            self.tree.remove_point(point)
+        assert all(self.tree.contains_point(point) for point in points[1::2])
+        assert not any(self.tree.contains_point(point) for point in
+                       points[::2])
+
+    def test_counts_follow_changes(self, tmp_path):
+        def check(quad):
+            count = 0 if quad._point is None else 1
+            size = 1
+            for child in (quad._nw, quad._sw, quad._ne, quad._se):
+                if child is not None:
+                    child_count, child_size = check(child)
+                    count += child_count
+                    size += child_size
+            assert (quad._count, quad._size) == (count, size)
+            return count, size
+        rng = random.Random(17)
+        stored = {}
+        for step in range(1500):
+            if stored and rng.random() < 0.3:
+                name = rng.choice(sorted(stored))
+                if rng.random() < 0.5:
+                    self.tree.remove(name)
+                    del stored[name]
+                else:
+                    try:
+                        stored[name] = self.tree.move(
+                            name, rng.choice('NSEW'), rng.randint(1, 20))
+                    except trees.OutOfBoundsError:
+                        pass
+            else:
+                point = (rng.randint(0, 500), rng.randint(0, 500))
+                try:
+                    self.tree.insert(str(step), point)
+                    stored[str(step)] = point
+                except trees.OutOfBoundsError:
+                    pass
+            if step % 100 == 0:
+                assert check(self.tree)[0] == len(stored)
+        assert check(self.tree)[0] == len(stored)
+        built = trees.QuadTree.from_points(list(stored.items()), (250, 250))
+        assert check(built) == check(self.tree)
+        path = str(tmp_path / 'field.tag')
+        self.tree.save(path)
+        assert check(trees.QuadTree.load(path)) == check(self.tree)
+        for name in list(stored):
+            self.tree.remove(name)
+        assert (self.tree._count, self.tree.size()) == (0, 1)
+
+    def test_role_counts_follow_changes(self):
+        def check(quad):
+            counts = {}
+            if quad._point is not None:
+                role = self.tree._roles.get(quad._name)
+                if role is not None:
+                    counts[role] = 1
+            for child in (quad._nw, quad._sw, quad._ne, quad._se):
+                if child is not None:
+                    for role, count in check(child).items():
+                        counts[role] = counts.get(role, 0) + count
+            assert (quad._role_counts or {}) == counts
+            return counts
+        rng = random.Random(19)
+        stored = []
+        for step in range(1500):
+            if stored and rng.random() < 0.3:
+                name = rng.choice(stored)
+                if rng.random() < 0.3:
+                    self.tree.remove(name)
+                    stored.remove(name)
+                elif rng.random() < 0.5:
+                    self.tree.set_role(name, rng.choice(['it', 'not-it',
+                                                         None]))
+                else:
+                    try:
+                        self.tree.move(name, rng.choice('NSEW'),
+                                       rng.randint(1, 20))
+                    except trees.OutOfBoundsError:
+                        pass
+            else:
+                self.tree.set_role(str(step), rng.choice(['it', 'not-it']))
+                try:
+                    self.tree.insert(str(step), (rng.randint(0, 500),
+                                                 rng.randint(0, 500)))
+                    stored.append(str(step))
+                except trees.OutOfBoundsError:
+                    pass
+            if step % 100 == 0:
+                check(self.tree)
+        assert sum(check(self.tree).values()) == sum(
+            1 for name in stored if name in self.tree._roles)
+
+    def test_stats(self):
+        assert self.tree.stats() == {}
+        self.tree.enable_stats()
+        assert set(self.tree.stats()) == set(trees.Tree._STATS)
+        rng = random.Random(23)
+        stored = {}
+        while len(stored) < 500:
+            point = (rng.randint(0, 500), rng.randint(0, 500))
+            if point not in stored.values():
+                name = str(len(stored))
+                stored[name] = point
+                self.tree.insert(name, point)
+        stats = self.tree.stats()
+        assert stats['insert'] == 500
+        assert stats['allocated'] == self.tree.size() - 1
+        assert stats['splits'] > 0 and stats['freed'] == 0
+        for name in sorted(stored)[:400]:
+            self.tree.remove(name)
+        stats = self.tree.stats()
+        assert stats['remove_point'] == 400
+        assert stats['allocated'] - stats['freed'] == self.tree.size() - 1
+        assert stats['merges'] > 0
+        self.tree.reset_stats()
+        found = self.tree.names_in_range((250, 250), 'SE', 250)
+        assert next(self.tree.iter_in_range((0, 0), 'SE', 500)) is not None
+        self.tree.names_in_ranges([((250, 250), 'SE', 250)] * 3)
+        assert self.tree.count_in_range((250, 250), 'SE', 250) == len(found)
+        stats = self.tree.stats()
+        assert (stats['names_in_range'], stats['names_in_ranges'],
+                stats['count_in_range']) == (2, 1, 1)
+        assert stats['names_in_range_visits'] > len(found)
+        assert stats['count_in_range_visits'] <= stats[
+            'names_in_ranges_visits']
+        self.tree.enable_stats(False)
+        self.tree.insert('late', (0, 0))
+        assert self.tree.stats() == {}
+
+    def test_save_load(self, tmp_path):
+        bounds = (0, 0, 100000, 40000)
+        self.tree = trees.QuadTree((50000, 20000), bounds)
+        rng = random.Random(15)
+        stored = {}
+        while len(stored) < 1000:
+            point = (rng.randint(0, 100000), rng.randint(0, 40000))
+            name = 'caf\u00e9' + str(len(stored))
+            if point not in stored.values():
+                stored[name] = point
+                self.tree.insert(name, point)
+        for name in sorted(stored)[:300]:
+            self.tree.remove(name)
+            del stored[name]
+
+        def shape(quadrant):
+            if quadrant is None:
+                return None
+            return (quadrant._name, quadrant._point, quadrant._centre,
+                    quadrant._bounds, shape(quadrant._nw),
+                    shape(quadrant._sw), shape(quadrant._ne),
+                    shape(quadrant._se))
+        path = str(tmp_path / 'field.tag')
+        self.tree.save(path)
+        loaded = trees.QuadTree.load(path)
+        assert shape(loaded) == shape(self.tree)
+        assert loaded._index == stored
+        name = sorted(stored)[0]
+        loaded.remove(name)
+        assert not loaded.contains_point(stored[name])
+        loaded.insert('new', (0, 0))
+        assert loaded.bounds() == bounds
+        trees.QuadTree((250, 250)).save(path)
+        assert trees.QuadTree.load(path).is_empty()
+        with pytest.raises(ValueError):
+            trees.TwoDTree.load(path)
+
 
 class Test2DTree(TreesTest):
     def setup_method(self):
@@ -252,6 +688,645 @@ class Test2DTree(TreesTest):
         assert jon.depth(jay) == 2
         assert job.depth(jay) == 1
 
+    def test_from_points(self):
+        rng = random.Random(5)
+        xs = rng.sample(range(501), 255)
+        ys = rng.sample(range(501), 255)
+        items = [(str(i), (x, y)) for i, (x, y) in enumerate(zip(xs, ys))]
+        self.tree = trees.TwoDTree.from_points(items, (0, 0), (500, 500))
+        assert self.tree.height() == 8
+        assert all(name in self.tree for name, _ in items)
+        assert all(self.tree.contains_point(point) for _, point in items)
+
+        def check(node):
+            if node is None:
+                return 0
+            lt, gt = check(node._lt), check(node._gt)
+            assert abs(lt - gt) <= 1
+            return lt + gt + 1
+        assert check(self.tree) == 255
+
+    def test_balance(self):
+        rng = random.Random(6)
+        xs = rng.sample(range(501), 300)
+        ys = rng.sample(range(501), 300)
+        items = [(str(i), (x, y)) for i, (x, y) in enumerate(zip(xs, ys))]
+        for name, point in items:
+            self.tree.insert(name, point)
+        root = self.tree
+        self.tree.balance()
+        assert self.tree is root and self.tree._split_type == 'x'
+
+        def check(node):
+            if node is None:
+                return 0
+            lt, gt = check(node._lt), check(node._gt)
+            assert abs(lt - gt) <= 1
+            return lt + gt + 1
+        assert check(self.tree) == 300
+        assert all(self.tree.contains_point(point) for _, point in items)
+        self.tree.remove('7')
+        assert '7' not in self.tree
+        subtree = self.tree._lt
+        subtree.balance()
+        assert self.tree._lt is subtree and subtree._split_type == 'y'
+        assert check(self.tree) == 299
+
+    def test_remove_keeps_invariants(self):
+        rng = random.Random(7)
+        stored = {}
+
+        def check(node, low, high):
+            assert node._point is not None
+            axis = 0 if node._split_type == 'x' else 1
+            for lower, bound in enumerate(low):
+                assert bound is None or node._point[lower] > bound
+            for upper, bound in enumerate(high):
+                assert bound is None or node._point[upper] <= bound
+            count = 1
+            if node._lt is not None:
+                assert node._lt._split_type != node._split_type
+                below = list(high)
+                below[axis] = node._point[axis]
+                count += check(node._lt, low, below)
+            if node._gt is not None:
+                assert node._gt._split_type != node._split_type
+                above = list(low)
+                above[axis] = node._point[axis]
+                count += check(node._gt, above, high)
+            return count
+        for step in range(600):
+            if stored and rng.random() < 0.45:
+                name = rng.choice(sorted(stored))
+                if rng.random() < 0.5:
+                    self.tree.remove(name)
+                else:
+                    self.tree.remove_point(stored[name])
+                del stored[name]
+            else:
+                point = (rng.randint(0, 20), rng.randint(0, 20))
+                if point not in stored.values():
+                    stored[str(step)] = point
+                    self.tree.insert(str(step), point)
+            if stored:
+                assert check(self.tree, [None, None], [None, None]) == len(
+                    stored)
+            else:
+                assert self.tree.is_empty()
+        assert all(name in self.tree for name in stored)
+        assert all(self.tree.contains_point(point) for point in stored.values())
+
+    def test_max_is_pruned(self):
+        rng = random.Random(8)
+        xs = rng.sample(range(501), 255)
+        ys = rng.sample(range(501), 255)
+        items = [(str(i), (x, y)) for i, (x, y) in enumerate(zip(xs, ys))]
+        self.tree = trees.TwoDTree.from_points(items, (0, 0), (500, 500))
+        for split, axis in [('x', 0), ('y', 1)]:
+            visited = [0]
+            node = self.tree._helper_max(split, visited)
+            assert node._point[axis] == max(point[axis] for _, point in items)
+            assert visited[0] <= 3 * 16
+
+    def test_from_points_ties(self):
+        items = [(str(i), (100, i)) for i in range(10)] + [('a', (50, 0)),
+                                                            ('b', (400, 0))]
+        self.tree = trees.TwoDTree.from_points(items, (0, 0), (500, 500))
+        assert self.tree._point[0] == 100
+        assert self.tree._gt._name == 'b'
+        assert all(self.tree.contains_point(point) for _, point in items)
+        assert set(self.tree.names_in_range((100, 0), 'SE', 500)) == {
+            name for name, _ in items if name != 'a'}
+        assert trees.TwoDTree.from_points([], (0, 0), (500, 500)).is_empty()
+        with pytest.raises(trees.OutOfBoundsError):
+            trees.TwoDTree.from_points([('a', (1, 1)), ('b', (1, 1))], (0, 0),
+                                       (500, 500))
+
+    def test_sorted_inserts_past_recursion_limit(self):
+        n = sys.getrecursionlimit() + 500
+        self.tree = trees.TwoDTree((0, 0), (n, n))
+        for i in range(n):
+            self.tree.insert(str(i), (i, i))
+        assert self.tree.height() == n
+        assert self.tree.size() == n
+        assert self.tree.contains_point((n - 1, n - 1))
+        assert self.tree.names_in_range((n - 1, n - 1), 'NW', 1) == [
+            str(n - 2), str(n - 1)]
+        assert self.tree.nearest((n, n)) == [str(n - 1)]
+        self.tree.remove_point((0, 0))
+        self.tree.remove(str(n - 1))
+        assert self.tree.size() == n - 2
+        assert not self.tree.contains_point((0, 0))
+        assert self.tree.move(str(n - 2), 'E', 1) == (n - 1, n - 2)
+        self.tree.balance()
+        assert self.tree.height() < 20
+
+    def test_save_load(self, tmp_path):
+        n = sys.getrecursionlimit() + 500
+        self.tree = trees.TwoDTree((0, 0), (n, n))
+        for i in range(n):
+            self.tree.insert(str(i), (i, n - i))
+        path = str(tmp_path / 'field.tag')
+        self.tree.save(path)
+        loaded = trees.TwoDTree.load(path)
+        assert loaded.height() == n and loaded.size() == n
+        assert loaded._index == self.tree._index
+        assert loaded._alpha is None
+        assert loaded.names_in_range((0, n), 'NE', 1) == ['0', '1']
+        rng = random.Random(16)
+        self.tree = trees.TwoDTree((0, 0), (500, 500), 0.7)
+        for i in range(300):
+            point = (rng.randint(0, 500), rng.randint(0, 500))
+            if not self.tree.contains_point(point):
+                self.tree.insert(str(i), point)
+
+        def shape(node):
+            if node is None:
+                return None
+            return (node._name, node._point, node._split_type, node._count,
+                    shape(node._lt), shape(node._gt))
+        self.tree.save(path)
+        loaded = trees.TwoDTree.load(path)
+        assert shape(loaded) == shape(self.tree)
+        assert loaded._alpha == 0.7
+        assert (loaded._nw, loaded._se) == ((0, 0), (500, 500))
+        trees.TwoDTree((0, 0), (500, 500)).save(path)
+        assert trees.TwoDTree.load(path).is_empty()
+        with pytest.raises(ValueError):
+            trees.QuadTree.load(path)
+
+
+class TestScapegoatTwoDTree(TreesTest):
+    def setup_method(self):
+        self.tree = trees.TwoDTree((0, 0), (500, 500), 0.7)
+
+    def test_sorted_inserts_stay_short(self):
+        n = 1000
+        self.tree = trees.TwoDTree((0, 0), (n, n), 0.7)
+        for i in range(n):
+            self.tree.insert(str(i), (i, i))
+        assert self.tree._count == n
+        assert self.tree.height() <= math.log(n, 1 / 0.7) + 2
+        assert all(self.tree.contains_point((i, i)) for i in range(n))
+        assert self.tree.names_in_range((n - 1, n - 1), 'NW', 1) == [
+            str(n - 2), str(n - 1)]
+
+    def test_ties_stay_short(self):
+        n = 400
+        self.tree = trees.TwoDTree((0, 0), (n, n), 0.7)
+        for i in range(n):
+            self.tree.insert(str(i), (7, i))
+        assert self.tree.height() <= 2 * math.log(n, 2) + 2
+        assert all(self.tree.contains_point((7, i)) for i in range(n))
+
+    def test_moves_keep_counts_and_height(self):
+        rng = random.Random(9)
+        stored = {}
+        for i in range(300):
+            point = (rng.randint(0, 500), rng.randint(0, 500))
+            if point not in stored.values():
+                stored[str(i)] = point
+                self.tree.insert(str(i), point)
+
+        def check(node):
+            if node is None:
+                return 0
+            count = 1 + check(node._lt) + check(node._gt)
+            assert node._count == count
+            return count
+        for _ in range(20):
+            for name in sorted(stored):
+                try:
+                    stored[name] = self.tree.move(name, rng.choice('NSEW'),
+                                                  rng.randint(1, 30))
+                except trees.OutOfBoundsError:
+                    pass
+            assert check(self.tree) == len(stored)
+            assert self.tree.height() <= math.log(len(stored), 1 / 0.7) + 2
+        assert all(self.tree._index[name] == point for name, point in
+                   stored.items())
+        for name in sorted(stored)[:250]:
+            self.tree.remove(name)
+        assert check(self.tree) == 50
+        assert self.tree.height() <= math.log(300, 1 / 0.7) + 2
+
+    def test_role_counts_follow_rebuilds(self):
+        def check(node):
+            counts = {}
+            if node is None:
+                return counts
+            role = self.tree._roles.get(node._name)
+            if role is not None:
+                counts[role] = 1
+            for child in (node._lt, node._gt):
+                for role, count in check(child).items():
+                    counts[role] = counts.get(role, 0) + count
+            assert (node._role_counts or {}) == counts
+            return counts
+        for i in range(400):
+            self.tree.set_role(str(i), 'zombie' if i % 3 else 'human')
+            self.tree.insert(str(i), (i, 400 - i))
+        check(self.tree)
+        rng = random.Random(21)
+        for i in rng.sample(range(400), 300):
+            if i % 2:
+                self.tree.remove(str(i))
+            else:
+                self.tree.set_role(str(i), None)
+                try:
+                    self.tree.move(str(i), rng.choice('NSEW'),
+                                   rng.randint(1, 30))
+                except trees.OutOfBoundsError:
+                    pass
+        check(self.tree)
+        self.tree.balance()
+        assert check(self.tree) == self.tree.count_roles_in_range(
+            (0, 0), 'SE', 500)
+
+    def test_stats(self):
+        self.tree.enable_stats()
+        for i in range(300):
+            self.tree.insert(str(i), (i, i))
+        stats = self.tree.stats()
+        assert stats['insert'] == 300 and stats['rebuilds'] > 0
+        assert stats['allocated'] - stats['freed'] == 299
+        assert stats['insert_visits'] < 300 * 20
+        for i in range(0, 300, 2):
+            self.tree.remove(str(i))
+        stats = self.tree.stats()
+        assert stats['remove_point'] == 150
+        assert stats['allocated'] - stats['freed'] == 149
+        assert stats['splits'] == stats['merges'] == 0
+        self.tree.reset_stats()
+        assert sorted(self.tree.names_in_range((0, 0), 'SE', 10)) == [
+            '1', '3', '5', '7', '9']
+        assert self.tree.stats()['names_in_range'] == 1
+        assert 5 <= self.tree.stats()['names_in_range_visits'] < 150
+        self.tree.balance()
+        assert self.tree.stats()['rebuilds'] == 1
+
+    def test_from_points(self):
+        items = [(str(i), (i, 500 - i)) for i in range(100)]
+        self.tree = trees.TwoDTree.from_points(items, (0, 0), (500, 500), 0.7)
+        assert self.tree._alpha == 0.7 and self.tree._count == 100
+        assert self.tree._lt._alpha is None
+        assert self.tree._lt._count + self.tree._gt._count == 99
+
+
+class TestStaticTwoDTree(TreesTest):
+    def setup_method(self):
+        self.tree = trees.StaticTwoDTree((0, 0), (500, 500))
+
+    def test_layout(self):
+        for i in range(100):
+            self.tree.insert(str(i), ((i * 37) % 501, (i * 91) % 501))
+        self.tree.rebuild()
+        names = self.tree._names
+        assert len(names) == 127
+        assert all(names[i] is not None for i in range(63))
+        for i in range(len(names)):
+            if names[i] is None:
+                continue
+            key = 0 if (i + 1).bit_length() % 2 else 1
+            here = (self.tree._xs[i], self.tree._ys[i])
+            for child, lower in [(2 * i + 1, True), (2 * i + 2, False)]:
+                if child < len(names) and names[child] is not None:
+                    there = (self.tree._xs[child], self.tree._ys[child])
+                    if key == 1:
+                        here, there = here[::-1], there[::-1]
+                    assert (there < here) == lower
+                    if key == 1:
+                        here = here[::-1]
+
+    def test_matches_two_d_tree_between_rebuilds(self):
+        rng = random.Random(5)
+        two = trees.TwoDTree((0, 0), (500, 500))
+        for i in range(200):
+            point = (rng.randint(0, 500), rng.randint(0, 500))
+            if not two.contains_point(point):
+                two.insert(str(i), point)
+                self.tree.insert(str(i), point)
+        for tick in range(5):
+            for name in list(two._index):
+                direction = rng.choice(['N', 'S', 'E', 'W'])
+                steps = rng.randint(0, 3)
+                try:
+                    two.move(name, direction, steps)
+                except trees.OutOfBoundsError:
+                    continue
+                self.tree.move(name, direction, steps)
+            if tick == 2:
+                for name in list(two._index)[:20]:
+                    two.remove(name)
+                    self.tree.remove(name)
+            for point in [(0, 0), (250, 250), (400, 100), (123, 456)]:
+                for direction in ['NW', 'NE', 'SW', 'SE']:
+                    assert sorted(self.tree.names_in_range(
+                        point, direction, 60)) == sorted(
+                            two.names_in_range(point, direction, 60))
+                assert self.tree.nearest(point, 3) == two.nearest(point, 3)
+            assert self.tree.collisions(5) == two.collisions(5)
+
+    def test_move_back_is_found_once(self):
+        self.tree.insert('jon', (250, 250))
+        self.tree.rebuild()
+        self.tree.move('jon', 'N', 1)
+        self.tree.move('jon', 'S', 1)
+        assert self.tree.names_in_range((250, 250), 'SE', 0) == ['jon']
+        assert self.tree.nearest((250, 250), 2) == ['jon']
+
+
+class TestGridField(TreesTest):
+    def setup_method(self):
+        self.tree = trees.GridField((0, 0), (500, 500), 10)
+
+    def test_height(self):
+        assert self.tree.height() == 1
+        self.tree.insert('jon', (250, 250))
+        assert self.tree.height() == 1
+        self.tree.insert('joe', (300, 300))
+        assert self.tree.height() == 2
+        self.tree.remove('joe')
+        assert self.tree.height() == 1
+
+    def test_size(self):
+        assert self.tree.size() == 1
+        self.tree.insert('jon', (250, 250))
+        self.tree.insert('joe', (251, 251))
+        assert self.tree.size() == 2
+        self.tree.insert('job', (255, 50))
+        assert self.tree.size() == 3
+        self.tree.move('job', 'S', 200)
+        assert self.tree.size() == 2
+
+    def test_nearest_cell_sizes(self):
+        for size in [1, 7, 500]:
+            self.tree = trees.GridField((0, 0), (500, 500), size)
+            self.tree.insert('jon', (250, 250))
+            self.tree.insert('joe', (0, 0))
+            self.tree.insert('job', (500, 499))
+            assert self.tree.nearest((480, 480), 3) == ['job', 'jon', 'joe']
+
+    def test_wide_field_matches_quad_tree(self):
+        bounds = (0, 0, 100000, 40000)
+        self.tree = trees.GridField((0, 0), (100000, 40000), 7)
+        quad = trees.QuadTree((50000, 20000), bounds)
+        rng = random.Random(12)
+        points = set()
+        while len(points) < 100:
+            points.add((rng.randint(0, 100000), rng.randint(0, 40000)))
+        for i, point in enumerate(sorted(points)):
+            quad.insert(str(i), point)
+            self.tree.insert(str(i), point)
+        odd = {str(i) for i in range(1, 100, 2)}.__contains__
+        for point in [(0, 0), (50000, 20000), (99000, 1000), (123, 39999)]:
+            for direction in ['NW', 'NE', 'SW', 'SE']:
+                assert sorted(self.tree.names_in_range(point, direction,
+                                                       20000)) == sorted(
+                    quad.names_in_range(point, direction, 20000))
+            assert self.tree.nearest(point, 3) == quad.nearest(point, 3)
+            assert self.tree.nearest(point, 200) == quad.nearest(point, 200)
+            assert self.tree.nearest(point, 5, odd) == quad.nearest(point, 5,
+                                                                   odd)
+
+
+class TestBucketQuadTree(TreesTest):
+    def setup_method(self):
+        self.tree = trees.BucketQuadTree((250, 250), 4)
+
+    def test_split_and_merge(self):
+        for i in range(5):
+            self.tree.insert(str(i), (i * 100, i * 100))
+        assert self.tree._bucket is None
+        assert self.tree.size() == 3
+        self.tree.remove('4')
+        assert self.tree._bucket is not None
+        assert sorted(self.tree.names_in_range((0, 0), 'SE', 500)) == [
+            '0', '1', '2', '3']
+
+    def test_matches_quad_tree(self):
+        rng = random.Random(3)
+        quad = trees.QuadTree((250, 250))
+        points = set()
+        while len(points) < 300:
+            points.add((rng.randint(0, 500), rng.randint(0, 500)))
+        for i, point in enumerate(sorted(points)):
+            quad.insert(str(i), point)
+            self.tree.insert(str(i), point)
+        for i in range(0, 300, 3):
+            quad.remove(str(i))
+            self.tree.remove(str(i))
+        for point in [(0, 0), (250, 250), (400, 100), (123, 456)]:
+            for direction in ['NW', 'NE', 'SW', 'SE']:
+                assert sorted(self.tree.names_in_range(point, direction, 80)) \
+                    == sorted(quad.names_in_range(point, direction, 80))
+            assert self.tree.nearest(point, 5) == quad.nearest(point, 5)
+        assert self.tree.collisions(10) == quad.collisions(10)
+
+    def test_rectangular_field(self):
+        bounds = (0, 0, 100000, 40000)
+        self.tree = trees.BucketQuadTree((50000, 20000), 4, bounds=bounds)
+        quad = trees.QuadTree((50000, 20000), bounds)
+        rng = random.Random(11)
+        points = set()
+        while len(points) < 500:
+            points.add((rng.randint(0, 100000), rng.randint(0, 40000)))
+        for i, point in enumerate(sorted(points)):
+            quad.insert(str(i), point)
+            self.tree.insert(str(i), point)
+        with pytest.raises(trees.OutOfBoundsError):
+            self.tree.insert('out', (0, 40001))
+        assert self.tree.bounds() == bounds
+        for point in [(0, 0), (50000, 20000), (99000, 1000), (123, 39999)]:
+            for direction in ['NW', 'NE', 'SW', 'SE']:
+                assert sorted(self.tree.names_in_range(point, direction,
+                                                       9000)) == sorted(
+                    quad.names_in_range(point, direction, 9000))
+            assert self.tree.nearest(point, 5) == quad.nearest(point, 5)
+
+
+class TestLinearQuadTree(TreesTest):
+    def setup_method(self):
+        self.tree = trees.LinearQuadTree((250, 250))
+
+    def test_codes(self):
+        for point in [(0, 0), (1, 0), (0, 1), (500, 500), (123, 456)]:
+            code = trees.LinearQuadTree._helper_code(point)
+            assert trees.LinearQuadTree._helper_point(code) == point
+        assert trees.LinearQuadTree._helper_code((1, 0)) == 1
+        assert trees.LinearQuadTree._helper_code((0, 1)) == 2
+
+    def test_matches_quad_tree(self):
+        rng = random.Random(4)
+        quad = trees.QuadTree((250, 250))
+        points = set()
+        while len(points) < 300:
+            points.add((rng.randint(0, 500), rng.randint(0, 500)))
+        for i, point in enumerate(sorted(points)):
+            quad.insert(str(i), point)
+            self.tree.insert(str(i), point)
+        for i in range(0, 300, 3):
+            quad.remove(str(i))
+            self.tree.remove(str(i))
+        for point in [(0, 0), (250, 250), (400, 100), (123, 456)]:
+            for direction in ['NW', 'NE', 'SW', 'SE']:
+                assert sorted(self.tree.names_in_range(point, direction, 80)) \
+                    == sorted(quad.names_in_range(point, direction, 80))
+            assert self.tree.nearest(point, 5) == quad.nearest(point, 5)
+        assert self.tree.collisions(10) == quad.collisions(10)
+
+    def test_rectangular_field(self):
+        bounds = (0, 0, 100000, 40000)
+        self.tree = trees.LinearQuadTree((50000, 20000), bounds)
+        quad = trees.QuadTree((50000, 20000), bounds)
+        rng = random.Random(12)
+        points = set()
+        while len(points) < 500:
+            points.add((rng.randint(0, 100000), rng.randint(0, 40000)))
+        for i, point in enumerate(sorted(points)):
+            quad.insert(str(i), point)
+            self.tree.insert(str(i), point)
+        with pytest.raises(trees.OutOfBoundsError):
+            self.tree.insert('out', (0, 40001))
+        assert self.tree.bounds() == bounds
+        for point in [(0, 0), (50000, 20000), (99000, 1000), (123, 39999)]:
+            for direction in ['NW', 'NE', 'SW', 'SE']:
+                assert sorted(self.tree.names_in_range(point, direction,
+                                                       9000)) == sorted(
+                    quad.names_in_range(point, direction, 9000))
+            assert self.tree.nearest(point, 5) == quad.nearest(point, 5)
+
+
+class TestPersistentQuadTree(TreesTest):
+    def setup_method(self):
+        self.tree = trees.PersistentQuadTree((250, 250))
+
+    def test_same_quadrants_as_quad_tree(self):
+        rng = random.Random(13)
+        quad = trees.QuadTree((250, 250))
+
+        def shape(quadrant):
+            if quadrant is None or quadrant.is_empty():
+                return None
+            if quadrant.is_leaf():
+                return quadrant._name, quadrant._point
+            return (shape(quadrant._nw), shape(quadrant._sw),
+                    shape(quadrant._ne), shape(quadrant._se))
+        stored = {}
+        for step in range(600):
+            if stored and rng.random() < 0.4:
+                name = rng.choice(sorted(stored))
+                quad.remove(name)
+                self.tree.remove(name)
+                del stored[name]
+            else:
+                point = (rng.randint(0, 500), rng.randint(0, 500))
+                if point not in stored.values():
+                    stored[str(step)] = point
+                    quad.insert(str(step), point)
+                    self.tree.insert(str(step), point)
+            assert self.tree._root == shape(quad)
+        assert self.tree._index == quad._index
+
+    def test_matches_quad_tree(self):
+        rng = random.Random(14)
+        quad = trees.QuadTree((250, 250))
+        points = set()
+        while len(points) < 300:
+            points.add((rng.randint(0, 500), rng.randint(0, 500)))
+        for i, point in enumerate(sorted(points)):
+            quad.insert(str(i), point)
+            self.tree.insert(str(i), point)
+        for i in range(0, 300, 3):
+            try:
+                moved = quad.move(str(i), 'S', 7)
+            except trees.OutOfBoundsError:
+                with pytest.raises(trees.OutOfBoundsError):
+                    self.tree.move(str(i), 'S', 7)
+            else:
+                assert self.tree.move(str(i), 'S', 7) == moved
+        for point in [(0, 0), (250, 250), (400, 100), (123, 456)]:
+            for direction in ['NW', 'NE', 'SW', 'SE']:
+                assert sorted(self.tree.names_in_range(point, direction, 80)) \
+                    == sorted(quad.names_in_range(point, direction, 80))
+            assert self.tree.nearest(point, 5) == quad.nearest(point, 5)
+        assert self.tree.collisions(10) == quad.collisions(10)
+
+    def test_snapshots_do_not_change(self):
+        rng = random.Random(15)
+        for i in range(200):
+            point = (rng.randint(0, 500), rng.randint(0, 500))
+            if not self.tree.contains_point(point):
+                self.tree.insert(str(i), point)
+        snapshots = []
+        for tick in range(5):
+            snapshot = self.tree.snapshot()
+            snapshots.append((snapshot, dict(snapshot._index),
+                              snapshot.names_in_range((250, 250), 'NW', 100)))
+            for name in sorted(self.tree._index):
+                try:
+                    self.tree.move(name, rng.choice('NSEW'),
+                                   rng.randint(1, 20))
+                except trees.OutOfBoundsError:
+                    pass
+            self.tree.remove(sorted(self.tree._index)[0])
+        for snapshot, index, names in snapshots:
+            assert snapshot._index == index
+            assert snapshot.names_in_range((250, 250), 'NW', 100) == names
+            assert all(snapshot.contains_point(point) for point in
+                       index.values())
+        first, index, names = snapshots[0]
+        self.tree.rollback(first)
+        assert self.tree._index == index
+        free = next((x, 0) for x in range(501) if (x, 0) not in
+                    index.values())
+        self.tree.insert('new', free)
+        assert first._index == index and not first.contains_point(free)
+
+    def test_failed_move_changes_nothing(self):
+        self.tree.insert('a', (10, 10))
+        self.tree.insert('b', (10, 20))
+        root, index = self.tree._root, self.tree._index
+        with pytest.raises(trees.OutOfBoundsError):
+            self.tree.move('a', 'S', 10)
+        with pytest.raises(trees.OutOfBoundsError):
+            self.tree.move('a', 'W', 11)
+        assert self.tree._root is root and self.tree._index is index
+        assert self.tree._index == {'a': (10, 10), 'b': (10, 20)}
+
+
+@pytest.mark.skipif(trees.np is None, reason='ArrayField needs NumPy')
+class TestArrayField(TreesTest):
+    def setup_method(self):
+        self.tree = trees.ArrayField((0, 0), (500, 500))
+
+    def test_height(self):
+        assert self.tree.height() == 1
+        self.tree.insert('jon', (250, 250))
+        assert self.tree.height() == 1
+        self.tree.insert('joe', (300, 300))
+        assert self.tree.height() == 2
+        self.tree.remove('joe')
+        assert self.tree.height() == 1
+
+    def test_grow_and_shrink(self):
+        for i in range(100):
+            self.tree.insert(str(i), (i * 5, 500 - i * 5))
+        for i in range(0, 100, 2):
+            self.tree.remove(str(i))
+        assert self.tree.size() == 51
+        assert all(str(i) in self.tree for i in range(1, 100, 2))
+        assert all(self.tree.contains_point((i * 5, 500 - i * 5))
+                   for i in range(1, 100, 2))
+        assert not any(self.tree.contains_point((i * 5, 500 - i * 5))
+                       for i in range(0, 100, 2))
+
+
+@pytest.mark.skipif(trees.np is None, reason='ArrayField needs NumPy')
+class TestArrayFieldSorted(TestArrayField):
+    def setup_method(self):
+        self.tree = trees.ArrayField((0, 0), (500, 500), True)
+
 
 if __name__ == '__main__':
     pytest.main(['trees_test.py'])